@@ -17,6 +17,7 @@
 import sys
 from contextlib import asynccontextmanager
 from datetime import datetime
+from functools import cache, lru_cache
 from pathlib import Path
 from textwrap import dedent
 from typing import Annotated, Any, cast
@@ -45,7 +46,12 @@
 )
 from src.services import csv_admin, fuel_api
 from src.services.fuel_type_utils import normalize_fuel_type
-from src.services.geocoding import geocode_city
+from src.services.geocoding import (
+    cancel_inflight_lookups,
+    configure_rate_limit,
+    geocode_city,
+    warmup_city_coords,
+)
 from src.services.prezzi_csv import (
     _fetch_csvs,
     _is_cache_fresh,
@@ -59,31 +65,55 @@
     preload_local_csv_cache,
 )
 
-_cached_settings: Settings | None = None
-
 FAVICON_CACHE_SECONDS = 3600
 STATIC_CACHE_SECONDS = 3600
 CSV_SCHEMA_ERROR_STATUS = 422
-
-
+# Shared outbound client: long read timeout for the multi-MB CSV exports, and a
+# keep-alive pool so geocoding cache misses reuse warm TLS connections
+HTTP_TIMEOUT_SECONDS = 60.0
+HTTP_CONNECT_TIMEOUT_SECONDS = 15.0
+HTTP_MAX_CONNECTIONS = 32
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 16
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 30.0
+# Rendered /help pages kept in memory (the docs directory holds a handful of files)
+DOCS_PAGE_CACHE_SIZE = 32
+
+
+@cache
 def get_settings() -> Settings:
     """Get application settings instance.
 
     This function is used as a FastAPI dependency to provide configuration
-    settings loaded from environment variables.
+    settings loaded from environment variables. The instance is built once
+    and memoized; call ``get_settings.cache_clear()`` to reload it.
 
     Returns:
     - The application settings object.
     """
-    global _cached_settings  # noqa: PLW0603
-    if _cached_settings is None:
-        _cached_settings = Settings()
-    return _cached_settings
+    return Settings()
 
 
 def _csv_http_headers(settings: Settings) -> dict[str, str]:
-    """Build headers for CSV and geocoding HTTP clients."""
-    return {"User-Agent": settings.user_agent, "Accept": "text/csv"}
+    """Build headers for CSV and geocoding HTTP clients.
+
+    Compressed transfer is requested explicitly: the CSV exports compress
+    very well and httpx decodes gzip/deflate bodies transparently.
+    """
+    return {"User-Agent": settings.user_agent, "Accept": "text/csv", "Accept-Encoding": "gzip, deflate"}
+
+
+def _build_http_client(settings: Settings) -> httpx.AsyncClient:
+    """Create the pooled HTTP client used for CSV downloads and geocoding."""
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        headers=_csv_http_headers(settings),
+        follow_redirects=True,
+    )
 
 
 async def _check_preferred_csv_dir(settings: Settings) -> None:
@@ -138,7 +168,7 @@ async def _schedule_startup_work(_app: FastAPI, settings: Settings, client: http
         return
 
     try:
-        cache_fresh = await _is_cache_fresh(settings.prezzi_cache_path, settings.prezzi_cache_hours)
+        cache_fresh = _is_cache_fresh(settings.prezzi_cache_path, settings.prezzi_cache_hours)
     except Exception:
         cache_fresh = False
 
@@ -262,6 +292,79 @@ def _render_markdown(md_text: str) -> str:
         return f"<pre>{_html.escape(md_text)}</pre>"
 
 
+@lru_cache(maxsize=DOCS_PAGE_CACHE_SIZE)
+def _build_docs_page(md_path: Path, _md_mtime_ns: int, docs_css_path: Path, _css_mtime_ns: int) -> str:
+    """Render a docs page to a full HTML document.
+
+    The modification times are part of the cache key only, so an edited
+    Markdown or CSS file is rendered again on the next request.
+    """
+    rendered = _render_markdown(md_path.read_text(encoding="utf-8"))
+    # Read docs CSS for inlining
+    docs_css = docs_css_path.read_text(encoding="utf-8")
+
+    return dedent(f"""<!doctype html>
+        <html>
+        <head>
+            <meta charset='utf-8'>
+            <meta name='viewport' content='width=device-width,initial-scale=1'>
+            <link rel='stylesheet' href='/static/css/styles.split.css'>
+            <style>{docs_css}</style>
+            <link rel='icon' href='/favicon.ico'>
+            <base href='/docs-static/'>
+            <title>Documentation</title>
+            <script src='https://cdn.tailwindcss.com'></script>
+            <script>
+            tailwind.config = {{
+              darkMode: 'class',
+              theme: {{
+                extend: {{
+                  colors: {{ primary: {{ DEFAULT: '#00c853' }} }},
+                  fontFamily: {{ sans: ['Inter', 'system-ui'] }},
+                }},
+              }},
+            }};
+            </script>
+        </head>
+        <body class='bg-[var(--bg-primary)] text-[var(--text-primary)]
+        min-h-screen font-sans transition-colors duration-250'>
+            <div class='max-w-3xl mx-auto px-6 py-12 relative'>
+                <div class='docs-content mt-4'>{rendered}</div>
+                <button
+                onclick="(history.length > 1) ? history.back() : (window.location.href='/')"
+                aria-label='Back to main page'
+                class='absolute top-6 left-6 p-1.5 rounded-lg border border-[var(--border-color)]
+                bg-[var(--bg-surface)] hover:bg-[var(--bg-elevated)] transition-colors
+                cursor-pointer text-[var(--text-primary)] shadow-sm'>
+                    <svg class='w-4 h-4' fill='none' stroke='currentColor' viewBox='0 0 24 24'>
+                        <path stroke-linecap='round' stroke-linejoin='round' stroke-width='2' d='M15 19l-7-7 7-7'/>
+                    </svg>
+                </button>
+                <button id='docs-theme-toggle' aria-label='Toggle theme'
+                class='absolute top-6 right-6 p-1.5 rounded-lg border border-[var(--border-color)]
+                bg-[var(--bg-surface)] hover:bg-[var(--bg-elevated)] transition-colors
+                cursor-pointer text-[var(--text-primary)] shadow-sm'>
+                    <svg id='theme-icon-sun' class='w-4 h-4' fill='none' stroke='currentColor'
+                    viewBox='0 0 24 24'>
+                        <path stroke-linecap='round' stroke-linejoin='round' stroke-width='2'
+                        d='M12 3v1m0 16v1m9-9h-1M4 12H3m15.364 6.364l-.707-.707
+                        M6.343 6.343l-.707-.707m12.728 0l-.707.707M6.343 17.657l-.707.707
+                        M16 12a4 4 0 11-8 0 4 4 0 018 0z'/>
+                    </svg>
+                    <svg id='theme-icon-moon' class='w-4 h-4 hidden' fill='none' stroke='currentColor'
+                    viewBox='0 0 24 24'>
+                        <path stroke-linecap='round' stroke-linejoin='round' stroke-width='2'
+                        d='M20.354 15.354A9 9 0 018.646 3.646 9.003 9.003 0 0012 21
+                        a9.003 9.003 0 008.354-5.646z'/>
+                    </svg>
+                </button>
+            </div>
+            <script src='/static/js/theme-utils.js' defer></script>
+            <script src='/static/js/docs-theme.js' defer></script>
+        </body>
+        </html>""")
+
+
 def _is_reload_in_progress() -> bool:
     """Return whether a CSV reload task is currently running."""
     for task_name in ("_reload_task", "_startup_reload_task"):
@@ -300,7 +403,7 @@ async def _build_csv_status(settings: Settings) -> dict[str, Any]:
 
     source = "local" if last_updated else "unknown"
     try:
-        cache_fresh = await _is_cache_fresh(settings.prezzi_cache_path, settings.prezzi_cache_hours)
+        cache_fresh = _is_cache_fresh(settings.prezzi_cache_path, settings.prezzi_cache_hours)
         if cache_fresh:
             cached = await _load_cached_combined(settings.prezzi_cache_path)
             if cached and len(cached) > 0:
@@ -337,18 +440,17 @@ async def _run_csv_reload(settings: Settings) -> None:
     """Fetch, parse, cache, save, and clean CSV data for manual reload."""
     try:
         logger.debug("Starting CSV fetch...")
-        async with httpx.AsyncClient(
-            timeout=httpx.Timeout(60.0, connect=15.0),
-            headers=_csv_http_headers(settings),
-            follow_redirects=True,
-        ) as client:
+        async with _build_http_client(settings) as client:
             anag_text, prezzi_text = await _fetch_csvs(client, settings)
             force_delimiter = None if settings.prezzi_csv_delimiter == "auto" else settings.prezzi_csv_delimiter
             combined = await asyncio.to_thread(
                 lambda: _parse_and_combine_sync(anag_text, prezzi_text, force_delimiter),
             )
-            await _write_json_file(settings.prezzi_cache_path, combined)
-            saved_dir = await _save_csv_files(anag_text, prezzi_text, settings)
+            # The cache write and the CSV copies touch different files: run them side by side
+            _, saved_dir = await asyncio.gather(
+                _write_json_file(settings.prezzi_cache_path, combined),
+                _save_csv_files(anag_text, prezzi_text, settings),
+            )
             if saved_dir:
                 logger.info("CSV reload completed successfully, saved to: {}", saved_dir)
             else:
@@ -366,11 +468,16 @@ async def _run_csv_reload(settings: Settings) -> None:
 async def lifespan(_app: FastAPI):
     """Lifespan context manager to handle startup and shutdown events."""
     settings = get_settings()
-    timeout = httpx.Timeout(60.0, connect=15.0)
-    headers = _csv_http_headers(settings)
-    async with httpx.AsyncClient(timeout=timeout, headers=headers, follow_redirects=True) as client:
+    # A nested lifespan (a second TestClient over the same app) must hand the
+    # outer one its still-open client back when it exits.
+    previous_client = getattr(_app.state, "http_client", None)
+    async with _build_http_client(settings) as client:
         _app.state.http_client = client
         _app.state._csv_freshly_downloaded = False  # noqa: SLF001
+        _app.state.index_html = await asyncio.to_thread((static_dir / "index.html").read_bytes)
+        configure_rate_limit(settings)
+        city_count = await warmup_city_coords(settings)
+        logger.debug("Local city coordinates ready for geocoding fallback (entries={})", city_count)
         await _schedule_startup_work(_app, settings, client)
         try:
             yield
@@ -378,6 +485,10 @@ async def lifespan(_app: FastAPI):
             logger.info("Shutdown: CancelledError or KeyboardInterrupt caught, exiting cleanly.")
         except Exception as err:
             logger.exception("Unexpected error in lifespan: {}", err)
+        finally:
+            # Lookups nobody awaits any more must not outlive the client they use
+            await cancel_inflight_lookups()
+            _app.state.http_client = previous_client
 
 
 # --- FastAPI App Initialization ---
@@ -438,7 +549,9 @@ async def favicon_ico() -> FileResponse:
 
 
 @limiter.limit("10/minute")
-@app.post("/search", response_class=JSONResponse)
+# The handler always builds a SearchResponse itself, so skip FastAPI's second
+# validation pass against a response_model and serialize the model directly.
+@app.post("/search", response_class=JSONResponse, response_model=None)
 async def search_gas_stations(
     request: SearchRequest,
     settings: Annotated[Settings, Depends(get_settings)],
@@ -497,11 +610,14 @@ async def search_gas_stations(
 
 
 @app.get("/", response_class=HTMLResponse)
-async def read_root() -> FileResponse:
-    """Serve the main HTML page."""
-    index_path = static_dir / "index.html"
-    return FileResponse(
-        index_path,
+async def read_root() -> HTMLResponse:
+    """Serve the main HTML page (read once at startup and kept in memory)."""
+    index_html: bytes | None = getattr(app.state, "index_html", None)
+    if index_html is None:
+        index_html = await asyncio.to_thread((static_dir / "index.html").read_bytes)
+        app.state.index_html = index_html
+    return HTMLResponse(
+        content=index_html,
         headers={"Cache-Control": "public, max-age=3600"},  # Cache for 1 hour
     )
 
@@ -510,74 +626,13 @@ async def read_root() -> FileResponse:
 async def render_docs(page: str) -> HTMLResponse:
     """Render Markdown docs pages from the `docs` directory (safe filename)."""
     md_path = _resolve_docs_page(page)
-    md_text = md_path.read_text(encoding="utf-8")
-    rendered = _render_markdown(md_text)
-
-    # Read docs CSS for inlining
     docs_css_path = static_dir / "css" / "docs.css"
-    docs_css = docs_css_path.read_text(encoding="utf-8")
-
-    html_page = dedent(f"""<!doctype html>
-        <html>
-        <head>
-            <meta charset='utf-8'>
-            <meta name='viewport' content='width=device-width,initial-scale=1'>
-            <link rel='stylesheet' href='/static/css/styles.split.css'>
-            <style>{docs_css}</style>
-            <link rel='icon' href='/favicon.ico'>
-            <base href='/docs-static/'>
-            <title>Documentation</title>
-            <script src='https://cdn.tailwindcss.com'></script>
-            <script>
-            tailwind.config = {{
-              darkMode: 'class',
-              theme: {{
-                extend: {{
-                  colors: {{ primary: {{ DEFAULT: '#00c853' }} }},
-                  fontFamily: {{ sans: ['Inter', 'system-ui'] }},
-                }},
-              }},
-            }};
-            </script>
-        </head>
-        <body class='bg-[var(--bg-primary)] text-[var(--text-primary)]
-        min-h-screen font-sans transition-colors duration-250'>
-            <div class='max-w-3xl mx-auto px-6 py-12 relative'>
-                <div class='docs-content mt-4'>{rendered}</div>
-                <button
-                onclick="(history.length > 1) ? history.back() : (window.location.href='/')"
-                aria-label='Back to main page'
-                class='absolute top-6 left-6 p-1.5 rounded-lg border border-[var(--border-color)]
-                bg-[var(--bg-surface)] hover:bg-[var(--bg-elevated)] transition-colors
-                cursor-pointer text-[var(--text-primary)] shadow-sm'>
-                    <svg class='w-4 h-4' fill='none' stroke='currentColor' viewBox='0 0 24 24'>
-                        <path stroke-linecap='round' stroke-linejoin='round' stroke-width='2' d='M15 19l-7-7 7-7'/>
-                    </svg>
-                </button>
-                <button id='docs-theme-toggle' aria-label='Toggle theme'
-                class='absolute top-6 right-6 p-1.5 rounded-lg border border-[var(--border-color)]
-                bg-[var(--bg-surface)] hover:bg-[var(--bg-elevated)] transition-colors
-                cursor-pointer text-[var(--text-primary)] shadow-sm'>
-                    <svg id='theme-icon-sun' class='w-4 h-4' fill='none' stroke='currentColor'
-                    viewBox='0 0 24 24'>
-                        <path stroke-linecap='round' stroke-linejoin='round' stroke-width='2'
-                        d='M12 3v1m0 16v1m9-9h-1M4 12H3m15.364 6.364l-.707-.707
-                        M6.343 6.343l-.707-.707m12.728 0l-.707.707M6.343 17.657l-.707.707
-                        M16 12a4 4 0 11-8 0 4 4 0 018 0z'/>
-                    </svg>
-                    <svg id='theme-icon-moon' class='w-4 h-4 hidden' fill='none' stroke='currentColor'
-                    viewBox='0 0 24 24'>
-                        <path stroke-linecap='round' stroke-linejoin='round' stroke-width='2'
-                        d='M20.354 15.354A9 9 0 018.646 3.646 9.003 9.003 0 0012 21
-                        a9.003 9.003 0 008.354-5.646z'/>
-                    </svg>
-                </button>
-            </div>
-            <script src='/static/js/theme-utils.js' defer></script>
-            <script src='/static/js/docs-theme.js' defer></script>
-        </body>
-        </html>""")
-
+    html_page = _build_docs_page(
+        md_path,
+        md_path.stat().st_mtime_ns,
+        docs_css_path,
+        docs_css_path.stat().st_mtime_ns,
+    )
     return HTMLResponse(content=html_page, headers={"Cache-Control": "public, max-age=3600"})
 
 
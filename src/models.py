@@ -20,6 +20,9 @@
 # Results pagination
 DEFAULT_RESULTS_COUNT = 5
 MAX_RESULTS_COUNT = 20
+# Contact information the User-Agent must carry (Nominatim usage policy)
+USER_AGENT_EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+USER_AGENT_URL_RE = re.compile(r"https?://[^\s]+")
 
 
 # --- Search Parameters Model ---
@@ -55,7 +58,7 @@ class Settings(BaseSettings):
         "https://prezzi-carburante.onrender.com/api/distributori",
         description="The base URL for the Prezzi Carburante API.",
     )
-    cors_allowed_origins: list[str] | str = Field(
+    cors_allowed_origins: frozenset[str] | str = Field(
         default_factory=lambda: os.getenv(
             "CORS_ALLOWED_ORIGINS",
             "http://localhost:3000,http://127.0.0.1:3000",  # Frontend dev server
@@ -78,10 +81,8 @@ def validate_user_agent(cls, v: str) -> str:
             msg = "User-Agent must be a non-empty string"
             raise ValueError(msg)
 
-        email_pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-        has_email = bool(re.search(email_pattern, v))
-        url_pattern = r"https?://[^\s]+"
-        has_url = bool(re.search(url_pattern, v))
+        has_email = bool(USER_AGENT_EMAIL_RE.search(v))
+        has_url = bool(USER_AGENT_URL_RE.search(v))
 
         if not has_email and not has_url:
             examples = "'MyApp/1.0 (me@example.com)' or 'MyApp/1.0 https://example.com'"
@@ -96,11 +97,11 @@ def validate_user_agent(cls, v: str) -> str:
     @field_validator("cors_allowed_origins", mode="after")
     @classmethod
     def _normalize_cors_allowed_origins(cls, v):
-        """Trim whitespace and drop empty origins provided via env or list."""
+        """Trim whitespace, drop empty origins and freeze them into a set for O(1) checks."""
         if isinstance(v, str):
-            return [s.strip() for s in v.split(",") if s.strip()]
-        if isinstance(v, (list, tuple)):
-            return [s.strip() for s in v if isinstance(s, str) and s.strip()]
+            return frozenset(s.strip() for s in v.split(",") if s.strip())
+        if isinstance(v, (list, tuple, set, frozenset)):
+            return frozenset(s.strip() for s in v if isinstance(s, str) and s.strip())
         return v
 
     # Prezzi CSV source and cache configuration
@@ -114,7 +115,10 @@ def _normalize_cors_allowed_origins(cls, v):
     )
     prezzi_cache_path: str = Field(
         "src/static/data/prezzi_data.json",
-        description="Path to cached combined prezzi JSON file.",
+        description=(
+            "Path to cached combined prezzi JSON file. "
+            "A path ending in '.pickle' stores a pickle snapshot instead, which loads faster."
+        ),
     )
     prezzi_csv_http_meta_path: str = Field(
         "src/static/data/prezzi_csv_http_meta.json",
@@ -164,15 +168,43 @@ def _normalize_cors_allowed_origins(cls, v):
     server_reload: bool = Field(default=True, description="Enable auto-reload on code changes.")
     server_workers: int = Field(1, description="Number of worker processes.")
     # Timeout for interactive search requests (seconds)
-    search_timeout_seconds: int = Field(12, description="Timeout in seconds for interactive search requests.")
+    search_timeout_seconds: float = Field(12, description="Timeout in seconds for interactive search requests.")
 
     # Geocoding configuration
     photon_api_url: str = Field(
         "https://photon.komoot.io/api/",
         description="Photon geocoding fallback URL.",
     )
+    nominatim_rps: float = Field(
+        1.0,
+        gt=0,
+        description="Max outbound Nominatim requests per second (public instance policy: 1).",
+    )
+    nominatim_default_backoff_seconds: float = Field(
+        5.0,
+        ge=0,
+        description="Seconds to hold back Nominatim requests after a 429/509 without a usable Retry-After.",
+    )
+    nominatim_max_concurrency: int = Field(
+        1,
+        description=(
+            "Max concurrent Nominatim lookups in batch geocoding. Keep 1 for the public "
+            "instance (1 req/s policy); raise it for self-hosted instances."
+        ),
+    )
     geocoding_cache_maxsize: int = Field(1000, description="Max geocoding cache entries.")
     geocoding_cache_ttl_seconds: int = Field(86400, description="Geocoding cache TTL in seconds.")
+    geocoding_disk_cache_enabled: bool = Field(
+        default=True,
+        description=(
+            "If true, persist geocoding results to 'geocoding_cache.json' next to the prezzi cache "
+            "so they survive restarts and are shared (best effort) between workers."
+        ),
+    )
+    geocoding_disk_cache_ttl_seconds: int = Field(
+        30 * 24 * 3600,
+        description="TTL in seconds for persisted geocoding results (default 30 days).",
+    )
 
 
 class SearchRequest(BaseModel):
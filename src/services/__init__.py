@@ -4,4 +4,5 @@
 - fuel_api: Gas station data fetching and parsing from Prezzi Carburante API
 - geocoding: City name to coordinates conversion using OpenStreetMap Nominatim
 - fuel_type_utils: Fuel type normalization utilities
+- retry_utils: Retry policy shared by the outbound service calls
 """
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -17,6 +18,7 @@
 PROJECT_DATA_DIR = PROJECT_ROOT / "data"
 
 TIMESTAMPED_CSV_PATTERNS = ("anagrafica_impianti_attivi_*.csv", "prezzo_alle_8_*.csv")
+TIMESTAMPED_CSV_PREFIXES = ("anagrafica_impianti_attivi_", "prezzo_alle_8_")
 BASE_CSV_NAMES = ("anagrafica_impianti_attivi.csv", "prezzo_alle_8.csv")
 
 
@@ -39,8 +41,10 @@ def candidate_local_csv_dirs(settings: Settings) -> list[Path]:
 def cleanup_old_csvs(directory: Path, prefix: str, keep: int = 1) -> None:
     """Remove older timestamped CSV files while keeping the newest files."""
     try:
-        files = sorted(directory.glob(f"{prefix}*.csv"), key=lambda p: p.name, reverse=True)
-        for path in files[keep:]:
+        # Timestamped names sort chronologically: newest first, by name alone
+        names = sorted(scan_csv_names(directory, (prefix,)), reverse=True)
+        for name in names[keep:]:
+            path = directory / name
             try:
                 path.unlink()
                 logger.debug("Removed old CSV file {}", path)
@@ -61,18 +65,22 @@ def cleanup_candidate_csvs(settings: Settings) -> None:
 
 def find_timestamped_csvs(candidates: list[Path]) -> datetime | None:
     """Find the latest timestamp encoded in timestamped CSV filenames."""
-    latest_ts: datetime | None = None
     ts_format_length = 15
-
+    stamps: list[str] = []
     for directory in candidates:
-        if not directory.exists():
+        try:
+            names = scan_csv_names(directory, TIMESTAMPED_CSV_PREFIXES)
+        except OSError:
             continue
-        for pattern in TIMESTAMPED_CSV_PATTERNS:
-            for csv_file in directory.glob(pattern):
-                ts = _timestamp_from_csv_name(csv_file.name, ts_format_length)
-                if ts is not None and (latest_ts is None or ts > latest_ts):
-                    latest_ts = ts
-    return latest_ts
+        stamps.extend(_stamp_from_csv_name(name)[:ts_format_length] for name in names)
+
+    # YYYYMMDD_HHMMSS stamps sort chronologically: parse from the newest down,
+    # stopping at the first well-formed one
+    for stamp in sorted(stamps, reverse=True):
+        ts = _parse_csv_stamp(stamp, ts_format_length)
+        if ts is not None:
+            return ts
+    return None
 
 
 def find_latest_base_csv_mtime(candidates: list[Path]) -> datetime | None:
@@ -95,10 +103,20 @@ def find_latest_base_csv_mtime(candidates: list[Path]) -> datetime | None:
     return latest_ts
 
 
-def _timestamp_from_csv_name(filename: str, ts_format_length: int) -> datetime | None:
-    """Parse a timestamp from a known timestamped CSV filename."""
+def scan_csv_names(directory: Path, prefixes: tuple[str, ...]) -> list[str]:
+    """List the ``<prefix>*.csv`` file names of a directory in a single ``os.scandir`` pass."""
+    with os.scandir(directory) as entries:
+        return [entry.name for entry in entries if entry.name.startswith(prefixes) and entry.name.endswith(".csv")]
+
+
+def _stamp_from_csv_name(filename: str) -> str:
+    """Return the timestamp part of a known timestamped CSV filename."""
     ts_str = filename.replace("anagrafica_impianti_attivi_", "").replace("prezzo_alle_8_", "")
-    ts_str = ts_str.replace(".csv", "")
+    return ts_str.replace(".csv", "")
+
+
+def _parse_csv_stamp(ts_str: str, ts_format_length: int) -> datetime | None:
+    """Parse a ``YYYYMMDD_HHMMSS`` stamp, or return None when it is malformed."""
     if len(ts_str) < ts_format_length:
         return None
     try:
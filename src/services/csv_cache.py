@@ -7,21 +7,46 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import pickle
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+import orjson
 from loguru import logger
 
 from src.services import csv_admin
 
 if TYPE_CHECKING:
+    import os
+
     from src.models import Settings
 
 
+# Cache files with this suffix hold a pickle snapshot instead of JSON. The cache
+# is private to this service and pickle loads nested dicts faster than JSON
+# decoding; the file must only ever be written by the service itself.
+PICKLE_CACHE_SUFFIX = ".pickle"
+
+# Parsed combined payloads keyed by (path, mtime_ns, size) of the file they came from
+_combined_memcache: dict[tuple[str, int, int], dict[str, Any]] = {}
+
+# Writers of the same cache path take turns (they share the ``.part`` temp file);
+# the newest payload queued for a path is the only one still worth writing
+_write_locks: dict[str, asyncio.Lock] = {}
+_latest_payloads: dict[str, dict[str, Any]] = {}
+
+
+def _remember_combined(path: str, st: os.stat_result, payload: dict[str, Any]) -> None:
+    """Keep a parsed payload in memory for the file version described by `st`."""
+    # One entry per path: a newer file version replaces the old one
+    for stale_key in [k for k in _combined_memcache if k[0] == path]:
+        del _combined_memcache[stale_key]
+    _combined_memcache[path, st.st_mtime_ns, st.st_size] = payload
+
+
 async def _read_json_file(path: str) -> dict[str, Any] | None:
-    """Read a JSON file asynchronously.
+    """Read a JSON file asynchronously (a pickle snapshot for ``.pickle`` paths).
 
     Parameters:
     - path: The file path to read from.
@@ -30,14 +55,22 @@ async def _read_json_file(path: str) -> dict[str, Any] | None:
     - The parsed JSON data as a dictionary, or None if the file doesn't exist or parsing fails.
     """
     p = Path(path)
-    exists = await asyncio.to_thread(p.exists)
-    if not exists:
-        return None
+
+    def read_and_parse() -> dict[str, Any] | None:
+        # Read and decode in the same worker thread: one hop, and the event
+        # loop never blocks on parsing a large payload
+        content = p.read_bytes()
+        if not content.strip():
+            return None
+        if p.suffix == PICKLE_CACHE_SUFFIX:
+            return pickle.loads(content)  # noqa: S301 - written by _write_json_file only
+        return orjson.loads(content)
 
     try:
-        content = await asyncio.to_thread(p.read_text, "utf-8")
-        return json.loads(content) if content.strip() else None
-    except json.JSONDecodeError as err:
+        return await asyncio.to_thread(read_and_parse)
+    except FileNotFoundError:
+        return None
+    except orjson.JSONDecodeError as err:
         logger.warning("Failed to parse cache file {}: {}", path, err)
         return None
     except Exception as err:
@@ -47,33 +80,52 @@ async def _read_json_file(path: str) -> dict[str, Any] | None:
 
 
 async def _write_json_file(path: str, payload: dict[str, Any]) -> None:
-    """Write a dictionary to a JSON file **atomically**.
+    """Write a dictionary to a JSON file **atomically** (a pickle snapshot for ``.pickle`` paths).
 
     Strategy:
     - Serialize to a temporary file next to the final path (``<name>.part``).
     - Atomically replace the final file with ``Path.replace`` (with retries on Windows).
     - Fall back to direct overwrite if atomic replace fails after retries.
     - On any error, ensure no temporary file leaks remain.
+    - Concurrent writes to the same path are serialized and coalesced: a writer
+      still waiting when a newer payload arrives skips its now-stale write.
 
     Parameters:
     - path: The file path to write to.
     - payload: The dictionary data to serialize and write.
     """
+    _latest_payloads[path] = payload
+    lock = _write_locks.setdefault(path, asyncio.Lock())
+    async with lock:
+        if _latest_payloads.get(path) is not payload:
+            logger.debug("Skipping superseded cache write for {}", path)
+            return
+        try:
+            await _write_json_file_locked(path, payload)
+        finally:
+            if _latest_payloads.get(path) is payload:
+                del _latest_payloads[path]
+
+
+async def _write_json_file_locked(path: str, payload: dict[str, Any]) -> None:
+    """Perform the atomic write of `_write_json_file`; the caller holds the path lock."""
     import shutil  # noqa: PLC0415
 
     p = Path(path)
-    tmp: Path | None = None
-    try:
-        # ensure parent exists
-        if parent := p.parent:
-            parent_exists = await asyncio.to_thread(parent.exists)
-            if not parent_exists:
-                await asyncio.to_thread(parent.mkdir, parents=True, exist_ok=True)
+    tmp = p.with_name(f"{p.name}.part")
+
+    def serialize_to_part() -> None:
+        # Parent creation, serialization and the temp-file write share one
+        # worker thread hop and keep the encoding off the event loop
+        p.parent.mkdir(parents=True, exist_ok=True)
+        if p.suffix == PICKLE_CACHE_SUFFIX:
+            tmp.write_bytes(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        else:
+            tmp.write_bytes(orjson.dumps(payload))
 
+    try:
         # write to temp file in same directory then atomically replace
-        tmp = p.with_name(f"{p.name}.part")
-        text = json.dumps(payload, ensure_ascii=False)
-        await asyncio.to_thread(tmp.write_text, text, "utf-8")
+        await asyncio.to_thread(serialize_to_part)
 
         # Retry atomic replace (Windows may hold file locks briefly)
         max_retries = 3
@@ -94,6 +146,9 @@ async def _write_json_file(path: str, payload: dict[str, Any]) -> None:
             await asyncio.to_thread(shutil.copy2, str(tmp), str(p))
             await asyncio.to_thread(tmp.unlink)
 
+        # The payload just written is what the next load would parse: keep it in memory
+        st = await asyncio.to_thread(p.stat)
+        _remember_combined(path, st, payload)
     except Exception as err:
         logger.warning("Failed to write cache file {}: {}", path, err)
         logger.exception(err)
@@ -105,9 +160,12 @@ async def _write_json_file(path: str, payload: dict[str, Any]) -> None:
             logger.debug("Failed to remove temp cache file {}", tmp)
 
 
-async def _is_cache_fresh(cache_path: str, cache_hours: float) -> bool:
+def _is_cache_fresh(cache_path: str, cache_hours: float) -> bool:
     """Check if the cache file is fresh based on its modification time.
 
+    A single ``stat`` call, done inline: a worker-thread hop would cost far
+    more than the syscall it wraps.
+
     Parameters:
     - cache_path: The path to the cache file.
     - cache_hours: The number of hours to consider the cache fresh.
@@ -115,15 +173,12 @@ async def _is_cache_fresh(cache_path: str, cache_hours: float) -> bool:
     Returns:
     - True if the cache is fresh, False otherwise.
     """
-    p = Path(cache_path)
-    exists = await asyncio.to_thread(p.exists)
-    if not exists:
-        return False
     try:
-        st = await asyncio.to_thread(p.stat)
-        mtime = st.st_mtime
+        mtime = Path(cache_path).stat().st_mtime
         now_ts = datetime.now(tz=UTC).timestamp()
         hours_old = (now_ts - mtime) / 3600.0
+    except FileNotFoundError:
+        return False
     except OSError:
         logger.exception("Failed to stat cache file {}", cache_path)
         return False
@@ -134,13 +189,31 @@ async def _is_cache_fresh(cache_path: str, cache_hours: float) -> bool:
 async def _load_cached_combined(cache_path: str) -> dict[str, Any] | None:
     """Load the cached combined station data from a JSON file.
 
+    The parsed data is kept in memory and reused for as long as the file's
+    mtime and size are unchanged, so most requests skip the read and parse.
+    Callers must treat the returned dictionary as read-only.
+
     Parameters:
     - cache_path: The path to the cache file.
 
     Returns:
     - The cached data as a dictionary, or None if not available.
     """
-    return await _read_json_file(cache_path)
+    # A single stat is a few microseconds: done inline, a cache hit costs no
+    # worker-thread round trip at all
+    try:
+        st = Path(cache_path).stat()  # noqa: ASYNC240
+    except OSError:
+        return None
+    key = (cache_path, st.st_mtime_ns, st.st_size)
+    cached = _combined_memcache.get(key)
+    if cached is not None:
+        return cached
+
+    combined = await _read_json_file(cache_path)
+    if combined is not None:
+        _remember_combined(cache_path, st, combined)
+    return combined
 
 
 async def preload_local_csv_cache(settings: Settings) -> None:
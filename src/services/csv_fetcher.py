@@ -7,18 +7,20 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from datetime import UTC
 from datetime import datetime as _datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import httpx2 as httpx
+import orjson
 from loguru import logger
 
 from src.services import csv_admin
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from src.models import Settings
 
 datetime: Any = _datetime
@@ -32,10 +34,16 @@
 MIN_CSV_BYTES = 10_000  # file stub/test sotto questa soglia vengono scartati
 HTTP_NOT_MODIFIED = 304
 
+# Running background CSV saves and cleanups: holding a reference keeps them from being garbage collected
+_background_tasks: set[asyncio.Task[None]] = set()
+
 
-async def _load_http_meta(path: str) -> dict[str, str]:
+def _load_http_meta(path: str) -> dict[str, str]:
     """Carica i metadati HTTP (ETag/Last-Modified) salvati per richieste condizionali.
 
+    Il file è di poche centinaia di byte: viene letto direttamente, senza il
+    passaggio da un worker thread.
+
     Parameters:
     - path: Path del file JSON dei metadati.
 
@@ -43,35 +51,60 @@ async def _load_http_meta(path: str) -> dict[str, str]:
     - Dizionario con chiavi anag_etag, anag_last_modified, prezzi_etag, prezzi_last_modified.
       Ritorna dict vuoto se il file non esiste o non è leggibile.
     """
-    p = Path(path)
-    exists = await asyncio.to_thread(p.exists)
-    if not exists:
-        return {}
     try:
-        text = await asyncio.to_thread(p.read_text, "utf-8")
-        return json.loads(text)
-    except Exception:
+        return orjson.loads(Path(path).read_bytes())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError):
         logger.debug("Failed to load CSV HTTP meta from {}", path)
         return {}
 
 
-async def _save_http_meta(path: str, meta: dict[str, str]) -> None:
+def _save_http_meta(path: str, meta: dict[str, str]) -> None:
     """Salva i metadati HTTP (ETag/Last-Modified) per future richieste condizionali.
 
+    Scrittura diretta (senza worker thread): il file è minuscolo.
+
     Parameters:
     - path: Path del file JSON dei metadati.
     - meta: Dizionario con i valori ETag/Last-Modified da persistere.
     """
     p = Path(path)
     try:
-        await asyncio.to_thread(p.parent.mkdir, parents=True, exist_ok=True)
-        text = json.dumps(meta, indent=2, ensure_ascii=False)
-        await asyncio.to_thread(p.write_text, text, "utf-8")
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_bytes(orjson.dumps(meta, option=orjson.OPT_INDENT_2))
         logger.debug("Saved CSV HTTP meta to {}", path)
     except Exception as err:
         logger.warning("Failed to save CSV HTTP meta to {}: {}", path, err)
 
 
+def _response_validators(resp: httpx.Response, prefix: str) -> dict[str, str]:
+    """Estrae ETag/Last-Modified da una risposta 200 come voci del file meta.
+
+    Parameters:
+    - resp: La risposta HTTP da cui leggere gli header.
+    - prefix: Prefisso delle chiavi meta ("anag" o "prezzi").
+
+    Returns:
+    - Un dizionario con le sole chiavi presenti nella risposta.
+    """
+    validators: dict[str, str] = {}
+    for key, hdr in ((f"{prefix}_etag", "etag"), (f"{prefix}_last_modified", "last-modified")):
+        if val := resp.headers.get(hdr):
+            validators[key] = val
+    return validators
+
+
+def _read_csv_text(path: Path) -> str:
+    """Legge un CSV locale come ISO-8859-1.
+
+    Legge i byte e li decodifica in un colpo solo: niente TextIOWrapper né
+    traduzione dei newline (il parser gestisce già i fine riga CRLF), e il testo è
+    identico a quello decodificato da una risposta HTTP.
+    """
+    return path.read_bytes().decode("iso-8859-1")
+
+
 async def _load_single_csv(settings: Settings, glob_pattern: str) -> str:
     """Legge il primo CSV locale corrispondente al pattern dai candidate dirs.
 
@@ -88,7 +121,7 @@ async def _load_single_csv(settings: Settings, glob_pattern: str) -> str:
     for d in _candidate_local_csv_dirs(settings):
         files = sorted(d.glob(glob_pattern), key=lambda p: p.stat().st_mtime, reverse=True)
         if files:
-            return await asyncio.to_thread(files[0].read_text, "iso-8859-1")
+            return await asyncio.to_thread(_read_csv_text, files[0])
     msg = f"No local CSV matching '{glob_pattern}' in candidate dirs"
     raise FileNotFoundError(msg)
 
@@ -110,7 +143,7 @@ async def _fetch_csvs(  # noqa: C901, PLR0912, PLR0915
     - httpx.HTTPStatusError: If the remote API returns an HTTP error.
     - httpx.RequestError: If there's a network error.
     """
-    meta = await _load_http_meta(settings.prezzi_csv_http_meta_path)
+    meta = _load_http_meta(settings.prezzi_csv_http_meta_path)
 
     anag_req_headers: dict[str, str] = {}
     prezzi_req_headers: dict[str, str] = {}
@@ -172,7 +205,8 @@ async def _fetch_csvs(  # noqa: C901, PLR0912, PLR0915
             return await _load_local_csvs(settings)
         except FileNotFoundError:
             logger.warning("304 ma cache locale assente/invalida — forzo download senza header condizionali")
-            await _save_http_meta(settings.prezzi_csv_http_meta_path, {})
+            meta = {}
+            _save_http_meta(settings.prezzi_csv_http_meta_path, meta)
             resp_anag, resp_prezzi = await asyncio.gather(
                 http_client.get(settings.prezzi_csv_anagrafica_url),
                 http_client.get(settings.prezzi_csv_prezzi_url),
@@ -181,6 +215,10 @@ async def _fetch_csvs(  # noqa: C901, PLR0912, PLR0915
             resp_prezzi.raise_for_status()
             # continua sotto con le risposte 200
 
+    # Ogni corpo viene decodificato e la sua risposta rilasciata subito: i byte
+    # grezzi di un CSV non restano in memoria mentre si decodifica l'altro.
+    new_meta = dict(meta)
+
     # 304 parziale — carica il file locale per quello non modificato
     if resp_anag.status_code == HTTP_NOT_MODIFIED:
         logger.info("anagrafica CSV not modified (304), loading local copy")
@@ -191,8 +229,11 @@ async def _fetch_csvs(  # noqa: C901, PLR0912, PLR0915
             resp_anag = await http_client.get(settings.prezzi_csv_anagrafica_url)
             resp_anag.raise_for_status()
             anag_text = resp_anag.content.decode("iso-8859-1")
+            new_meta.update(_response_validators(resp_anag, "anag"))
     else:
         anag_text = resp_anag.content.decode("iso-8859-1")
+        new_meta.update(_response_validators(resp_anag, "anag"))
+    del resp_anag
 
     if resp_prezzi.status_code == HTTP_NOT_MODIFIED:
         logger.info("prezzi CSV not modified (304), loading local copy")
@@ -203,24 +244,15 @@ async def _fetch_csvs(  # noqa: C901, PLR0912, PLR0915
             resp_prezzi = await http_client.get(settings.prezzi_csv_prezzi_url)
             resp_prezzi.raise_for_status()
             prezzi_text = resp_prezzi.content.decode("iso-8859-1")
+            new_meta.update(_response_validators(resp_prezzi, "prezzi"))
     else:
         prezzi_text = resp_prezzi.content.decode("iso-8859-1")
+        new_meta.update(_response_validators(resp_prezzi, "prezzi"))
+    del resp_prezzi
 
     # Persisti ETag/Last-Modified dalle risposte 200 per richieste future
-    new_meta = dict(meta)
-    updated = False
-    if resp_anag.status_code != HTTP_NOT_MODIFIED:
-        for key, hdr in (("anag_etag", "etag"), ("anag_last_modified", "last-modified")):
-            if val := resp_anag.headers.get(hdr):
-                new_meta[key] = val
-                updated = True
-    if resp_prezzi.status_code != HTTP_NOT_MODIFIED:
-        for key, hdr in (("prezzi_etag", "etag"), ("prezzi_last_modified", "last-modified")):
-            if val := resp_prezzi.headers.get(hdr):
-                new_meta[key] = val
-                updated = True
-    if updated:
-        await _save_http_meta(settings.prezzi_csv_http_meta_path, new_meta)
+    if new_meta != meta:
+        _save_http_meta(settings.prezzi_csv_http_meta_path, new_meta)
 
     for name, text in (("anagrafica", anag_text), ("prezzi", prezzi_text)):
         if len(text) < MIN_CONTENT_LENGTH:
@@ -261,8 +293,11 @@ async def _load_local_csvs(settings: Settings) -> tuple[str, str]:
             anag_path = anag_files[0]
             prezzi_path = prezzi_files[0]
             try:
-                anag_text = await asyncio.to_thread(anag_path.read_text, "iso-8859-1")
-                prezzi_text = await asyncio.to_thread(prezzi_path.read_text, "iso-8859-1")
+                # Le due letture sono indipendenti: eseguile in parallelo
+                anag_text, prezzi_text = await asyncio.gather(
+                    asyncio.to_thread(_read_csv_text, anag_path),
+                    asyncio.to_thread(_read_csv_text, prezzi_path),
+                )
             except Exception as err:
                 logger.error("Failed to read local CSV files in {}: {}", d, err)
                 raise
@@ -290,8 +325,10 @@ async def _load_local_csvs(settings: Settings) -> tuple[str, str]:
                     target_anag_exists = await asyncio.to_thread(Path.exists, target_anag)
                     target_prezzi_exists = await asyncio.to_thread(Path.exists, target_prezzi)
                     if not (target_anag_exists and target_prezzi_exists):
-                        await asyncio.to_thread(target_anag.write_text, anag_text, "iso-8859-1")
-                        await asyncio.to_thread(target_prezzi.write_text, prezzi_text, "iso-8859-1")
+                        await asyncio.gather(
+                            asyncio.to_thread(target_anag.write_text, anag_text, "iso-8859-1"),
+                            asyncio.to_thread(target_prezzi.write_text, prezzi_text, "iso-8859-1"),
+                        )
                         logger.info(
                             "Migrated local CSVs from {} to {}: anag='{}', prezzi='{}'",
                             d,
@@ -339,6 +376,59 @@ async def _save_csv_files(
     - prezzi_text: The prezzi CSV text content.
     - settings: Application settings containing save configuration.
 
+    Returns:
+    - The directory where files were saved, or None on failure.
+    """
+    target_dir = await asyncio.to_thread(_write_csv_files, anag_text, prezzi_text, settings)
+    if target_dir is not None:
+        _schedule_csv_cleanup(target_dir, getattr(settings, "prezzi_keep_versions", 1))
+    return target_dir
+
+
+def _schedule_csv_save(anag_text: str, prezzi_text: str, settings: Settings) -> None:
+    """Salva i CSV scaricati e pota le versioni vecchie in background.
+
+    La risposta di ricerca non ha bisogno dei file su disco: il lavoro gira in
+    un worker thread, tracciato come gli altri task in background.
+
+    Parameters:
+    - anag_text: Il testo CSV anagrafica.
+    - prezzi_text: Il testo CSV prezzi.
+    - settings: Configurazione applicazione.
+    """
+
+    def save_and_cleanup() -> None:
+        target_dir = _write_csv_files(anag_text, prezzi_text, settings)
+        if target_dir is not None:
+            keep = getattr(settings, "prezzi_keep_versions", 1)
+            _cleanup_old_csvs(target_dir, "anagrafica_impianti_attivi_", keep)
+            _cleanup_old_csvs(target_dir, "prezzo_alle_8_", keep)
+
+    _run_in_background(save_and_cleanup, "CSV save")
+
+
+def _run_in_background(func: Callable[[], None], name: str) -> None:
+    """Run a blocking function in a worker thread as a tracked background task.
+
+    Parameters:
+    - func: The blocking function to run.
+    - name: The task name, used when logging a failure.
+    """
+    task = asyncio.create_task(asyncio.to_thread(func), name=name)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_background_done)
+
+
+def _on_background_done(task: asyncio.Task[None]) -> None:
+    """Forget a finished background task and log its failure, if any."""
+    _background_tasks.discard(task)
+    if not task.cancelled() and (err := task.exception()) is not None:
+        logger.warning("Background {} failed: {}", task.get_name(), err)
+
+
+def _write_csv_files(anag_text: str, prezzi_text: str, settings: Settings) -> Path | None:
+    """Write both CSVs to the first usable candidate dir (blocking; run in a worker thread).
+
     Returns:
     - The directory where files were saved, or None on failure.
     """
@@ -347,11 +437,7 @@ async def _save_csv_files(
         target_dir = None
         for d in candidates:
             try:
-                d_exists = await asyncio.to_thread(d.exists)
-                if d_exists:
-                    target_dir = d
-                    break
-                await asyncio.to_thread(d.mkdir, parents=True, exist_ok=True)
+                d.mkdir(parents=True, exist_ok=True)
                 target_dir = d
                 break
             except Exception:
@@ -361,26 +447,27 @@ async def _save_csv_files(
             logger.warning("No writable local csv directory found among candidates: {}", candidates)
             return None
         ts = datetime.now(tz=UTC).strftime("%Y%m%d_%H%M%S")
-        anag_name = f"anagrafica_impianti_attivi_{ts}.csv"
-        prezzi_name = f"prezzo_alle_8_{ts}.csv"
-        anag_part = target_dir / f"{anag_name}.part"
-        prezzi_part = target_dir / f"{prezzi_name}.part"
-        anag_final = target_dir / anag_name
-        prezzi_final = target_dir / prezzi_name
-
-        await asyncio.to_thread(anag_part.write_text, anag_text, "iso-8859-1")
-        await asyncio.to_thread(prezzi_part.write_text, prezzi_text, "iso-8859-1")
-        await asyncio.to_thread(anag_part.replace, anag_final)
-        await asyncio.to_thread(prezzi_part.replace, prezzi_final)
-        logger.info(
-            "Saved fetched CSVs to {}: anag='{}', prezzi='{}'",
-            target_dir,
-            anag_final,
-            prezzi_final,
-        )
-
-        _cleanup_old_csvs(target_dir, "anagrafica_impianti_attivi_", getattr(settings, "prezzi_keep_versions", 1))
-        _cleanup_old_csvs(target_dir, "prezzo_alle_8_", getattr(settings, "prezzi_keep_versions", 1))
+        saved: dict[str, Path | str] = {}
+        for prefix, text in (("anagrafica_impianti_attivi_", anag_text), ("prezzo_alle_8_", prezzi_text)):
+            data = text.encode("iso-8859-1")
+            # Between the daily MIMIT updates a refresh usually downloads the same
+            # file again: keep the stored copy instead of writing a duplicate
+            if _matches_latest_csv(target_dir, prefix, data):
+                logger.debug("{}*.csv unchanged since the last save in {}, not rewritten", prefix, target_dir)
+                saved[prefix] = "unchanged"
+                continue
+            final = target_dir / f"{prefix}{ts}.csv"
+            part = final.with_name(f"{final.name}.part")
+            part.write_bytes(data)
+            part.replace(final)
+            saved[prefix] = final
+        if any(isinstance(path, Path) for path in saved.values()):
+            logger.info(
+                "Saved fetched CSVs to {}: anag='{}', prezzi='{}'",
+                target_dir,
+                saved["anagrafica_impianti_attivi_"],
+                saved["prezzo_alle_8_"],
+            )
     except Exception as err:
         logger.warning("Failed to save fetched CSVs: {}", err)
         logger.exception(err)
@@ -389,6 +476,37 @@ async def _save_csv_files(
         return target_dir
 
 
+def _matches_latest_csv(directory: Path, prefix: str, data: bytes) -> bool:
+    """Tell whether the newest ``<prefix>*.csv`` in `directory` holds exactly `data`.
+
+    The size is compared first, so a changed file is usually told apart by a
+    stat alone; equal sizes fall back to a byte comparison.
+    """
+    try:
+        names = csv_admin.scan_csv_names(directory, (prefix,))
+        if not names:
+            return False
+        latest = directory / max(names)
+        return latest.stat().st_size == len(data) and latest.read_bytes() == data
+    except OSError:
+        return False
+
+
+def _schedule_csv_cleanup(directory: Path, keep: int) -> None:
+    """Prune older CSV versions in a worker thread without delaying the caller.
+
+    Parameters:
+    - directory: The directory the new CSVs were saved to.
+    - keep: The number of most recent versions to keep per file.
+    """
+
+    def cleanup() -> None:
+        _cleanup_old_csvs(directory, "anagrafica_impianti_attivi_", keep)
+        _cleanup_old_csvs(directory, "prezzo_alle_8_", keep)
+
+    _run_in_background(cleanup, "CSV cleanup")
+
+
 def _cleanup_old_csvs(directory: Path, prefix: str, keep: int = 1) -> None:
     """Remove older timestamped CSVs keeping only the most recent files.
 
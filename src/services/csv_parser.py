@@ -7,19 +7,28 @@
 from __future__ import annotations
 
 import csv
+import heapq
+import io
+import math
 import re
+import sys
+from array import array
+from collections import Counter
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from itertools import islice
 from typing import TYPE_CHECKING, Any
 
-from dateutil.parser import parse as dateutil_parse
 from loguru import logger
 
-from src.services.csv_utils import strip_bom
-from src.services.distance_utils import calculate_distance
+from src.services.csv_utils import bom_length
+from src.services.distance_utils import bounding_box, distance_from_haversine, haversine_limit, haversine_terms
 from src.services.fuel_type_utils import normalize_fuel_type
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
     from src.models import StationSearchParams
 
 # CSV column indices (based on official format)
@@ -33,10 +42,28 @@
 ADDR_IDX_START = 5
 ADDR_IDX_END = 8
 
+# Date formats used by the MIMIT prezzi CSV
+DATE_FORMATS = ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y")
+# The same formats, zero-padded as MIMIT writes them; anything else goes to strptime
+_DATE_RE = re.compile(r"(\d\d)/(\d\d)/(\d{4})(?: (\d\d):(\d\d)(?::(\d\d))?)?")
+
+# Price strings as the MIMIT feed writes them ("1.569", "1,569", "2"), and the
+# characters the tolerant parser strips from anything else
+_PLAIN_PRICE_RE = re.compile(r"\d+(?:[.,](\d{1,3}))?")
+_PRICE_JUNK_RE = re.compile(r"[^0-9,\.\-\+ ()]")
+# Placeholder header names of the legacy MIMIT files ("col0", "col1", ...)
+_GENERIC_COLUMN_RE = re.compile(r"col\d+")
+
+# Delimiters tried by auto-detection, in order of preference on ties
+DELIMITER_CANDIDATES = ("|", ";", ",", "\t")
+
 # Recency and distance constants
 DAYS_RECENCY = 7
 MIN_CSV_COLUMNS = 2
 
+# Cell size (degrees) of the spatial grid used to look up stations near a point
+GRID_CELL_DEG = 0.25
+
 
 def _parse_date(date_string: str | None) -> datetime | None:
     """Parse a date string into a datetime object.
@@ -49,15 +76,45 @@ def _parse_date(date_string: str | None) -> datetime | None:
     """
     if not date_string:
         return None
-    for fmt in ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y"):
+    return _parse_date_cached(date_string)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_string: str) -> datetime | None:
+    """Parse a non-empty date string; memoized because MIMIT timestamps repeat across many rows."""
+    # Fast path: one regex match and int() per field instead of strptime's
+    # format interpretation
+    if match := _DATE_RE.fullmatch(date_string):
+        day, month, year, hour, minute, second = match.groups()
+        try:
+            return datetime(
+                int(year),
+                int(month),
+                int(day),
+                int(hour or 0),
+                int(minute or 0),
+                int(second or 0),
+                tzinfo=UTC,
+            )
+        except ValueError:
+            pass  # out-of-range field: let strptime reject it below
+
+    for fmt in DATE_FORMATS:
         try:
             dt = datetime.strptime(date_string, fmt)  # noqa: DTZ007
             return dt.replace(tzinfo=UTC)
         except ValueError:
             continue
 
-    dt = dateutil_parse(date_string)
-    return dt.replace(tzinfo=UTC) if dt.tzinfo is None else dt.astimezone(UTC)
+    # The cache remembers the failure too, so this logs once per distinct string
+    logger.warning("Unrecognized price date format: {!r}", date_string)
+    return None
+
+
+def _date_timestamp(date_string: str | None) -> float | None:
+    """Return the epoch timestamp of a price date string, or None if it cannot be parsed."""
+    dt = _parse_date(date_string)
+    return dt.timestamp() if dt is not None else None
 
 
 def _is_recent(dt: datetime | None, days: int = DAYS_RECENCY) -> bool:
@@ -76,12 +133,13 @@ def _is_recent(dt: datetime | None, days: int = DAYS_RECENCY) -> bool:
     return dt >= (now - timedelta(days=days))
 
 
-def _detect_delimiter(csv_text: str, default: str = "|") -> str:
+def _detect_delimiter(csv_text: str, default: str = "|", start: int = 0) -> str:
     """Detect the delimiter used in a CSV text.
 
     Parameters:
     - csv_text: The CSV text to analyze.
     - default: The default delimiter to return if detection fails. Defaults to "|".
+    - start: Offset where the CSV content begins (e.g. past a BOM). Defaults to 0.
 
     Returns:
     - The detected delimiter character.
@@ -89,30 +147,50 @@ def _detect_delimiter(csv_text: str, default: str = "|") -> str:
     Notes:
     - As of February 10, 2026, MIMIT changed the CSV delimiter from semicolon (;) to pipe (|).
     - The default is now pipe, but we auto-detect for backwards compatibility.
-    - It tries simple header-splitting with common delimiters and picks the one that
-      yields the most columns (at least 2). If that fails, `csv.Sniffer` is used.
+    - It counts the common delimiters in the header and picks the one that
+      yields the most columns (at least 2). If that fails, the same vote runs
+      over all sampled lines.
     """
-    lines = [ln for ln in csv_text.splitlines() if ln.strip()]
+    # Only the first few non-blank lines are needed: read them lazily instead
+    # of splitting the whole file into a list
+    buf = io.StringIO(csv_text, newline="")
+    buf.seek(start)
+    lines = tuple(islice((ln for ln in buf if ln.strip()), 5))
     if not lines:
         return default
-    header = lines[0]
-    candidates = ["|", ";", ",", "\t"]
-    best = default
-    best_count = 0
-    for d in candidates:
-        count = len(header.split(d))
-        if count > best_count:
-            best_count = count
-            best = d
-    if best_count >= MIN_CSV_COLUMNS:
-        return best
-    try:
-        sample = "\n".join(lines[:5])
-        dialect = csv.Sniffer().sniff(sample, delimiters="|;,\t")
-    except csv.Error:
-        return default
-    else:
-        return dialect.delimiter
+    return _detect_delimiter_from_lines(lines, default)
+
+
+@lru_cache(maxsize=8)
+def _detect_delimiter_from_lines(lines: tuple[str, ...], default: str) -> str:
+    """Detect the delimiter from the first non-blank lines (see `_detect_delimiter`).
+
+    Memoized on the sampled lines: reloading the same files skips detection.
+    """
+    # One counting pass over the header, then over the whole sample when the
+    # header alone is inconclusive; ties go to the earlier candidate. A plain
+    # character vote replaces csv.Sniffer's regex heuristics.
+    for sample in (lines[0], "".join(lines)):
+        counts = Counter(sample)
+        best = max(DELIMITER_CANDIDATES, key=counts.__getitem__)
+        if counts[best] + 1 >= MIN_CSV_COLUMNS:
+            return best
+    return default
+
+
+def _iter_csv_rows(csv_text: str, delimiter: str, start: int = 0) -> Iterator[list[str]]:
+    """Iterate the rows of a CSV text, beginning at offset `start`.
+
+    MIMIT files carry no quoted fields, so unless the text contains a quote
+    character each line is split directly, skipping the csv module's quoting
+    state machine. Quoted input still goes through `csv.reader`.
+    """
+    # Read line by line, without a splitlines() copy of the whole text
+    lines = io.StringIO(csv_text, newline="")
+    lines.seek(start)
+    if '"' in csv_text:
+        return csv.reader(lines, delimiter=delimiter)
+    return (line.rstrip("\r\n").split(delimiter) for line in lines)
 
 
 # --- Header mapping helpers -------------------------------------------------
@@ -146,7 +224,7 @@ def _is_named_header(header_tokens: list[str]) -> bool:
         tl = t.strip().lower()
         if not tl:
             continue
-        if re.match(r"^col\d+$", tl):
+        if _GENERIC_COLUMN_RE.fullmatch(tl):
             continue
         if any(c.isalpha() for c in tl):
             return True
@@ -208,11 +286,24 @@ def _parse_price(value: str | None, *, prefer_decimal_three_frac: bool = False)
     """
     if not value:
         return None
+    # Fast path for plain numbers, which is nearly every row of the prezzi CSV
+    plain = _PLAIN_PRICE_RE.fullmatch(value)
+    if plain is not None:
+        frac = plain.group(1)
+        if frac is None:
+            return float(value)
+        if len(frac) <= 2 or prefer_decimal_three_frac:  # noqa: PLR2004
+            return float(value.replace(",", "."))
+    return _parse_price_tolerant(value, prefer_decimal_three_frac=prefer_decimal_three_frac)
+
+
+def _parse_price_tolerant(value: str, *, prefer_decimal_three_frac: bool) -> float | None:
+    """Parse a price string with currency glyphs, grouping separators or parentheses (see `_parse_price`)."""
     s = str(value).strip()
     # normalize NBSP to space
     s = s.replace("\u00a0", " ").strip()
     # keep only digits, separators, sign and parentheses (drop currency glyphs)
-    s = re.sub(r"[^0-9,\.\-\+ ()]", "", s)
+    s = _PRICE_JUNK_RE.sub("", s)
 
     # detect negative in parentheses e.g. (1,50)
     negative = False
@@ -261,40 +352,66 @@ def _parse_price(value: str | None, *, prefer_decimal_three_frac: bool = False)
     return -parsed if negative else parsed
 
 
-def _parse_anagrafica_row(
-    row: list[str],
-    *,
-    indices: AnagraficaIndices,
-) -> tuple[str, dict[str, Any]] | None:
-    """Parse one anagrafica row into a station record."""
-    if not row or len(row) <= max(indices.lat_idx, indices.lon_idx):
-        return None
-
-    id_impianto = row[indices.id_idx].strip() if indices.id_idx < len(row) else ""
-    if not id_impianto or not id_impianto.isdigit():
-        return None
+def _parse_coordinate(value: str) -> float | None:
+    """Parse a latitude/longitude cell written with a decimal dot or comma.
 
+    MIMIT writes dots, so the plain conversion is tried first and the comma
+    replacement (a copy of the string) only happens for the rows that need it.
+    """
     try:
-        lat = float(row[indices.lat_idx].replace(",", "."))
-        lon = float(row[indices.lon_idx].replace(",", "."))
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return float(value.replace(",", "."))
     except ValueError:
-        logger.debug("Skipping row with invalid coordinates: id={}", id_impianto)
         return None
 
-    if indices.address_idx is not None and indices.address_idx < len(row):
-        indirizzo = row[indices.address_idx].strip()
-    else:
-        indirizzo = " ".join(
-            [row[i] for i in range(ADDR_IDX_START, ADDR_IDX_END) if i < len(row) and row[i]],
-        ).strip()
 
-    return id_impianto, {
-        "gestore": row[indices.gestore_idx] if indices.gestore_idx < len(row) else "",
-        "indirizzo": indirizzo,
-        "latitudine": lat,
-        "longitudine": lon,
-        "prezzi": {},
-    }
+def _anagrafica_row_parser(
+    indices: AnagraficaIndices,
+) -> Callable[[list[str]], tuple[str, dict[str, Any]] | None]:
+    """Build the parser turning one anagrafica row into a station record.
+
+    The parser is specialized once per file: the schema's column indices and
+    length guard are closure locals instead of attribute reads on every row.
+    """
+    id_idx, gestore_idx, address_idx = indices.id_idx, indices.gestore_idx, indices.address_idx
+    lat_idx, lon_idx = indices.lat_idx, indices.lon_idx
+    min_len = max(lat_idx, lon_idx) + 1
+    legacy_address = range(ADDR_IDX_START, ADDR_IDX_END)
+    intern = sys.intern
+
+    def parse_row(row: list[str]) -> tuple[str, dict[str, Any]] | None:
+        row_len = len(row)
+        if row_len < min_len:
+            return None
+
+        id_impianto = row[id_idx].strip() if id_idx < row_len else ""
+        if not id_impianto or not id_impianto.isdigit():
+            return None
+
+        lat = _parse_coordinate(row[lat_idx])
+        lon = _parse_coordinate(row[lon_idx])
+        if lat is None or lon is None:
+            logger.debug("Skipping row with invalid coordinates: id={}", id_impianto)
+            return None
+
+        if address_idx is not None and address_idx < row_len:
+            indirizzo = row[address_idx].strip()
+        else:
+            indirizzo = " ".join([row[i] for i in legacy_address if i < row_len and row[i]]).strip()
+
+        return id_impianto, {
+            # A few thousand operators run ~20k stations: share one string each
+            "gestore": intern(row[gestore_idx]) if gestore_idx < row_len else "",
+            "indirizzo": indirizzo,
+            "latitudine": lat,
+            "longitudine": lon,
+            "prezzi": {},
+        }
+
+    return parse_row
 
 
 def _parse_anagrafica(csv_text: str, force_delimiter: str | None = None) -> dict[str, dict[str, Any]]:
@@ -303,16 +420,17 @@ def _parse_anagrafica(csv_text: str, force_delimiter: str | None = None) -> dict
     Supports header-name mapping when a named header row is present; falls back
     to legacy fixed-index parsing for the classic MIMIT "col0|col1|..." style.
     """
-    csv_text = strip_bom(csv_text)
+    # Skip the BOM by offset: slicing would copy the whole multi-MB text
+    start = bom_length(csv_text)
 
-    delimiter = force_delimiter or _detect_delimiter(csv_text)
-    reader = csv.reader(csv_text.splitlines(), delimiter=delimiter)
-    rows = list(reader)
+    delimiter = force_delimiter or _detect_delimiter(csv_text, start=start)
+    # Rows are consumed as they are split, never collected into a list
+    rows = _iter_csv_rows(csv_text, delimiter, start)
     data: dict[str, dict[str, Any]] = {}
-    if not rows:
+    header_tokens = next(rows, None)
+    if header_tokens is None:
         return data
 
-    header_tokens = rows[0]
     named = _is_named_header(header_tokens)
     header_map = _map_header_indices(header_tokens) if named else {}
 
@@ -333,17 +451,35 @@ def _parse_anagrafica(csv_text: str, force_delimiter: str | None = None) -> dict
         address_idx=header_map.get("address"),
     )
 
-    for row in rows[1:]:
-        parsed_row = _parse_anagrafica_row(
-            row,
-            indices=indices,
-        )
+    parse_row = _anagrafica_row_parser(indices)
+    total_rows = 0
+    for row in rows:
+        total_rows += 1
+        parsed_row = parse_row(row)
         if parsed_row is not None:
             id_impianto, station = parsed_row
             data[id_impianto] = station
+    logger.debug("Anagrafica rows read: {}, stations kept: {}", total_rows, len(data))
     return data
 
 
+# Substrings identifying the main fuel families in raw CSV descriptions
+FUEL_FAMILY_KEYWORDS = ("benzina", "gasolio", "diesel", "gpl", "metano")
+
+
+def _canonicalize_fuel(fuel_raw: str) -> str:
+    """Map a raw prezzi CSV fuel description to its canonical fuel type.
+
+    Not memoized here: `_parse_prezzi` keeps a per-parse dict of the results,
+    since the CSV repeats a small vocabulary of descriptions across every row.
+    """
+    fuel = fuel_raw.strip().lower()
+    for candidate in FUEL_FAMILY_KEYWORDS:
+        if candidate in fuel:
+            return normalize_fuel_type(candidate)
+    return normalize_fuel_type(fuel) or fuel
+
+
 def _parse_prezzi(csv_text: str, data: dict[str, dict[str, Any]], force_delimiter: str | None = None) -> None:
     """Parse the prezzi CSV and populate station price data.
 
@@ -354,15 +490,15 @@ def _parse_prezzi(csv_text: str, data: dict[str, dict[str, Any]], force_delimite
     missing, a ValueError is raised to fail fast and surface upstream schema
     changes.
     """
-    csv_text = strip_bom(csv_text)
+    start = bom_length(csv_text)
 
-    delimiter = force_delimiter or _detect_delimiter(csv_text)
-    reader = csv.reader(csv_text.splitlines(), delimiter=delimiter)
-    rows = list(reader)
-    if not rows:
+    delimiter = force_delimiter or _detect_delimiter(csv_text, start=start)
+    # Rows are consumed as they are split, never collected into a list
+    rows = _iter_csv_rows(csv_text, delimiter, start)
+    header_tokens = next(rows, None)
+    if header_tokens is None:
         return
 
-    header_tokens = rows[0]
     named = _is_named_header(header_tokens)
     header_map = _map_header_indices(header_tokens) if named else {}
 
@@ -383,45 +519,43 @@ def _parse_prezzi(csv_text: str, data: dict[str, dict[str, Any]], force_delimite
     fuel_idx = header_map.get("fuel", 1)
     id_idx = header_map.get("id", 0)
 
+    # Loop invariants: the length guard and the per-parse fuel memo
+    min_len = max(id_idx, price_idx, fuel_idx) + 1
+    canonical_fuels: dict[str, str] = {}
+    intern = sys.intern
+
+    total_rows = 0
     updates_applied = 0
-    for row in rows[1:]:
-        # basic length guard
-        if not row or len(row) <= max(id_idx, price_idx, fuel_idx):
+    for row in rows:
+        total_rows += 1
+        # basic length guard (also covers the id, fuel and price columns below)
+        if len(row) < min_len:
             continue
-        id_impianto = row[id_idx].strip() if id_idx < len(row) else ""
-        if id_impianto not in data:
+        station = data.get(row[id_idx].strip())
+        if station is None:
             continue
-        fuel_raw = (row[fuel_idx] if fuel_idx < len(row) else "").strip().lower()
-        canonical = next(
-            (
-                normalize_fuel_type(candidate)
-                for candidate in (
-                    "benzina",
-                    "gasolio",
-                    "diesel",
-                    "gpl",
-                    "metano",
-                )
-                if candidate in fuel_raw
-            ),
-            None,
-        )
+        # The fuel column repeats a handful of descriptions across every row
+        fuel_raw = row[fuel_idx]
+        canonical = canonical_fuels.get(fuel_raw)
         if canonical is None:
-            canonical = normalize_fuel_type(fuel_raw) or fuel_raw
-        price_raw = row[price_idx] if price_idx < len(row) else ""
+            canonical = canonical_fuels[fuel_raw] = _canonicalize_fuel(fuel_raw)
         # Prezzi CSV uses three fractional digits for fuel prices (e.g. "1,569").
         # Prefer decimal interpretation when parsing prezzo fields.
-        price = _parse_price(price_raw, prefer_decimal_three_frac=True)
-        existing = data[id_impianto]["prezzi"].get(canonical)
+        price = _parse_price(row[price_idx], prefer_decimal_three_frac=True)
+        prezzi = station["prezzi"]
+        existing = prezzi.get(canonical)
         if price is not None and (existing is None or price < existing.get("prezzo", float("inf"))):
-            data[id_impianto]["prezzi"][canonical] = {
+            # Price rows share a small set of timestamps: keep one copy of each
+            date_raw = intern(row[date_idx]) if date_idx < len(row) else ""
+            prezzi[canonical] = {
                 "prezzo": price,
                 "self": (row[self_idx] == "1") if self_idx < len(row) else False,
-                "data": row[date_idx] if date_idx < len(row) else "",
+                "data": date_raw,
+                "data_ts": _date_timestamp(date_raw),
             }
             updates_applied += 1
 
-    logger.debug("Updates applied to prezzi: {}", updates_applied)
+    logger.debug("Prezzi rows read: {}, updates applied: {}", total_rows, updates_applied)
 
 
 def _parse_and_combine_sync(
@@ -438,10 +572,130 @@ def _parse_and_combine_sync(
 
     Returns:
     - A dictionary mapping station IDs to their combined data including prices.
+      Stations without any price are left out.
     """
     data = _parse_anagrafica(anag_text, force_delimiter)
     _parse_prezzi(prezzi_text, data, force_delimiter)
-    return data
+    # A station the prezzi CSV never priced can never match a search: dropping it
+    # shrinks the in-memory payload, its JSON cache file and the spatial grid
+    priced = {id_impianto: station for id_impianto, station in data.items() if station["prezzi"]}
+    logger.debug("Stations with prices: {} of {}", len(priced), len(data))
+    return priced
+
+
+@dataclass(frozen=True)
+class StationGrid:
+    """Stations of a combined payload bucketed into coarse lat/lon cells.
+
+    Coordinates are kept as flat columns (struct-of-arrays) and cells hold
+    station ordinals, so the box test runs on packed floats without touching
+    the station dicts. Ordinals are payload positions: candidates come back in
+    the same order a full scan would visit them.
+    """
+
+    stations: list[dict[str, Any]]
+    lats: array[float]
+    lons: array[float]
+    cells: dict[tuple[int, int], array[int]]
+    unplaced: array[int]
+
+    def candidates(self, min_lat: float, max_lat: float, min_lon: float, max_lon: float) -> list[dict[str, Any]]:
+        """Return the stations inside the box, plus those without usable coordinates."""
+        lat_range = range(math.floor(min_lat / GRID_CELL_DEG), math.floor(max_lat / GRID_CELL_DEG) + 1)
+        lon_range = range(math.floor(min_lon / GRID_CELL_DEG), math.floor(max_lon / GRID_CELL_DEG) + 1)
+        if len(lat_range) * len(lon_range) <= len(self.cells):
+            keys = [(i, j) for i in lat_range for j in lon_range if (i, j) in self.cells]
+        else:
+            # A wide box covers most of the grid: filtering the populated cells is cheaper
+            keys = [key for key in self.cells if key[0] in lat_range and key[1] in lon_range]
+
+        lats, lons = self.lats, self.lons
+        ordinals = list(self.unplaced)
+        for key in keys:
+            ordinals.extend(
+                i for i in self.cells[key] if min_lat <= lats[i] <= max_lat and min_lon <= lons[i] <= max_lon
+            )
+        ordinals.sort()
+        stations = self.stations
+        return [stations[i] for i in ordinals]
+
+
+# Per-fuel grids for the most recently filtered payload, reused while the same object is passed in
+_station_grids: tuple[dict[str, Any], dict[str, StationGrid]] | None = None
+
+
+def _build_station_grid(stations: list[dict[str, Any]]) -> StationGrid:
+    """Bucket stations by grid cell."""
+    lats = array("d", bytes(8 * len(stations)))
+    lons = array("d", bytes(8 * len(stations)))
+    cells: dict[tuple[int, int], array[int]] = {}
+    unplaced = array("I")
+    for ordinal, station in enumerate(stations):
+        lat = station.get("latitudine")
+        lon = station.get("longitudine")
+        if not (isinstance(lat, (int, float)) and isinstance(lon, (int, float)) and math.isfinite(lat + lon)):
+            unplaced.append(ordinal)
+            continue
+        lats[ordinal] = lat
+        lons[ordinal] = lon
+        key = (math.floor(lat / GRID_CELL_DEG), math.floor(lon / GRID_CELL_DEG))
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = array("I")
+        cell.append(ordinal)
+    return StationGrid(stations=stations, lats=lats, lons=lons, cells=cells, unplaced=unplaced)
+
+
+def _station_grid_for(combined: dict[str, Any], fuel: str) -> StationGrid:
+    """Return the spatial grid of the stations pricing `fuel`, building it on first use.
+
+    Each fuel gets its own grid, built the first time that fuel is searched, so
+    a search never visits stations that have no price for it.
+    """
+    global _station_grids  # noqa: PLW0603
+    cached = _station_grids
+    if cached is None or cached[0] is not combined:
+        cached = _station_grids = (combined, {})
+    grids = cached[1]
+    grid = grids.get(fuel)
+    if grid is None:
+        grid = grids[fuel] = _build_station_grid([s for s in combined.values() if fuel in s.get("prezzi", {})])
+    return grid
+
+
+def _has_station_grid(combined: dict[str, Any], fuel: str) -> bool:
+    """Return True when the `fuel` grid for this exact payload object is already built."""
+    cached = _station_grids
+    return cached is not None and cached[0] is combined and fuel in cached[1]
+
+
+def _stations_in_box(
+    grid: StationGrid,
+    min_lat: float,
+    max_lat: float,
+    min_lon: float,
+    max_lon: float,
+) -> list[dict[str, Any]]:
+    """Return the grid's stations worth checking against the box, in payload order."""
+    if not (math.isfinite(min_lat) and math.isfinite(min_lon)):
+        return grid.stations
+    return grid.candidates(min_lat, max_lat, min_lon, max_lon)
+
+
+def _search_fuel(params: StationSearchParams | None) -> str:
+    """Return the canonical fuel key a search filters on ("" when none is given)."""
+    return normalize_fuel_type(params.fuel) if params and params.fuel else ""
+
+
+def _search_box(
+    search_lat: float | None,
+    search_lon: float | None,
+    distance_limit: float,
+) -> tuple[float, float, float, float]:
+    """Return the lat/lon box around the search point, unbounded when there is nothing to prune."""
+    if search_lat is None or search_lon is None or not math.isfinite(distance_limit):
+        return -math.inf, math.inf, -math.inf, math.inf
+    return bounding_box(search_lat, search_lon, distance_limit)
 
 
 def _filter_and_transform_combined(
@@ -457,26 +711,36 @@ def _filter_and_transform_combined(
     Returns:
     - A list of station dictionaries filtered and sorted by price, limited to the requested number of results.
     """
-    stations: list[dict[str, Any]] = []
-
     search_lat = params.latitude if params else None
     search_lon = params.longitude if params else None
     distance_limit = float(params.distance) if params else float("inf")
-    fuel = normalize_fuel_type(params.fuel) if params and params.fuel else ""
-    fuel_key = fuel
+    fuel_key = _search_fuel(params)
     max_items = int(params.results) if params else 5
+    # Same recency rule as _is_recent, as an epoch cutoff computed once per call
+    recent_cutoff = (datetime.now(tz=UTC) - timedelta(days=DAYS_RECENCY)).timestamp()
 
-    excluded_no_price = 0
     excluded_stale = 0
     excluded_invalid_coords = 0
-    excluded_out_of_distance = 0
 
-    for station in combined.values():
-        if not fuel or fuel_key not in station.get("prezzi", {}):
-            excluded_no_price += 1
-            continue
+    # Only stations pricing the fuel are indexed in its grid. The cheap box test
+    # discards far-away ones before any haversine; with a bounded box only the
+    # grid cells around the search point are visited at all
+    grid = _station_grid_for(combined, fuel_key)
+    excluded_no_price = len(combined) - len(grid.stations)
+    candidates = _stations_in_box(grid, *_search_box(search_lat, search_lon, distance_limit))
+    excluded_out_of_distance = len(grid.stations) - len(candidates)
+
+    # Stage 1: gather the candidate columns (struct-of-arrays); every candidate
+    # has a price for the requested fuel
+    sources: list[dict[str, Any]] = []
+    price_infos: list[dict[str, Any]] = []
+    lats: list[float] = []
+    lons: list[float] = []
+    for station in candidates:
         price_info = station["prezzi"][fuel_key]
-        if not _is_recent(_parse_date(price_info.get("data"))):
+        # Caches written before "data_ts" existed only carry the date string
+        price_ts = price_info["data_ts"] if "data_ts" in price_info else _date_timestamp(price_info.get("data"))
+        if price_ts is None or price_ts < recent_cutoff:
             excluded_stale += 1
             continue
         lat = station.get("latitudine")
@@ -484,28 +748,27 @@ def _filter_and_transform_combined(
         if lat is None or lon is None:
             excluded_invalid_coords += 1
             continue
-        if search_lat is not None and search_lon is not None:
-            dist = calculate_distance(search_lat, search_lon, lat, lon)
-            if dist > distance_limit:
-                excluded_out_of_distance += 1
-                continue
-        else:
-            dist = None
-
-        stations.append(
-            {
-                "gestore": station.get("gestore"),
-                "indirizzo": station.get("indirizzo"),
-                "prezzo": price_info.get("prezzo"),
-                "self": price_info.get("self"),
-                "data": price_info.get("data"),
-                "distanza": round(dist, 2) if dist is not None else None,
-                "latitudine": lat,
-                "longitudine": lon,
-            },
-        )
-
-    stations.sort(key=lambda s: s.get("prezzo", float("inf")))
+        sources.append(station)
+        price_infos.append(price_info)
+        lats.append(lat)
+        lons.append(lon)
+
+    # Stage 2: radius mask and top-k selection over light (price, index, term)
+    # rows; the index is unique, so ties keep payload order. The mask compares
+    # haversine terms, so only the returned stations pay for sqrt/asin.
+    matches: list[tuple[float, int, float | None]]
+    if search_lat is not None and search_lon is not None:
+        limit = haversine_limit(distance_limit)
+        matches = [
+            (price_infos[i].get("prezzo", math.inf), i, a)
+            for i, a in enumerate(haversine_terms(search_lat, search_lon, lats, lons))
+            if a <= limit
+        ]
+    else:
+        matches = [(price_infos[i].get("prezzo", math.inf), i, None) for i in range(len(sources))]
+    excluded_out_of_distance += len(sources) - len(matches)
+    top = heapq.nsmallest(max(1, max_items), matches)
+
     logger.debug(
         "Station filtering stats: no_price={}, stale={}, invalid_coords={}, out_of_distance={}",
         excluded_no_price,
@@ -513,4 +776,17 @@ def _filter_and_transform_combined(
         excluded_invalid_coords,
         excluded_out_of_distance,
     )
-    return stations[: max(1, min(max_items, len(stations)))]
+    # Output dicts are built only for the stations actually returned
+    return [
+        {
+            "gestore": sources[i].get("gestore"),
+            "indirizzo": sources[i].get("indirizzo"),
+            "prezzo": price_infos[i].get("prezzo"),
+            "self": price_infos[i].get("self"),
+            "data": price_infos[i].get("data"),
+            "distanza": round(distance_from_haversine(a), 2) if a is not None else None,
+            "latitudine": lats[i],
+            "longitudine": lons[i],
+        }
+        for _, i, a in top
+    ]
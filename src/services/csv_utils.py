@@ -1,10 +1,21 @@
 """Shared CSV utilities."""
 
+# UTF-8 BOM, decoded and as it reads when UTF-8 bytes are decoded as latin-1
+_BOM_PREFIXES = ("\ufeff", "ï»¿")
+
+
+def bom_length(text: str) -> int:
+    """Return the length of the UTF-8 BOM at the start of `text` (0 when absent).
+
+    Lets callers skip the BOM by offset instead of slicing a copy of the text.
+    """
+    for bom in _BOM_PREFIXES:
+        if text.startswith(bom):
+            return len(bom)
+    return 0
+
 
 def strip_bom(text: str) -> str:
     """Strip UTF-8 BOM from CSV text (handles both decoded and mis-decoded forms)."""
-    if text.startswith("\ufeff"):
-        text = text[1:]
-    elif text.startswith("ï»¿"):
-        text = text[3:]
-    return text
+    skip = bom_length(text)
+    return text[skip:] if skip else text
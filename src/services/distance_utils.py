@@ -1,8 +1,14 @@
 """Distance calculation utilities using Haversine formula."""
 
 import math
+from collections.abc import Sequence
 
 EARTH_RADIUS_KM = 6371.0
+EARTH_DIAMETER_KM = 2 * EARTH_RADIUS_KM
+MAX_LATITUDE_DEG = 90.0
+MAX_LONGITUDE_DEG = 180.0
+# Widens the bounding box slightly so float rounding never drops a point on the radius
+BBOX_MARGIN_DEG = 1e-6
 
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -21,5 +27,98 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     delta_lon = math.radians(lon2 - lon1)
 
     a = math.sin(delta_lat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return EARTH_RADIUS_KM * c
+    # 2*asin(sqrt(a)) equals 2*atan2(sqrt(a), sqrt(1-a)); min() guards rounding above 1
+    return EARTH_DIAMETER_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def calculate_distances(lat1: float, lon1: float, lats: Sequence[float], lons: Sequence[float]) -> list[float]:
+    """Calculate distances from one coordinate to many using Haversine formula.
+
+    The search-point terms are computed once for the whole batch instead of once per station.
+
+    Parameters:
+    - lat1, lon1: The search coordinate.
+    - lats, lons: Parallel sequences of station coordinates.
+
+    Returns:
+    - Distances in kilometers, in the same order as the input coordinates.
+    """
+    return [distance_from_haversine(a) for a in haversine_terms(lat1, lon1, lats, lons)]
+
+
+def haversine_terms(lat1: float, lon1: float, lats: Sequence[float], lons: Sequence[float]) -> list[float]:
+    """Return the haversine term `a` from one coordinate to many.
+
+    `a` grows monotonically with distance, so radius checks and nearest/cheapest
+    selections can compare it against `haversine_limit` and leave the sqrt/asin
+    of `distance_from_haversine` to the few points actually reported.
+
+    Parameters:
+    - lat1, lon1: The search coordinate.
+    - lats, lons: Parallel sequences of station coordinates.
+
+    Returns:
+    - Haversine terms in [0, 1], in the same order as the input coordinates.
+    """
+    radians, sin, cos = math.radians, math.sin, math.cos
+    lat1_rad = radians(lat1)
+    lon1_rad = radians(lon1)
+    cos_lat1 = cos(lat1_rad)
+
+    terms: list[float] = []
+    append = terms.append
+    for lat2, lon2 in zip(lats, lons, strict=True):
+        lat2_rad = radians(lat2)
+        half_dlat = (lat2_rad - lat1_rad) * 0.5
+        half_dlon = (radians(lon2) - lon1_rad) * 0.5
+        append(sin(half_dlat) ** 2 + cos_lat1 * cos(lat2_rad) * sin(half_dlon) ** 2)
+    return terms
+
+
+def haversine_limit(distance_km: float) -> float:
+    """Return the haversine term of a distance: points within it have `a <= limit`.
+
+    Parameters:
+    - distance_km: The radius in kilometers (may be infinite).
+
+    Returns:
+    - The threshold in [0, 1]; 1.0 once the radius spans half the globe.
+    """
+    half_angle = distance_km / EARTH_DIAMETER_KM
+    if half_angle >= math.pi / 2:
+        return 1.0
+    return math.sin(half_angle) ** 2
+
+
+def distance_from_haversine(a: float) -> float:
+    """Convert a haversine term back to a distance in kilometers."""
+    # 2*asin(sqrt(a)) equals 2*atan2(sqrt(a), sqrt(1-a)); min() guards rounding above 1
+    return EARTH_DIAMETER_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lon: float, distance_km: float) -> tuple[float, float, float, float]:
+    """Return a latitude/longitude box containing every point within a distance of a coordinate.
+
+    Four comparisons against the box are much cheaper than a haversine, so callers
+    use it to discard far-away points before computing exact distances.
+
+    Parameters:
+    - lat, lon: The center coordinate.
+    - distance_km: The radius in kilometers.
+
+    Returns:
+    - A (min_lat, max_lat, min_lon, max_lon) tuple in degrees. The longitude range is
+      unbounded when the circle reaches a pole or crosses the antimeridian.
+    """
+    angular = distance_km / EARTH_RADIUS_KM
+    delta_lat = math.degrees(angular) + BBOX_MARGIN_DEG
+    min_lat, max_lat = lat - delta_lat, lat + delta_lat
+    if max_lat >= MAX_LATITUDE_DEG or min_lat <= -MAX_LATITUDE_DEG:
+        return min_lat, max_lat, -math.inf, math.inf
+
+    # Widest longitude span of a spherical cap that does not contain a pole
+    delta_lon = math.degrees(math.asin(min(1.0, math.sin(angular) / math.cos(math.radians(lat))))) + BBOX_MARGIN_DEG
+    min_lon, max_lon = lon - delta_lon, lon + delta_lon
+    if min_lon < -MAX_LONGITUDE_DEG or max_lon > MAX_LONGITUDE_DEG:
+        return min_lat, max_lat, -math.inf, math.inf
+    return min_lat, max_lat, min_lon, max_lon
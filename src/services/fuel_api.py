@@ -1,11 +1,14 @@
 """Fuel station API service."""
 
+import heapq
+import sys
+from operator import itemgetter
 from typing import Any
 
 import httpx2 as httpx
 from fastapi import HTTPException
 from loguru import logger
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 
 from src.models import (
     MAX_RESULTS_COUNT,
@@ -17,9 +20,13 @@
 from src.services.csv_parser import CSVSchemaError
 from src.services.distance_utils import calculate_distance
 from src.services.prezzi_csv import fetch_and_combine_csv_data
+from src.services.retry_utils import is_transient_error
+
+# Coordinate bounds enforced by the Station model
+MAX_ABS_LATITUDE = 90.0
+MAX_ABS_LONGITUDE = 180.0
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(), reraise=True)
 async def fetch_gas_stations(
     params: StationSearchParams,
     settings: Settings,
@@ -39,18 +46,32 @@ async def fetch_gas_stations(
     - HTTPException: If the API returns an HTTP error.
     - RetryError: If all retry attempts fail.
     """
+    # Logged once, outside the retried section. loguru only formats the message
+    # when DEBUG is enabled, so the params model is rendered lazily as it is.
+    logger.debug(
+        "Fetching gas station data from CSV sources: anagrafica={} prezzi={} params={}",
+        settings.prezzi_csv_anagrafica_url,
+        settings.prezzi_csv_prezzi_url,
+        params,
+    )
+    return await _fetch_gas_stations_with_retry(params, settings, http_client)
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_random_exponential(multiplier=0.5, max=8),
+    retry=retry_if_exception(is_transient_error),
+    reraise=True,
+)
+async def _fetch_gas_stations_with_retry(
+    params: StationSearchParams,
+    settings: Settings,
+    http_client: httpx.AsyncClient,
+) -> dict | list[Any]:
+    """Run the CSV fetch/combine pipeline, retrying only transient (503) failures."""
     try:
-        logger.info(
-            "Fetching gas station data from CSV sources: anagrafica={} prezzi={} params={}",
-            settings.prezzi_csv_anagrafica_url,
-            settings.prezzi_csv_prezzi_url,
-            params.model_dump(),
-        )
         payload = await fetch_and_combine_csv_data(settings, http_client, params=params)
-        logger.info(
-            "CSV gas station payload size: {}",
-            len(payload) if payload else 0,
-        )
+        logger.debug("CSV gas station payload size: {}", len(payload) if payload else 0)
     except CSVSchemaError as err:
         # Surface schema problems as a client-visible, testable 422
         logger.error("CSV schema error: {}", err)
@@ -95,7 +116,14 @@ def parse_and_normalize_stations(
         logger.warning("Unexpected stations payload type: {}", type(stations_payload))
         return [], 0
 
-    stations: list[Station] = []
+    # Every FuelPrice shares the same fuel type: intern it once and bind the
+    # unvalidated constructor locally, the price bound is checked inline below.
+    fuel_type = sys.intern(fuel_type)
+    make_fp = FuelPrice.model_construct
+
+    # Stage 1: one pass over the raw dicts into primitive rows; the model
+    # constraints are checked here so every row left can become a Station.
+    rows: list[tuple[float, int, float, float, str]] = []
     skipped_count = 0
     for idx, data in payload_iter:
         if not isinstance(data, dict):
@@ -107,30 +135,48 @@ def parse_and_normalize_stations(
             price: float = float(prezzo_raw) if prezzo_raw is not None else 0.0
             lat = float(data.get("latitudine") or 0.0)
             lon = float(data.get("longitudine") or 0.0)
-            # Filter out invalid coordinates at (0.0, 0.0)
-            if lat == 0.0 and lon == 0.0:
-                logger.warning("Skipping station {} because of invalid coordinates: lat=0.0, lon=0.0", idx)
-                skipped_count += 1
-                continue
-            # Calculate distance from search location
-            distance = None
-            if search_lat is not None and search_lon is not None:
-                distance = calculate_distance(search_lat, search_lon, lat, lon)
-            station = Station(
-                id=str(idx),
-                address=data.get("indirizzo", "") or "",
-                latitude=lat,
-                longitude=lon,
-                fuel_prices=[FuelPrice(type=fuel_type, price=price)],
-                distance=round(distance, 1) if distance is not None else None,
-            )
-            stations.append(station)
         except (ValueError, TypeError) as err:
             logger.warning("Skipping station {} due to parse error: {}", idx, err)
             skipped_count += 1
             continue
+        # Filter out invalid coordinates at (0.0, 0.0)
+        if lat == 0.0 and lon == 0.0:
+            logger.warning("Skipping station {} because of invalid coordinates: lat=0.0, lon=0.0", idx)
+            skipped_count += 1
+            continue
+        if not (price >= 0.0 and abs(lat) <= MAX_ABS_LATITUDE and abs(lon) <= MAX_ABS_LONGITUDE):
+            logger.warning(
+                "Skipping station {} due to out-of-range values: price={} lat={} lon={}",
+                idx,
+                price,
+                lat,
+                lon,
+            )
+            skipped_count += 1
+            continue
+        rows.append((price, idx, lat, lon, str(data.get("indirizzo") or "")))
 
-    stations.sort(key=lambda s: s.fuel_prices[0].price if s.fuel_prices else float("inf"))
+    # Stage 2: pick the cheapest rows (heapq keeps ties in payload order) and
+    # build models only for those; stage 1 already enforced their constraints.
     limit = max(1, min(results_limit, MAX_RESULTS_COUNT))
+    top_rows = heapq.nsmallest(limit, rows, key=itemgetter(0))
+    make_station = Station.model_construct
+
+    stations: list[Station] = []
+    for price, idx, lat, lon, address in top_rows:
+        # Calculate distance from search location
+        distance = None
+        if search_lat is not None and search_lon is not None:
+            distance = calculate_distance(search_lat, search_lon, lat, lon)
+        stations.append(
+            make_station(
+                id=str(idx),
+                address=address,
+                latitude=lat,
+                longitude=lon,
+                fuel_prices=[make_fp(type=fuel_type, price=price)],
+                distance=round(distance, 1) if distance is not None else None,
+            ),
+        )
 
-    return stations[:limit], skipped_count
+    return stations, skipped_count
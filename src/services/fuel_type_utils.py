@@ -1,5 +1,8 @@
 """Fuel type normalization utilities."""
 
+import sys
+from functools import lru_cache
+
 FUEL_TYPE_MAPPING = {
     # Accept common English synonyms and normalize to canonical CSV key names
     "diesel": "gasolio",
@@ -10,6 +13,9 @@
     "gpl": "GPL",
     "metano": "metano",
 }
+# Intern keys and canonical values: they are reused as dict keys for CSV
+# matching and caching, so every normalized fuel type shares one object.
+FUEL_TYPE_MAPPING = {sys.intern(k): sys.intern(v) for k, v in FUEL_TYPE_MAPPING.items()}
 
 
 def normalize_fuel_type(fuel_type: str) -> str:
@@ -20,7 +26,16 @@ def normalize_fuel_type(fuel_type: str) -> str:
 
     Returns:
     - The normalized fuel type string expected by the Prezzi Carburante API.
+      Non-empty results are interned, so equal fuel types are the same object.
     """
     if not fuel_type:
         return ""
-    return FUEL_TYPE_MAPPING.get(fuel_type.lower(), fuel_type.lower())
+    # Already-lowercase names (what the UI sends) resolve with one dict lookup.
+    return FUEL_TYPE_MAPPING.get(fuel_type) or _normalize_fuel_type_cached(fuel_type)
+
+
+@lru_cache(maxsize=512)
+def _normalize_fuel_type_cached(fuel_type: str) -> str:
+    """Map a non-empty fuel type to its interned canonical name (memoized per raw input)."""
+    lowered = fuel_type.lower()
+    return sys.intern(FUEL_TYPE_MAPPING.get(lowered, lowered))
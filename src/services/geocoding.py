@@ -1,30 +1,129 @@
 """Geocoding service using OpenStreetMap Nominatim."""
 
 import asyncio
-import json
+import os
+import random
+import re
+import sys
 import threading
+import time
+from collections.abc import Iterable
 from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from functools import cache, lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Protocol
 
 import httpx2 as httpx
+import orjson
 from cachetools import TTLCache
 from fastapi import HTTPException
 from loguru import logger
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from src.models import Settings
+from src.services.retry_utils import is_transient_error
 
 # Global cache for geocoding results: city name -> location dict
-# maxsize=1000 items, ttl=86400 seconds (24 hours)
+# maxsize=1000 items, ttl=86400 seconds (24 hours). This is the single
+# in-process cache: import it (or use get_from_cache/set_in_cache) rather than
+# defining another one, so every code path shares the same hot set.
 geocoding_cache: TTLCache[str, dict[str, float]] = TTLCache(maxsize=1000, ttl=86400)
 _cache_lock = threading.Lock()
 
-# Rate limiter: semaphore to ensure max 1 request per second to Nominatim
-_rate_limiter = asyncio.Semaphore(1)
+
+class _IntervalLimiter:
+    """Async context manager spacing entries at least ``interval`` seconds apart.
+
+    Callers queue on a lock and sleep only for the remainder of the interval,
+    so bursts are paced to the provider policy instead of being rejected.
+    This is a token bucket of capacity one: no bursts above the rate.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._next_allowed = 0.0
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            wait_secs = self._next_allowed - now
+            if wait_secs > 0:
+                await asyncio.sleep(wait_secs)
+                now = self._next_allowed
+            self._next_allowed = now + self.interval
+
+    async def __aexit__(self, *_exc: object) -> None:
+        return None
+
+    def reset(self) -> None:
+        """Forget the last entry so the next one proceeds immediately."""
+        self._next_allowed = 0.0
+
+    def set_rate(self, per_second: float) -> None:
+        """Set the maximum number of entries per second."""
+        self.interval = 1.0 / per_second
+
+    def defer(self, seconds: float) -> None:
+        """Hold back the next entry for at least ``seconds`` (e.g. per Retry-After)."""
+        self._next_allowed = max(self._next_allowed, time.monotonic() + seconds)
+
+
+# Nominatim usage policy: at most 1 request per second
+_rate_limiter = _IntervalLimiter(1.0)
 
 # Maximum seconds we will respect from a Retry-After header (safety clamp)
 MAX_RETRY_AFTER_SECONDS = 60
+# Delta-seconds form of Retry-After ("120" or "1.5"), parsed without exceptions
+_RETRY_AFTER_SECONDS_RE = re.compile(r"\d+(?:\.\d+)?")
+
+# Static Nominatim query parameters; only "q" varies per request. Only lat/lon
+# are read, so ask for the leanest response shape.
+_NOMINATIM_PARAMS = MappingProxyType(
+    {
+        "format": "jsonv2",
+        "limit": 1,
+        "addressdetails": 0,
+        "extratags": 0,
+        "namedetails": 0,
+        "polygon_geojson": 0,
+        "countrycodes": "it",
+        "accept-language": "it",
+    },
+)
+
+# Cities whose lookup was recently rate-limited: short-lived negative entries so
+# retries and concurrent searches do not keep hammering the provider
+RATE_LIMITED_CACHE_TTL_SECONDS = 60
+_rate_limited_cache: TTLCache[str, bool] = TTLCache(maxsize=1000, ttl=RATE_LIMITED_CACHE_TTL_SECONDS)
+RATE_LIMITED_DETAIL = (
+    "Geocoding service is currently rate-limited (bandwidth exceeded). Please try again later or try a nearby city."
+)
+
+# Cities the provider (and the local fallback) could not find: repeated bad
+# queries get their 404 straight away instead of another provider round-trip
+NOT_FOUND_CACHE_MAXSIZE = 500
+NOT_FOUND_CACHE_TTL_SECONDS = 600
+_not_found_cache: TTLCache[str, bool] = TTLCache(maxsize=NOT_FOUND_CACHE_MAXSIZE, ttl=NOT_FOUND_CACHE_TTL_SECONDS)
+
+# In-flight lookups by normalized city: concurrent callers share one task
+_inflight: dict[str, asyncio.Future[dict[str, float]]] = {}
+# Callers awaiting each in-flight lookup: the last one to give up cancels it
+_inflight_waiters: dict[asyncio.Future[dict[str, float]], int] = {}
+
+# Persistent geocoding cache (L2), stored next to the prezzi cache file
+GEOCODING_DISK_CACHE_FILENAME = "geocoding_cache.json"
+_disk_cache_lock = threading.Lock()
+# Parsed cache files keyed by path, with the (mtime_ns, size) of the version they came from
+_disk_cache_memo: dict[Path, tuple[int, int, dict[str, Any]]] = {}
+
+# Attempts, exponential backoff bounds and random jitter (seconds) for geocode_city;
+# the jitter keeps retries from several workers from firing in lockstep
+GEOCODE_MAX_ATTEMPTS = 3
+GEOCODE_RETRY_MIN_WAIT = 2
+GEOCODE_RETRY_MAX_WAIT = 10
+GEOCODE_RETRY_JITTER = 0.5
 
 
 class AsyncGeocodingClient(Protocol):
@@ -54,26 +153,20 @@ def _parse_retry_after_header(value: str | None) -> float | None:
     if not value:
         return None
     s = value.strip()
-    # Plain integer/float seconds
-    try:
+    # Fast path: plain integer/float seconds
+    if _RETRY_AFTER_SECONDS_RE.fullmatch(s):
         return float(s)
-    except Exception:
-        logger.debug("Failed to parse Retry-After as float: {}", s)
 
-    # Try parsing as an HTTP-date
+    # Otherwise it must be an HTTP-date
     try:
-        from email.utils import parsedate_to_datetime  # noqa: PLC0415
-
         dt = parsedate_to_datetime(s)
-        # parsedate_to_datetime may return naive datetime — treat as UTC
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=UTC)
-
-        now = datetime.now(tz=UTC)
-        delta = (dt - now).total_seconds()
-        return max(0.0, delta)
-    except Exception:
+    except (TypeError, ValueError, IndexError, OverflowError):
+        logger.debug("Failed to parse Retry-After header: {}", s)
         return None
+    # parsedate_to_datetime may return naive datetime — treat as UTC
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return max(0.0, (dt - datetime.now(tz=UTC)).total_seconds())
 
 
 # In-memory local city coordinates loaded from a static JSON (if available)
@@ -88,9 +181,149 @@ def get_from_cache(key: str) -> dict[str, float] | None:
 
 
 def set_in_cache(key: str, value: dict[str, float]) -> None:
-    """Thread-safe set in geocoding cache."""
+    """Thread-safe set in geocoding cache (keys are interned, lookups reuse their hash)."""
+    with _cache_lock:
+        geocoding_cache[sys.intern(key)] = value
+
+
+@cache
+def _user_agent_headers(user_agent: str) -> dict[str, str]:
+    """Return the (shared, never mutated) request headers for a User-Agent."""
+    return {"User-Agent": user_agent}
+
+
+def _is_rate_limited(key: str) -> bool:
+    """Return True if the provider rate-limited a lookup for this key recently."""
+    with _cache_lock:
+        return key in _rate_limited_cache
+
+
+def _mark_rate_limited(key: str) -> None:
+    """Remember that the provider rate-limited a lookup for this key."""
+    with _cache_lock:
+        _rate_limited_cache[key] = True
+
+
+def _is_not_found(key: str) -> bool:
+    """Return True if a lookup for this key recently found no such city."""
+    with _cache_lock:
+        return key in _not_found_cache
+
+
+def _mark_not_found(key: str) -> None:
+    """Remember that a lookup for this key found no such city."""
     with _cache_lock:
-        geocoding_cache[key] = value
+        _not_found_cache[key] = True
+
+
+def _disk_cache_path(settings: Settings) -> Path:
+    """Return the path of the persistent geocoding cache file."""
+    return Path(settings.prezzi_cache_path).parent / GEOCODING_DISK_CACHE_FILENAME
+
+
+def _read_disk_cache(path: Path) -> dict[str, Any]:
+    """Read the persistent cache file, returning an empty mapping when missing or invalid."""
+    try:
+        data = orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        logger.debug("Ignoring unreadable geocoding disk cache {}: {}", path, exc)
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _disk_entry_coords(entry: Any, now: float, ttl_seconds: int) -> dict[str, float] | None:
+    """Return the coordinates of a persisted entry, or None if it is expired or malformed."""
+    if not isinstance(entry, dict):
+        return None
+    try:
+        if now - float(entry["ts"]) > ttl_seconds:
+            return None
+        return {"latitude": float(entry["latitude"]), "longitude": float(entry["longitude"])}
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _load_disk_cache(path: Path) -> dict[str, Any]:
+    """Return the parsed cache file, parsing it again only when its mtime or size changed.
+
+    Must be called with ``_disk_cache_lock`` held; the returned mapping is shared, never mutate it.
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        _disk_cache_memo.pop(path, None)
+        return {}
+    except OSError as exc:
+        logger.debug("Ignoring unreadable geocoding disk cache {}: {}", path, exc)
+        return {}
+    memo = _disk_cache_memo.get(path)
+    if memo is not None and memo[0] == st.st_mtime_ns and memo[1] == st.st_size:
+        return memo[2]
+    data = _read_disk_cache(path)
+    _disk_cache_memo[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+
+def _disk_cache_get_sync(path: Path, key: str, ttl_seconds: int) -> dict[str, float] | None:
+    """Look up a key in the persistent cache file (a stat per lookup, a parse per file version)."""
+    with _disk_cache_lock:
+        data = _load_disk_cache(path)
+    return _disk_entry_coords(data.get(key), time.time(), ttl_seconds)
+
+
+def _disk_cache_set_sync(path: Path, key: str, value: dict[str, float], ttl_seconds: int) -> None:
+    """Store a key in the persistent cache file, pruning expired entries (atomic replace).
+
+    Best effort across processes: the entry is merged into the newest version of
+    the file, but there is no cross-process lock, so when two workers store at the
+    same moment the last writer wins and the other entry is lost. That only costs
+    one more provider lookup for that city later.
+    """
+    with _disk_cache_lock:
+        now = time.time()
+        data = {k: v for k, v in _load_disk_cache(path).items() if _disk_entry_coords(v, now, ttl_seconds)}
+        data[key] = {**value, "ts": now}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Per-process temp name: several workers may share the same cache file
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.part")
+        tmp_path.write_bytes(orjson.dumps(data))
+        tmp_path.replace(path)
+        st = path.stat()
+        _disk_cache_memo[path] = (st.st_mtime_ns, st.st_size, data)
+
+
+async def get_from_disk_cache(settings: Settings, key: str) -> dict[str, float] | None:
+    """Get a geocoding result from the persistent cache (None on miss or error)."""
+    if not settings.geocoding_disk_cache_enabled:
+        return None
+    try:
+        return await asyncio.to_thread(
+            _disk_cache_get_sync,
+            _disk_cache_path(settings),
+            key,
+            settings.geocoding_disk_cache_ttl_seconds,
+        )
+    except Exception as exc:
+        logger.debug("Geocoding disk cache read failed for '{}': {}", key, exc)
+        return None
+
+
+async def set_in_disk_cache(settings: Settings, key: str, value: dict[str, float]) -> None:
+    """Persist a geocoding result; failures are logged and otherwise ignored."""
+    if not settings.geocoding_disk_cache_enabled:
+        return
+    try:
+        await asyncio.to_thread(
+            _disk_cache_set_sync,
+            _disk_cache_path(settings),
+            key,
+            value,
+            settings.geocoding_disk_cache_ttl_seconds,
+        )
+    except Exception as exc:
+        logger.warning("Could not persist geocoding result for '{}': {}", key, exc)
 
 
 # Small alias mapping for common English/Italian city name pairs
@@ -228,8 +461,7 @@ def _load_local_city_coords(settings: Settings) -> dict[str, dict[str, float]]:
         for p in candidates:
             if p.exists():
                 try:
-                    with p.open("r", encoding="utf-8") as fh:
-                        data = json.load(fh)
+                    data = orjson.loads(p.read_bytes())
                     mapping = _parse_cities_json(data)
                     _LOCAL_CITY_COORDS = mapping
                     logger.debug("Loaded local city coords from {} (entries={})", p, len(mapping))
@@ -242,23 +474,52 @@ def _load_local_city_coords(settings: Settings) -> dict[str, dict[str, float]]:
         return _LOCAL_CITY_COORDS
 
 
+async def warmup_city_coords(settings: Settings) -> int:
+    """Load the local city coordinates off the event loop, ahead of the first fallback.
+
+    Call at application startup so a rate-limited request never pays for the
+    file probing and JSON parse.
+
+    Parameters:
+    - settings: Application settings (locates cities.json next to the prezzi cache).
+
+    Returns:
+    - The number of cities available for fallback.
+    """
+    coords = await asyncio.to_thread(_load_local_city_coords, settings)
+    return len(coords)
+
+
+def configure_rate_limit(settings: Settings) -> None:
+    """Pace Nominatim requests to ``settings.nominatim_rps`` for the whole process.
+
+    Call once at startup: the limiter is shared by every caller, so it is never
+    reconfigured from the settings a single lookup was given.
+    """
+    _rate_limiter.set_rate(settings.nominatim_rps)
+
+
 def _get_local_city_coords(settings: Settings, normalized_city: str) -> dict[str, float] | None:
     """Return local fallback coordinates for a normalized city, if available."""
     local_coords = _load_local_city_coords(settings)
     return local_coords.get(normalized_city)
 
 
-async def _sleep_for_retry_after(retry_after: str | None) -> None:
-    """Sleep for a bounded Retry-After duration when the header is parseable."""
-    if not retry_after:
-        return
+async def _sleep_for_retry_after(retry_after: str | None, default_backoff: float) -> None:
+    """Sleep for a bounded Retry-After duration when the header is parseable.
 
+    Without a usable header the caller is not delayed, but later Nominatim
+    requests are held back for ``default_backoff`` seconds.
+    """
     wait_secs = _parse_retry_after_header(retry_after)
     if wait_secs is None:
-        logger.debug("Could not parse Retry-After header: {}", retry_after)
+        logger.debug("No usable Retry-After header ({}); backing off {}s", retry_after, default_backoff)
+        _rate_limiter.defer(default_backoff)
         return
 
     wait_secs = min(wait_secs, MAX_RETRY_AFTER_SECONDS)
+    # Also hold back every other Nominatim request for the same window
+    _rate_limiter.defer(wait_secs)
     logger.debug("Sleeping for {} seconds per Retry-After header (clamped)", wait_secs)
     await asyncio.sleep(wait_secs)
 
@@ -273,10 +534,10 @@ async def _geocode_with_photon(
         photon_response = await http_client.get(
             settings.photon_api_url,
             params={"q": normalized_city, "limit": 1},
-            headers={"User-Agent": settings.user_agent},
+            headers=_user_agent_headers(settings.user_agent),
         )
         photon_response.raise_for_status()
-        photon_data = photon_response.json()
+        photon_data = orjson.loads(photon_response.content)
         if photon_data.get("features"):
             location = photon_data["features"][0]["geometry"]["coordinates"]
             result = {"longitude": float(location[0]), "latitude": float(location[1])}
@@ -288,6 +549,7 @@ async def _geocode_with_photon(
     return None
 
 
+@lru_cache(maxsize=512)
 def normalize_city_input(city: str) -> str:
     """Normalize city input for cache keys and geocoding queries.
 
@@ -296,12 +558,12 @@ def normalize_city_input(city: str) -> str:
 
     Returns:
     - The normalized city name (lowercase, trimmed, with aliases resolved).
+      Results are memoized and interned: they are used as cache keys.
     """
     c = city.strip().lower()
-    return ALIASES.get(c, c)
+    return sys.intern(ALIASES.get(c, c))
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10), reraise=True)
 async def geocode_city(
     city: str,
     settings: Settings,
@@ -309,6 +571,12 @@ async def geocode_city(
 ) -> dict[str, float]:
     """Geocode a city name to latitude and longitude using OpenStreetMap Nominatim.
 
+    Transient failures (transport errors, 5xx) are retried with jittered
+    exponential backoff; after the last attempt the original exception is
+    re-raised. Client errors such as an unknown city fail immediately.
+    Concurrent calls for the same city share a single lookup instead of each
+    hitting the provider.
+
     Parameters:
     - city: The city name to geocode.
     - settings: Application settings containing API URL and user agent.
@@ -319,118 +587,240 @@ async def geocode_city(
 
     Raises:
     - HTTPException: If the city is not found or the API returns an error.
-    - RetryError: If all retry attempts fail.
     """
-    # Normalize city input and check cache first
     normalized_city = normalize_city_input(city)
     cached_result = get_from_cache(normalized_city)
     if cached_result is not None:
-        logger.info("Found city '{}' in geocoding cache", normalized_city)
+        logger.debug("Found city '{}' in geocoding cache", normalized_city)
         return cached_result
+    if _is_not_found(normalized_city):
+        raise HTTPException(status_code=404, detail=f"City '{city}' not found")
+
+    # Single-flight: the first caller starts the lookup task, later callers for
+    # the same city await it. shield() keeps a cancelled caller (e.g. a search
+    # timeout) from cancelling the lookup for everybody else; once no caller is
+    # left waiting, the lookup (and its retry sleeps) is cancelled too.
+    task = _inflight.get(normalized_city)
+    if task is None:
+        task = asyncio.ensure_future(_geocode_city_with_retries(city, settings, http_client))
+        _inflight[normalized_city] = task
+        task.add_done_callback(lambda done, key=normalized_city: _forget_inflight(key, done))
+    _inflight_waiters[task] = _inflight_waiters.get(task, 0) + 1
+    try:
+        return await asyncio.shield(task)
+    finally:
+        _inflight_waiters[task] -= 1
+        if not _inflight_waiters[task]:
+            del _inflight_waiters[task]
+            task.cancel()
+
+
+def _forget_inflight(key: str, task: asyncio.Future[dict[str, float]]) -> None:
+    """Drop a finished lookup from the in-flight registry."""
+    if _inflight.get(key) is task:
+        del _inflight[key]
+
+
+async def cancel_inflight_lookups() -> None:
+    """Cancel the lookups still in flight on the running loop and wait for them to stop.
+
+    Call at shutdown so no lookup keeps retrying the provider once its client is closed.
+    """
+    loop = asyncio.get_running_loop()
+    tasks = [task for task in _inflight.values() if task.get_loop() is loop]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
 
-    # Rate limiting: acquire semaphore to ensure max 1 request per second
-    async with _rate_limiter:
-        # Try Nominatim first
+async def _geocode_city_with_retries(
+    city: str,
+    settings: Settings,
+    http_client: AsyncGeocodingClient,
+) -> dict[str, float]:
+    """Run geocoding attempts, retrying transient failures and re-raising the last one."""
+    # The request inputs are assembled once and shared by every attempt
+    normalized_city = normalize_city_input(city)
+    query_params = {"q": normalized_city, **_NOMINATIM_PARAMS}
+
+    # A plain loop instead of a tenacity decorator: the first attempt succeeds
+    # for nearly every search and should not pay for the retry state machine.
+    for attempt in range(1, GEOCODE_MAX_ATTEMPTS):
         try:
+            return await _geocode_city_once(city, normalized_city, query_params, settings, http_client)
+        except Exception as err:
+            # A rate-limited city would only hit the negative cache again
+            if not is_transient_error(err) or _is_rate_limited(normalized_city):
+                raise
+            wait_secs = min(max(2 ** (attempt - 1), GEOCODE_RETRY_MIN_WAIT), GEOCODE_RETRY_MAX_WAIT)
+            wait_secs += random.uniform(0, GEOCODE_RETRY_JITTER)  # noqa: S311 - timing jitter, not security
+            logger.debug("Geocoding attempt {} for '{}' failed ({}); retrying in {}s", attempt, city, err, wait_secs)
+            await asyncio.sleep(wait_secs)
+    return await _geocode_city_once(city, normalized_city, query_params, settings, http_client)
+
+
+async def _lookup_cached_coords(normalized_city: str, settings: Settings) -> dict[str, float] | None:
+    """Return cached coordinates from memory or disk, or None when a lookup is needed.
+
+    Raises:
+    - HTTPException: 503 if the provider rate-limited this city moments ago.
+    """
+    cached_result = get_from_cache(normalized_city)
+    if cached_result is not None:
+        logger.debug("Found city '{}' in geocoding cache", normalized_city)
+        return cached_result
+
+    # Persistent cache next: survives restarts and is shared, best effort, between workers
+    disk_result = await get_from_disk_cache(settings, normalized_city)
+    if disk_result is not None:
+        logger.debug("Found city '{}' in persistent geocoding cache", normalized_city)
+        set_in_cache(normalized_city, disk_result)
+        return disk_result
+
+    # The provider rate-limited this lookup moments ago: do not ask again yet
+    if _is_rate_limited(normalized_city):
+        raise HTTPException(status_code=503, detail=RATE_LIMITED_DETAIL)
+    return None
+
+
+async def _geocode_city_once(
+    city: str,
+    normalized_city: str,
+    query_params: dict[str, Any],
+    settings: Settings,
+    http_client: AsyncGeocodingClient,
+) -> dict[str, float]:
+    """Run a single geocoding attempt: cache, Nominatim, then fallbacks."""
+    # Check the caches first
+    cached_result = await _lookup_cached_coords(normalized_city, settings)
+    if cached_result is not None:
+        return cached_result
+
+    # Try Nominatim first, paced by the rate limiter (only the request itself)
+    try:
+        async with _rate_limiter:
             response = await http_client.get(
                 settings.nominatim_api_url,
-                params={
-                    "q": normalized_city,
-                    "format": "json",
-                    "limit": 1,
-                    "countrycodes": "it",
-                    "accept-language": "it",
-                },
-                headers={"User-Agent": settings.user_agent},
+                params=query_params,
+                headers=_user_agent_headers(settings.user_agent),
             )
-            response.raise_for_status()
-            data = response.json()
-            if not data:
-                coords = _get_local_city_coords(settings, normalized_city)
-                if coords is not None:
-                    logger.warning(
-                        "Using local fallback coordinates for '{}' because provider returned no results",
-                        normalized_city,
-                    )
-                    set_in_cache(normalized_city, coords)
-                    return coords
-                raise HTTPException(status_code=404, detail=f"City '{city}' not found")
-
-            location = data[0]
-            result = {"latitude": float(location["lat"]), "longitude": float(location["lon"])}
-        except httpx.HTTPStatusError as err:
-            status = err.response.status_code if err.response is not None else None
-            reason = getattr(err.response, "reason_phrase", "") if err.response is not None else ""
-
-            # Handle rate-limit / bandwidth-exceeded cases with retry-after and local fallback
-            if status in (429, 509):
-                retry_after = None
-                if err.response is not None:
-                    retry_after = err.response.headers.get("Retry-After")
-
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        if not data:
+            coords = _get_local_city_coords(settings, normalized_city)
+            if coords is not None:
                 logger.warning(
-                    "Geocoding provider rate-limited: status={} reason={} retry_after={}",
-                    status,
-                    reason,
-                    retry_after,
+                    "Using local fallback coordinates for '{}' because provider returned no results",
+                    normalized_city,
                 )
+                set_in_cache(normalized_city, coords)
+                return coords
+            _mark_not_found(normalized_city)
+            raise HTTPException(status_code=404, detail=f"City '{city}' not found")
+
+        location = data[0]
+        result = {"latitude": float(location["lat"]), "longitude": float(location["lon"])}
+    except httpx.HTTPStatusError as err:
+        status = err.response.status_code if err.response is not None else None
+        reason = getattr(err.response, "reason_phrase", "") if err.response is not None else ""
+
+        # Handle rate-limit / bandwidth-exceeded cases with retry-after and local fallback
+        if status in (429, 509):
+            retry_after = err.response.headers.get("Retry-After") if err.response is not None else None
 
-                await _sleep_for_retry_after(retry_after)
-
-                # Try to find local city coordinates as a fallback
-                coords = _get_local_city_coords(settings, normalized_city)
-                if coords is not None:
-                    logger.warning(
-                        "Using local fallback coordinates for '{}' due to provider rate limit",
-                        normalized_city,
-                    )
-                    set_in_cache(normalized_city, coords)
-                    return coords
-
-                # Surface a 503 to the client (tenacity retries will still apply to outer attempts)
-                raise HTTPException(
-                    status_code=503,
-                    detail=(
-                        "Geocoding service is currently rate-limited (bandwidth exceeded). "
-                        "Please try again later or try a nearby city."
-                    ),
-                ) from err
-
-            # For 403 (Forbidden) or other errors, try Photon fallback
-            if status in (403, 502, 503):
-                logger.warning("Nominatim returned {} - trying Photon fallback", status)
-                photon_result = await _geocode_with_photon(normalized_city, settings, http_client)
-                if photon_result is not None:
-                    set_in_cache(normalized_city, photon_result)
-                    return photon_result
-
-            # Other HTTP errors — surface upstream
-            logger.error(
-                "Geocoding API returned error: {} - {}",
+            logger.warning(
+                "Geocoding provider rate-limited: status={} reason={} retry_after={}",
                 status,
                 reason,
+                retry_after,
             )
-            raise HTTPException(
-                status_code=status or 502,
-                detail=f"Geocoding service error: {reason}",
-            ) from err
-        except httpx.RequestError as err:
-            logger.warning("Geocoding request error: {}", err)
-            # Try local fallback coordinates before failing
+            _mark_rate_limited(normalized_city)
+
+            await _sleep_for_retry_after(retry_after, settings.nominatim_default_backoff_seconds)
+
+            # Try to find local city coordinates as a fallback
             coords = _get_local_city_coords(settings, normalized_city)
             if coords is not None:
                 logger.warning(
-                    "Using local fallback coordinates for '{}' due to request error",
+                    "Using local fallback coordinates for '{}' due to provider rate limit",
                     normalized_city,
                 )
                 set_in_cache(normalized_city, coords)
                 return coords
 
-            raise HTTPException(
-                status_code=503,
-                detail="Geocoding service is temporarily unavailable. Please try again later.",
-            ) from err
-        else:
-            # Update cache only if request succeeded
-            set_in_cache(normalized_city, result)
-            return result
+            # Surface a 503 to the client (geocode_city retries will still apply to outer attempts)
+            raise HTTPException(status_code=503, detail=RATE_LIMITED_DETAIL) from err
+
+        # For 403 (Forbidden) or other errors, try Photon fallback
+        if status in (403, 502, 503):
+            logger.warning("Nominatim returned {} - trying Photon fallback", status)
+            photon_result = await _geocode_with_photon(normalized_city, settings, http_client)
+            if photon_result is not None:
+                set_in_cache(normalized_city, photon_result)
+                await set_in_disk_cache(settings, normalized_city, photon_result)
+                return photon_result
+
+        # Other HTTP errors — surface upstream
+        logger.error(
+            "Geocoding API returned error: {} - {}",
+            status,
+            reason,
+        )
+        raise HTTPException(
+            status_code=status or 502,
+            detail=f"Geocoding service error: {reason}",
+        ) from err
+    except httpx.RequestError as err:
+        logger.warning("Geocoding request error: {}", err)
+        # Try local fallback coordinates before failing
+        coords = _get_local_city_coords(settings, normalized_city)
+        if coords is not None:
+            logger.warning(
+                "Using local fallback coordinates for '{}' due to request error",
+                normalized_city,
+            )
+            set_in_cache(normalized_city, coords)
+            return coords
+
+        raise HTTPException(
+            status_code=503,
+            detail="Geocoding service is temporarily unavailable. Please try again later.",
+        ) from err
+    else:
+        # Update caches only if request succeeded
+        set_in_cache(normalized_city, result)
+        await set_in_disk_cache(settings, normalized_city, result)
+        return result
+
+
+async def geocode_cities(
+    cities: Iterable[str],
+    settings: Settings,
+    http_client: AsyncGeocodingClient,
+) -> dict[str, dict[str, float]]:
+    """Geocode several cities concurrently.
+
+    Names are normalized and deduplicated first, so aliases of the same city
+    cost a single lookup. At most ``settings.nominatim_max_concurrency``
+    lookups run at once.
+
+    Parameters:
+    - cities: The city names to geocode.
+    - settings: Application settings containing API URL and user agent.
+    - http_client: Shared HTTP client for making requests.
+
+    Returns:
+    - A mapping of normalized city name to a dict with 'latitude' and 'longitude'.
+
+    Raises:
+    - HTTPException: If any city is not found or the API returns an error.
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.nominatim_max_concurrency))
+
+    async def _geocode_one(normalized_city: str) -> tuple[str, dict[str, float]]:
+        async with semaphore:
+            return normalized_city, await geocode_city(normalized_city, settings, http_client)
+
+    unique_cities = dict.fromkeys(normalize_city_input(c) for c in cities if c and c.strip())
+    results = await asyncio.gather(*(_geocode_one(c) for c in unique_cities))
+    return dict(results)
@@ -41,6 +41,7 @@
     _fetch_csvs,
     _load_local_csvs,
     _save_csv_files,
+    _schedule_csv_save,
 )
 from src.services.csv_parser import (
     ADDR_IDX_END,
@@ -55,9 +56,12 @@
     PRICE_IDX,
     SELF_IDX,
     _filter_and_transform_combined,
+    _has_station_grid,
     _is_recent,
     _parse_and_combine_sync,
     _parse_date,
+    _search_fuel,
+    _station_grid_for,
 )
 
 # Re-export for backward compatibility
@@ -112,13 +116,14 @@ async def fetch_and_combine_csv_data(
     - A list of station dictionaries filtered and sorted by price.
     """
     combined: dict[str, Any] | None = None
+    fuel = _search_fuel(params)
 
     try:
-        is_fresh = await _is_cache_fresh(settings.prezzi_cache_path, settings.prezzi_cache_hours)
+        is_fresh = _is_cache_fresh(settings.prezzi_cache_path, settings.prezzi_cache_hours)
         if is_fresh:
             cached = await _load_cached_combined(settings.prezzi_cache_path)
             if cached is not None and len(cached) > 0:
-                logger.info("Using cached prezzi data from {} ({} stations)", settings.prezzi_cache_path, len(cached))
+                logger.debug("Using cached prezzi data from {} ({} stations)", settings.prezzi_cache_path, len(cached))
                 combined = cached
             elif cached is not None:
                 logger.warning(
@@ -133,20 +138,25 @@ async def fetch_and_combine_csv_data(
     if combined is None:
         anag_text, prezzi_text = await _fetch_csvs(http_client, settings)
         force_delimiter = None if settings.prezzi_csv_delimiter == "auto" else settings.prezzi_csv_delimiter
+        # The searched fuel's spatial grid is built in the same worker thread, so
+        # the first search after a reload does not pay for it on the event loop
         combined = await asyncio.to_thread(
-            lambda: _parse_and_combine_sync(anag_text, prezzi_text, force_delimiter),
+            lambda: _with_station_grid(_parse_and_combine_sync(anag_text, prezzi_text, force_delimiter), fuel),
         )
         logger.debug("Combined CSV stations count: %d", len(combined) if combined else 0)
+        # The CSV copies (same text just parsed, never parsed again) are written
+        # in the background: the search response does not wait for them
+        _schedule_csv_save(anag_text, prezzi_text, settings)
         await _write_json_file(settings.prezzi_cache_path, combined)
-        saved_dir = await _save_csv_files(anag_text, prezzi_text, settings)
-        if saved_dir:
-            try:
-                anag_text2, prezzi_text2 = await _load_local_csvs(settings)
-                combined2 = await asyncio.to_thread(
-                    lambda: _parse_and_combine_sync(anag_text2, prezzi_text2, force_delimiter),
-                )
-                await _write_json_file(settings.prezzi_cache_path, combined2)
-            except Exception as e:
-                logger.warning("Failed to refresh cache after saving CSVs: {}", e)
+    elif not _has_station_grid(combined, fuel):
+        # A payload (re)loaded from the JSON cache, or a fuel not searched yet:
+        # index it off the event loop
+        await asyncio.to_thread(_station_grid_for, combined, fuel)
 
     return _filter_and_transform_combined(combined, params)
+
+
+def _with_station_grid(combined: dict[str, Any], fuel: str) -> dict[str, Any]:
+    """Build the `fuel` spatial grid for a freshly parsed payload and return the payload."""
+    _station_grid_for(combined, fuel)
+    return combined
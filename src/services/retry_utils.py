@@ -0,0 +1,25 @@
+"""Retry policy shared by the outbound service calls."""
+
+import httpx2 as httpx
+from fastapi import HTTPException
+
+# Responses at or above this status are server-side and may succeed on retry
+SERVER_ERROR_STATUS = 500
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Return True for failures worth retrying.
+
+    Transport errors (connect/read timeouts, resets) and 5xx HTTPExceptions
+    are transient. Client errors such as a 404 for an unknown city or a 422
+    schema error can never succeed on retry.
+
+    Parameters:
+    - exc: The exception raised by the attempt.
+
+    Returns:
+    - Whether another attempt may succeed.
+    """
+    if isinstance(exc, httpx.TransportError):
+        return True
+    return isinstance(exc, HTTPException) and exc.status_code >= SERVER_ERROR_STATUS
@@ -42,6 +42,11 @@ def linearize(channel: float) -> float:
     return ((channel + SRGB_OFFSET) / (1 + SRGB_OFFSET)) ** SRGB_EXPONENT
 
 
+# An 8-bit channel has only 256 values: linearize each once so contrast checks
+# index a table instead of paying a branch and a fractional power per channel.
+LINEAR_CHANNELS: tuple[float, ...] = tuple(linearize(value / 255.0) for value in range(256))
+
+
 def luminance(rgb: tuple[float, float, float]) -> float:
     """Calculate relative luminance from RGB values.
 
@@ -55,6 +60,23 @@ def luminance(rgb: tuple[float, float, float]) -> float:
     return 0.2126 * linearize(r) + 0.7152 * linearize(g) + 0.0722 * linearize(b)
 
 
+def _hex_luminance(hex_color: str) -> float:
+    """Calculate relative luminance of a hex color through the 8-bit lookup table.
+
+    Parameters:
+    - hex_color: Hexadecimal color string (with or without leading #).
+
+    Returns:
+    - Relative luminance value, identical to ``luminance(hex_to_rgb(hex_color))``.
+    """
+    hex_clean = hex_color.lstrip("#")
+    return (
+        0.2126 * LINEAR_CHANNELS[int(hex_clean[0:2], 16)]
+        + 0.7152 * LINEAR_CHANNELS[int(hex_clean[2:4], 16)]
+        + 0.0722 * LINEAR_CHANNELS[int(hex_clean[4:6], 16)]
+    )
+
+
 def contrast_ratio(hex1: str, hex2: str) -> float:
     """Calculate WCAG contrast ratio between two colors.
 
@@ -65,8 +87,8 @@ def contrast_ratio(hex1: str, hex2: str) -> float:
     Returns:
     - Contrast ratio (1:1 to 21:1 range).
     """
-    l1 = luminance(hex_to_rgb(hex1))
-    l2 = luminance(hex_to_rgb(hex2))
+    l1 = _hex_luminance(hex1)
+    l2 = _hex_luminance(hex2)
     l_max = max(l1, l2)
     l_min = min(l1, l2)
     return (l_max + 0.05) / (l_min + 0.05)
@@ -1,29 +1,160 @@
 """Fixtures for testing the FastAPI application."""
 
-from collections.abc import Generator
+import json
+import os
+from collections.abc import AsyncGenerator, Generator
+from functools import cache, lru_cache
 from typing import Any
 
+import httpx2 as httpx
 import pytest
 from fastapi.testclient import TestClient
 
 from src.main import app
+from src.models import Settings
+from src.services import geocoding
+from src.services.geocoding import _load_local_city_coords
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client() -> Generator[TestClient]:
-    """Fixture to provide a TestClient for the FastAPI app with lifespan handled."""
+    """Provide one TestClient for the whole session so the app lifespan runs only once.
+
+    Tests that change app behaviour must do so through ``monkeypatch`` (or restore
+    ``app.dependency_overrides`` themselves) so nothing leaks into later tests.
+    """
     with TestClient(app) as client:
         yield client
 
 
+@lru_cache(maxsize=1)
+def shared_settings() -> Settings:
+    """Return one default Settings instance, built (env and .env parsed) once per session.
+
+    Treat it as read-only: tests that need different values should take
+    ``shared_settings().model_copy(update={...})``, which skips the env parsing.
+    """
+    return Settings()
+
+
+def read_static_bytes(path: str) -> bytes:
+    """Read a static asset's raw bytes, once per version of the file.
+
+    For pure substring checks, which need no decoding; see ``read_static_text``.
+    """
+    return _read_static_bytes(path, os.stat(path).st_mtime_ns)  # noqa: PTH116
+
+
+def read_static_text(path: str) -> str:
+    """Read a static asset (stylesheet, template, script), once per version of the file.
+
+    The UI test modules inspect the same few files from many tests: every test
+    module reading repository files should go through here, so each file is
+    opened once per session however many tests or modules check it. The cache
+    is keyed on the file mtime, so an edit made while a long-lived session
+    (watch mode) keeps rerunning the tests is picked up.
+    """
+    return _read_static_text(path, os.stat(path).st_mtime_ns)  # noqa: PTH116
+
+
+@cache
+def _read_static_text(path: str, mtime_ns: int) -> str:
+    """Decode a static asset as UTF-8, reusing the cached bytes."""
+    return _read_static_bytes(path, mtime_ns).decode("utf-8")
+
+
+@cache
+def _read_static_bytes(path: str, _mtime_ns: int) -> bytes:
+    """Read a static asset; the files are only a few kB, so one raw ``os.read`` skips the text-IO layers.
+
+    ``os.read`` allocates the result once, at the exact size, and the cache hands the same
+    object to every caller. It stays ``bytes`` rather than a reused ``bytearray``/``memoryview``:
+    the shared object must be immutable, and callers rely on ``in`` substring
+    search, which ``memoryview`` does not support.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_city_coords() -> None:
+    """Load the local city coordinates once per session, before any test needs the fallback.
+
+    The loader memoizes its result, so the app lifespan (entered by each client
+    fixture) and the geocoding tests all reuse the parsed mapping.
+    """
+    _load_local_city_coords(shared_settings())
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """Keep each test module on one xdist worker unless it is marked ``parallel_safe``.
+
+    Runs before xdist tags node ids with their group, so under ``--dist loadgroup``
+    every unmarked module behaves as with ``--dist loadfile``, while the pure,
+    read-only ``parallel_safe`` tests are spread over all workers one by one.
+    """
+    for item in items:
+        if item.get_closest_marker("xdist_group") or item.get_closest_marker("parallel_safe"):
+            continue
+        item.add_marker(pytest.mark.xdist_group(item.nodeid.split("::", 1)[0]))
+
+
+def _clear_geocoding_state() -> None:
+    """Empty the geocoding caches and in-flight registry, and restore the shared rate limiter."""
+    geocoding.geocoding_cache.clear()
+    geocoding._rate_limited_cache.clear()
+    geocoding._not_found_cache.clear()
+    geocoding._inflight.clear()
+    geocoding._rate_limiter.reset()
+    geocoding._rate_limiter.set_rate(shared_settings().nominatim_rps)
+
+
+@pytest.fixture(autouse=True)
+async def _reset_geocoding_state() -> AsyncGenerator[None]:
+    """Give every test fresh geocoding globals, and leave none of its own behind.
+
+    The positive and negative caches live for minutes to hours: without this a
+    city cached, rate-limited or not found by one test changes the outcome of
+    any later test (in serial ``-n0`` runs especially) that looks it up again.
+    Lookups still in flight are cancelled first, so none of them can retry or
+    pace the rate limiter after the reset.
+    """
+    await geocoding.cancel_inflight_lookups()
+    _clear_geocoding_state()
+    yield
+    await geocoding.cancel_inflight_lookups()
+    _clear_geocoding_state()
+
+
+@pytest.fixture(scope="session")
+async def aclient() -> AsyncGenerator[httpx.AsyncClient]:
+    """Provide an async client calling the app in-process on the shared test event loop.
+
+    Unlike TestClient there is no worker thread bridging each request: requests run
+    on the pytest-asyncio session loop, and the app lifespan is entered once here.
+    """
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client,
+    ):
+        yield client
+
+
 class DummyResponse:
     """Mock HTTP response for testing."""
 
+    __slots__ = ("_json", "content", "reason_phrase", "status_code", "text")
+
     def __init__(self, json_data: Any, status_code: int = 200, text: str = "") -> None:
         """Initialize mock response with JSON data, status code, and text."""
         self._json = json_data
         self.status_code = status_code
         self.text = text
+        self.content = text.encode() if text else json.dumps(json_data).encode()
         self.reason_phrase = "OK"
 
     def raise_for_status(self) -> None:
@@ -38,9 +169,17 @@ def json(self) -> Any:
         return self._json
 
 
+# Florence as returned by Nominatim; one response object is shared by every DummyClient.
+GEOCODE_STUB_JSON = [{"lat": "43.7696", "lon": "11.2558"}]
+GEOCODE_STUB_TEXT = '[{"lat":"43.7696","lon":"11.2558"}]'
+GEOCODE_STUB_RESPONSE = DummyResponse(GEOCODE_STUB_JSON, text=GEOCODE_STUB_TEXT)
+
+
 class DummyClient:
     """Mock HTTP client for testing geocoding."""
 
+    __slots__ = ("called_with",)
+
     def __init__(self) -> None:
         """Initialize with empty called_with dict."""
         self.called_with: dict | None = None
@@ -48,7 +187,7 @@ def __init__(self) -> None:
     async def get(self, url: str, params: dict | None = None, headers: dict | None = None) -> DummyResponse:
         """Mock GET request that returns dummy geocoding data."""
         self.called_with = {"url": url, "params": params, "headers": headers}
-        return DummyResponse([{"lat": "43.7696", "lon": "11.2558"}], text='[{"lat":"43.7696","lon":"11.2558"}]')
+        return GEOCODE_STUB_RESPONSE
 
 
 HTTP_ERROR_THRESHOLD = 400
@@ -57,6 +196,8 @@ async def get(self, url: str, params: dict | None = None, headers: dict | None =
 class DummyResponseCsv:
     """Simple response stub mimicking httpx.Response for CSV tests."""
 
+    __slots__ = ("content", "headers", "status_code", "url")
+
     def __init__(
         self,
         content: bytes,
@@ -80,6 +221,8 @@ def raise_for_status(self):
 class DummyClientCsv:
     """Test-double for an AsyncClient that returns predefined CSV bytes."""
 
+    __slots__ = ("_anag", "_prezzi", "calls")
+
     def __init__(self, anag_text: bytes, prezzi_text: bytes):
         """Store CSV payloads for subsequent `get` calls."""
         self._anag = anag_text
@@ -100,6 +243,16 @@ async def get(self, url: str, _params: Any = None, headers: dict | None = None)
 class DummyClientCsvConditional:
     """Mock async HTTP client per testare richieste CSV condizionali (ETag/304)."""
 
+    __slots__ = (
+        "_anag_content",
+        "_anag_resp_headers",
+        "_anag_status",
+        "_prezzi_content",
+        "_prezzi_resp_headers",
+        "_prezzi_status",
+        "sent_headers",
+    )
+
     def __init__(
         self,
         anag_status: int = 200,
@@ -139,6 +292,8 @@ async def get(self, url: str, headers: dict | None = None, **kwargs: Any) -> Dum
 class DummyClientException:
     """Minimal async client that raises a pre-configured exception from get()."""
 
+    __slots__ = ("_exc",)
+
     def __init__(self, exc: Exception) -> None:
         """Initialize the dummy client with an exception to raise.
 
@@ -0,0 +1,64 @@
+"""Unit tests for distance calculation helpers."""
+
+import math
+
+from src.services.distance_utils import (
+    bounding_box,
+    calculate_distance,
+    calculate_distances,
+    distance_from_haversine,
+    haversine_limit,
+    haversine_terms,
+)
+
+FLORENCE = (43.7696, 11.2558)
+MILAN = (45.4642, 9.19)
+
+
+def test_calculate_distances_matches_single_calculation():
+    """The batch kernel returns the same distances as the per-point helper."""
+    lats = [MILAN[0], FLORENCE[0]]
+    lons = [MILAN[1], FLORENCE[1]]
+
+    distances = calculate_distances(*FLORENCE, lats, lons)
+
+    assert math.isclose(distances[0], calculate_distance(*FLORENCE, *MILAN))
+    assert distances[1] == 0.0
+
+
+def test_bounding_box_contains_points_on_the_radius():
+    """Points exactly at the search radius, in every direction, fall inside the box."""
+    lat, lon = FLORENCE
+    radius_km = 25.0
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+
+    delta_lat = math.degrees(radius_km / 6371.0)
+    assert min_lat <= lat - delta_lat
+    assert max_lat >= lat + delta_lat
+    assert min_lon < lon < max_lon
+    assert calculate_distance(lat, lon, lat, max_lon) >= radius_km
+
+
+def test_bounding_box_unbounded_longitude_near_pole():
+    """A circle reaching a pole leaves the longitude range unbounded."""
+    _, _, min_lon, max_lon = bounding_box(89.9, 0.0, 50.0)
+
+    assert min_lon == -math.inf
+    assert max_lon == math.inf
+
+
+def test_haversine_limit_matches_distance_threshold():
+    """Comparing haversine terms against the limit agrees with comparing distances."""
+    lats = [MILAN[0], FLORENCE[0], 43.9, 44.5]
+    lons = [MILAN[1], FLORENCE[1], 11.3, 11.3]
+    radius_km = 50.0
+
+    terms = haversine_terms(*FLORENCE, lats, lons)
+    # The scalar helper, not calculate_distances: that one is built on haversine_terms
+    distances = [calculate_distance(*FLORENCE, lat, lon) for lat, lon in zip(lats, lons, strict=True)]
+
+    limit = haversine_limit(radius_km)
+    assert [a <= limit for a in terms] == [d <= radius_km for d in distances]
+    for a, d in zip(terms, distances, strict=True):
+        assert math.isclose(distance_from_haversine(a), d, abs_tol=1e-9)
+    assert haversine_limit(math.inf) == 1.0
@@ -1,22 +1,30 @@
 """Unit tests for fuel type normalization."""
 
-from src.services.fuel_type_utils import normalize_fuel_type
-
+import pytest
 
-def test_normalize_common_synonyms():
-    """Test normalization of common fuel type synonyms to canonical forms."""
-    assert normalize_fuel_type("benzina") == "benzina"
-    assert normalize_fuel_type("Benzina") == "benzina"
-    assert normalize_fuel_type("gasoline") == "benzina"
-    assert normalize_fuel_type("Petrol") == "benzina"
-    assert normalize_fuel_type("diesel") == "gasolio"
-    assert normalize_fuel_type("gasolio") == "gasolio"
-    assert normalize_fuel_type("gpl") == "GPL"
-    assert normalize_fuel_type("metano") == "metano"
+from src.services.fuel_type_utils import normalize_fuel_type
 
 
-def test_normalize_empty_or_unknown() -> None:
-    """Test normalization of empty or unknown fuel types."""
-    assert normalize_fuel_type("") == ""
-    # Unknown returns lowercased input
-    assert normalize_fuel_type("unknownfuel") == "unknownfuel"
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        # Canonical names and common synonyms, in any case
+        ("benzina", "benzina"),
+        ("Benzina", "benzina"),
+        ("BENZINA", "benzina"),
+        ("gasoline", "benzina"),
+        ("Petrol", "benzina"),
+        ("diesel", "gasolio"),
+        ("Diesel", "gasolio"),
+        ("gasolio", "gasolio"),
+        ("gpl", "GPL"),
+        ("metano", "metano"),
+        # Empty stays empty; unknown returns lowercased input
+        ("", ""),
+        ("unknownfuel", "unknownfuel"),
+        ("Unknown", "unknown"),
+    ],
+)
+def test_normalize_fuel_type(raw: str, expected: str) -> None:
+    """Test normalization of fuel type synonyms, casing and unknown values."""
+    assert normalize_fuel_type(raw) == expected
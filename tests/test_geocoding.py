@@ -1,28 +1,26 @@
 """Unit tests for geocoding service."""
 
+import asyncio
+
 import pytest
 
-from src.models import Settings
 from src.services.geocoding import geocode_city
-from tests.conftest import DummyClient
+from tests.conftest import DummyClient, shared_settings
 
 
-@pytest.mark.asyncio
-async def test_geocoding_country_bias_and_alias() -> None:
+async def test_geocoding_country_bias_and_alias(tmp_path) -> None:
     """Test that geocoding uses country bias and city name aliases."""
-    # Clear global cache to force actual API call (not cached)
-    from src.services.geocoding import geocoding_cache
-
-    geocoding_cache.clear()
-
     client = DummyClient()
-    settings = Settings(
-        photon_api_url="https://photon.komoot.io/api/",
-        geocoding_cache_maxsize=1000,
-        geocoding_cache_ttl_seconds=86400,
+    settings = shared_settings().model_copy(
+        update={
+            "photon_api_url": "https://photon.komoot.io/api/",
+            "geocoding_cache_maxsize": 1000,
+            "geocoding_cache_ttl_seconds": 86400,
+            "prezzi_cache_path": str(tmp_path / "prezzi_data.json"),
+        },
     )
 
-    result = await geocode_city("Florence", settings, client)  # type: ignore[arg-type] - DummyClient is a test mock, not full AsyncClient
+    result = await geocode_city("Florence", settings, client)
 
     assert client.called_with is not None
     params = client.called_with["params"]
@@ -32,3 +30,122 @@ async def test_geocoding_country_bias_and_alias() -> None:
     assert params["q"] == "firenze"
 
     assert result == {"latitude": 43.7696, "longitude": 11.2558}
+
+
+async def test_geocoding_persistent_cache_survives_memory_clear(tmp_path) -> None:
+    """A result stored on disk is served without a provider call after the in-memory cache is cleared."""
+    from src.services.geocoding import geocoding_cache
+
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": str(tmp_path / "prezzi_data.json")})
+
+    first_client = DummyClient()
+    await geocode_city("Florence", settings, first_client)
+    assert (tmp_path / "geocoding_cache.json").exists()
+
+    geocoding_cache.clear()
+    second_client = DummyClient()
+    result = await geocode_city("Florence", settings, second_client)
+
+    assert second_client.called_with is None
+    assert result == {"latitude": 43.7696, "longitude": 11.2558}
+
+
+async def test_geocoding_disk_cache_sees_entries_written_elsewhere(tmp_path) -> None:
+    """An entry another worker added to the persistent cache file is found by the next lookup."""
+    import time
+
+    import orjson
+
+    from src.services.geocoding import get_from_disk_cache, set_in_disk_cache
+
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": str(tmp_path / "prezzi_data.json")})
+    await set_in_disk_cache(settings, "firenze", {"latitude": 43.7696, "longitude": 11.2558})
+    assert await get_from_disk_cache(settings, "pisa") is None
+
+    cache_file = tmp_path / "geocoding_cache.json"
+    data = orjson.loads(cache_file.read_bytes())
+    data["pisa"] = {"latitude": 43.7167, "longitude": 10.3967, "ts": time.time()}
+    cache_file.write_bytes(orjson.dumps(data))
+
+    assert await get_from_disk_cache(settings, "pisa") == {"latitude": 43.7167, "longitude": 10.3967}
+    assert await get_from_disk_cache(settings, "firenze") == {"latitude": 43.7696, "longitude": 11.2558}
+
+
+async def test_geocoding_concurrent_calls_share_one_request(tmp_path) -> None:
+    """Concurrent lookups of the same city issue a single provider request."""
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": str(tmp_path / "prezzi_data.json")})
+
+    class CountingClient(DummyClient):
+        calls = 0
+
+        async def get(self, url: str, params: dict | None = None, headers: dict | None = None):
+            CountingClient.calls += 1
+            await asyncio.sleep(0.01)
+            return await super().get(url, params=params, headers=headers)
+
+    client = CountingClient()
+    results = await asyncio.gather(*(geocode_city("Florence", settings, client) for _ in range(5)))
+
+    assert CountingClient.calls == 1
+    assert all(r == {"latitude": 43.7696, "longitude": 11.2558} for r in results)
+
+
+async def test_geocode_cities_deduplicates_aliases(tmp_path) -> None:
+    """Batch geocoding normalizes names so aliases of one city trigger a single lookup."""
+    from src.services.geocoding import geocode_cities
+
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": str(tmp_path / "prezzi_data.json")})
+    client = DummyClient()
+
+    results = await geocode_cities(["Florence", " firenze ", "FIRENZE"], settings, client)
+
+    assert results == {"firenze": {"latitude": 43.7696, "longitude": 11.2558}}
+
+
+async def test_geocoding_not_found_is_cached(tmp_path) -> None:
+    """A city the provider cannot find is answered with 404 from the negative cache on repeat."""
+    from fastapi import HTTPException
+
+    from tests.conftest import DummyResponse
+
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": str(tmp_path / "prezzi_data.json")})
+
+    class EmptyClient(DummyClient):
+        calls = 0
+
+        async def get(self, url: str, params: dict | None = None, headers: dict | None = None):
+            EmptyClient.calls += 1
+            self.called_with = {"url": url, "params": params, "headers": headers}
+            return DummyResponse([], text="[]")
+
+    client = EmptyClient()
+    for _ in range(2):
+        with pytest.raises(HTTPException) as excinfo:
+            await geocode_city("Atlantide", settings, client)
+        assert excinfo.value.status_code == 404
+
+    assert EmptyClient.calls == 1
+
+
+async def test_geocoding_lookup_cancelled_when_last_caller_gives_up(tmp_path) -> None:
+    """A lookup nobody awaits any more is cancelled instead of running on in the background."""
+    from src.services.geocoding import _inflight
+
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": str(tmp_path / "prezzi_data.json")})
+    started = asyncio.Event()
+
+    class HangingClient(DummyClient):
+        async def get(self, url: str, params: dict | None = None, headers: dict | None = None):
+            started.set()
+            await asyncio.Event().wait()
+
+    caller = asyncio.ensure_future(geocode_city("Florence", settings, HangingClient()))
+    await started.wait()
+    lookup = _inflight["firenze"]
+
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    with pytest.raises(asyncio.CancelledError):
+        await lookup
+    assert "firenze" not in _inflight
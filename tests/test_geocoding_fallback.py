@@ -1,60 +1,53 @@
 """Tests for geocoding fallback behavior when provider is rate-limited."""
 
-import json
 from datetime import UTC
 
 import httpx2 as httpx
 import pytest
 from fastapi import HTTPException
 
-from src.models import Settings
 from src.services.geocoding import geocode_city
-from tests.conftest import DummyClientException
+from tests.conftest import DummyClientException, shared_settings
 
 
-@pytest.fixture(autouse=True)
-def clear_geocoding_cache():
-    """Clear geocoding cache before each test."""
-    import src.services.geocoding as geo
+@pytest.fixture(scope="module")
+def rate_limited_exc() -> httpx.HTTPStatusError:
+    """Build the Nominatim 509 'bandwidth exceeded' error once for the module.
 
-    geo._LOCAL_CITY_COORDS = None
-    geo.geocoding_cache.clear()
-    yield
-    geo._LOCAL_CITY_COORDS = None
-    geo.geocoding_cache.clear()
+    It carries no Retry-After header, so the geocoder falls back (or fails) without sleeping.
+    """
+    req = httpx.Request("GET", "https://nominatim.openstreetmap.org/search")
+    resp = httpx.Response(509, request=req)
+    return httpx.HTTPStatusError("bandwidth", request=req, response=resp)
 
 
-@pytest.mark.asyncio
-async def test_geocode_fallback_to_local_coords(tmp_path):
-    """When the geocoding provider returns 509, local cities.json coordinates are used as fallback."""
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache.json")
+@pytest.fixture
+def local_coords(monkeypatch):
+    """Serve the local city fallback from memory instead of probing for a cities.json file."""
+    mapping: dict[str, dict[str, float]] = {"firenze": {"latitude": 43.77, "longitude": 11.25}}
+    monkeypatch.setattr("src.services.geocoding._load_local_city_coords", lambda _settings: mapping)
+    return mapping
 
-    cities = {"firenze": {"latitude": 43.77, "longitude": 11.25}}
-    (tmp_path / "cities.json").write_text(json.dumps(cities), encoding="utf-8")
 
-    req = httpx.Request("GET", "https://nominatim.openstreetmap.org/search")
-    resp = httpx.Response(509, request=req, headers={"Retry-After": "1"})
-    exc = httpx.HTTPStatusError("bandwidth", request=req, response=resp)
+@pytest.mark.usefixtures("local_coords")
+async def test_geocode_fallback_to_local_coords(tmp_path, rate_limited_exc):
+    """When the geocoding provider returns 509, local cities.json coordinates are used as fallback."""
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": str(tmp_path / "prezzi_cache.json")})
 
-    client = DummyClientException(exc)
+    client = DummyClientException(rate_limited_exc)
 
-    result = await geocode_city("Firenze", settings, client)  # type: ignore[arg-type] - DummyClientException is a test mock, not full AsyncClient
+    result = await geocode_city("Firenze", settings, client)
     assert isinstance(result, dict)
     assert round(result["latitude"], 2) == 43.77
     assert round(result["longitude"], 2) == 11.25
 
 
-@pytest.mark.asyncio
+@pytest.mark.usefixtures("local_coords")
 async def test_geocode_respects_retry_after_http_date_and_uses_local_fallback(tmp_path, monkeypatch):
     """A Retry-After provided as an HTTP-date is parsed and respected (clamped), and local fallback is used."""
     from datetime import datetime, timedelta
 
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache.json")
-
-    cities = {"firenze": {"latitude": 43.77, "longitude": 11.25}}
-    (tmp_path / "cities.json").write_text(json.dumps(cities), encoding="utf-8")
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": str(tmp_path / "prezzi_cache.json")})
 
     # Create a Retry-After HTTP-date in the future (large), ensure clamping
     future = datetime.now(tz=UTC) + timedelta(seconds=120)
@@ -74,21 +67,17 @@ async def fake_sleep(secs: float):
 
     monkeypatch.setattr("asyncio.sleep", fake_sleep)
 
-    result = await geocode_city("Firenze", settings, client)  # type: ignore[arg-type]
+    result = await geocode_city("Firenze", settings, client)
     assert isinstance(result, dict)
     assert called, "asyncio.sleep should have been called for Retry-After"
     # should be clamped to MAX_RETRY_AFTER_SECONDS (60)
     assert called[0] <= 60
 
 
-@pytest.mark.asyncio
+@pytest.mark.usefixtures("local_coords")
 async def test_geocode_handles_malformed_retry_after_gracefully(tmp_path, monkeypatch):
     """A malformed Retry-After header should not raise — local fallback is attempted immediately."""
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache.json")
-
-    cities = {"firenze": {"latitude": 43.77, "longitude": 11.25}}
-    (tmp_path / "cities.json").write_text(json.dumps(cities), encoding="utf-8")
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": str(tmp_path / "prezzi_cache.json")})
 
     req = httpx.Request("GET", "https://nominatim.openstreetmap.org/search")
     resp = httpx.Response(429, request=req, headers={"Retry-After": "not-a-valid-value"})
@@ -103,24 +92,19 @@ async def fake_sleep(secs: float):
 
     monkeypatch.setattr("asyncio.sleep", fake_sleep)
 
-    result = await geocode_city("Firenze", settings, client)  # type: ignore[arg-type]
+    result = await geocode_city("Firenze", settings, client)
     assert isinstance(result, dict)
     # Malformed header -> no sleep attempted, local fallback used immediately
     assert called == []
 
 
-@pytest.mark.asyncio
-async def test_geocode_raises_503_when_rate_limited_and_no_fallback(tmp_path):
+async def test_geocode_raises_503_when_rate_limited_and_no_fallback(tmp_path, monkeypatch, rate_limited_exc):
     """When provider is rate-limited and no local fallback exists, a 503 HTTPException is raised."""
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache.json")
-
-    req = httpx.Request("GET", "https://nominatim.openstreetmap.org/search")
-    resp = httpx.Response(509, request=req)
-    exc = httpx.HTTPStatusError("bandwidth", request=req, response=resp)
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": str(tmp_path / "prezzi_cache.json")})
+    monkeypatch.setattr("src.services.geocoding._load_local_city_coords", lambda _settings: {})
 
-    client = DummyClientException(exc)
+    client = DummyClientException(rate_limited_exc)
 
     with pytest.raises(HTTPException) as ei:
-        await geocode_city("NowhereCity", settings, client)  # type: ignore[arg-type] - DummyClientException is a test mock, not full AsyncClient
+        await geocode_city("NowhereCity", settings, client)
     assert ei.value.status_code == 503
@@ -1,9 +1,30 @@
-"""Tests for Gas Station Finder API using FastAPI TestClient."""
+"""Tests for Gas Station Finder API using FastAPI TestClient and an in-process async client."""
 
+import asyncio
+import re
+
+import httpx2 as httpx
+import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from starlette import status
 
-from src.main import app
+import src.main as _main
+from src.main import app, get_settings
+from src.models import Settings
+from src.services import fuel_api as _fa
+
+GEOCODE_WARNING_RE = re.compile(r"geocod|not found")
+
+
+@pytest.fixture
+def no_geocode(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Make every geocoding lookup fail with a 404 without touching the network."""
+
+    async def _not_found(city, _settings, _http_client):
+        raise HTTPException(status_code=404, detail=f"City not found: {city}")
+
+    monkeypatch.setattr("src.main.geocode_city", _not_found)
 
 
 def test_health_check(client: TestClient) -> None:
@@ -21,99 +42,93 @@ def test_read_root(client: TestClient) -> None:
     assert "gas station" in response.text.lower() or "finder" in response.text.lower()
 
 
-def test_search_gas_stations_invalid_city(client: TestClient) -> None:
-    """Test /search returns a warning for a non-existent city."""
-    payload = {
-        "city": "NonExistentCity12345",
-        "radius": 5,
-        "fuel": "benzina",
-        "results": 2,
-    }
-    response = client.post("/search", json=payload)
-    assert response.status_code == status.HTTP_200_OK
-    data = response.json()
-    assert data["stations"] == []
-    # message may vary; ensure warning present
-    assert "warning" in data
-    assert isinstance(data["warning"], str)
-
-
-def test_search_surfaces_csv_schema_error(client: TestClient, monkeypatch) -> None:
+async def test_search_surfaces_csv_schema_error(aclient: httpx.AsyncClient, monkeypatch) -> None:
     """When upstream CSV parsing reports a schema error (422) surface that exact message to the client."""
-    from fastapi import HTTPException
 
     def _raise_schema(_params, _settings, _http_client):
         raise HTTPException(status_code=422, detail="CSV schema error (prezzi): missing required column 'prezzo'")
 
-    monkeypatch.setattr("src.services.fuel_api.fetch_gas_stations", _raise_schema)
+    monkeypatch.setattr(_fa, "fetch_gas_stations", _raise_schema)
 
     payload = {"city": "Florence", "radius": 5, "fuel": "benzina", "results": 2}
-    response = client.post("/search", json=payload)
+    response = await aclient.post("/search", json=payload)
     assert response.status_code == 200
     data = response.json()
     assert data["stations"] == []
     assert data["warning"] == "CSV schema error (prezzi): missing required column 'prezzo'"
 
 
-def test_search_gas_stations_missing_field(client: TestClient) -> None:
-    """Test /search returns 422 if required fields are missing."""
-    payload = {
-        "radius": 5,
-        "fuel": "benzina",
-    }
-    response = client.post("/search", json=payload)
-    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
-    assert "city" in response.text.lower()
-
-
-def test_search_gas_stations_radius_bounds(client: TestClient) -> None:
-    """Radius below 1 should be rejected by validation (Pydantic ge=1)."""
-    payload = {"city": "Rome", "radius": 0, "fuel": "benzina", "results": 2}
-    response = client.post("/search", json=payload)
-    # Pydantic validation should reject radius < 1 with 422
-    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+@pytest.mark.usefixtures("no_geocode")
+@pytest.mark.parametrize(
+    ("payload", "expected_status", "expected_text"),
+    [
+        # Unknown city: answered with an empty result and a warning, not an error status
+        (
+            {"city": "NonExistentCity12345", "radius": 5, "fuel": "benzina", "results": 2},
+            status.HTTP_200_OK,
+            "warning",
+        ),
+        # Required field missing
+        ({"radius": 5, "fuel": "benzina"}, status.HTTP_422_UNPROCESSABLE_ENTITY, "city"),
+        # Radius below 1 is rejected by Pydantic (ge=1)
+        (
+            {"city": "Rome", "radius": 0, "fuel": "benzina", "results": 2},
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            "radius",
+        ),
+    ],
+    ids=["invalid-city", "missing-city", "radius-below-minimum"],
+)
+async def test_search_request_handling(
+    aclient: httpx.AsyncClient,
+    payload: dict,
+    expected_status: int,
+    expected_text: str,
+) -> None:
+    """Test /search validation errors and the warning returned for an unknown city."""
+    response = await aclient.post("/search", json=payload)
+    assert response.status_code == expected_status
+    assert expected_text in response.text.lower()
+    if expected_status == status.HTTP_200_OK:
+        data = response.json()
+        assert data["stations"] == []
+        # Wording may change; any geocoding / not-found message is acceptable
+        assert GEOCODE_WARNING_RE.search(data["warning"].lower())
 
 
-def test_search_timeout_behavior(client: TestClient, monkeypatch) -> None:
+async def test_search_timeout_behavior(aclient: httpx.AsyncClient, monkeypatch) -> None:
     """Ensure server-side search timeout returns a warning instead of hanging."""
-    import asyncio
-
-    from src.main import get_settings
-    from src.models import Settings
 
     # Override dependency to use a very short timeout and patch fetch_gas_stations to be slow
     class FastTimeoutSettings(Settings):
-        search_timeout_seconds: int = 1
+        search_timeout_seconds: float = 0.05
 
-    async def _slow_fetch(params, settings, http_client) -> list:
-        await asyncio.sleep(5)
-        return []
+    # Geocoding answers at once, so the budget runs out inside the fetch
+    async def _instant_geocode(city, _settings, _http_client) -> dict[str, float]:
+        return {"latitude": 41.9028, "longitude": 12.4964}
 
-    # Apply overrides - pass a lambda that returns an instance, not the class itself
-    # Use try/finally to ensure cleanup even if test fails
-    original_override = app.dependency_overrides.get(get_settings)
-    app.dependency_overrides[get_settings] = lambda: FastTimeoutSettings()
+    fetch_entered = asyncio.Event()
 
-    # Monkeypatch the actual fetcher using monkeypatch for automatic cleanup
-    import src.services.fuel_api as _fa
+    async def _slow_fetch(params, settings, http_client) -> list:
+        fetch_entered.set()
+        await asyncio.sleep(0.5)
+        return []
 
+    # The client is shared by the whole session: route the dependency override
+    # and both patches through monkeypatch so teardown undoes them.
+    monkeypatch.setitem(app.dependency_overrides, get_settings, lambda: FastTimeoutSettings())
+    monkeypatch.setattr("src.main.geocode_city", _instant_geocode)
     monkeypatch.setattr(_fa, "fetch_gas_stations", _slow_fetch)
 
-    try:
-        payload = {"city": "Rome", "radius": 5, "fuel": "benzina", "results": 2}
-        response = client.post("/search", json=payload)
+    payload = {"city": "Rome", "radius": 5, "fuel": "benzina", "results": 2}
+    response = await aclient.post("/search", json=payload)
 
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert data["stations"] == []
-        assert "warning" in data
-        assert "timed out" in data["warning"].lower()
-    finally:
-        # Restore original dependency override
-        if original_override is None:
-            app.dependency_overrides.pop(get_settings, None)
-        else:
-            app.dependency_overrides[get_settings] = original_override
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert fetch_entered.is_set()
+    assert data["stations"] == []
+    assert "warning" in data
+    assert "timed out while fetching station data" in data["warning"].lower()
 
 
 async def _fake_fetch_csvs(http_client, settings):
@@ -142,11 +157,10 @@ def test_reload_csv_triggers_fetch_and_saves(client: TestClient, monkeypatch) ->
     The test monkeypatches network and file operations to make the endpoint deterministic
     and fast.
     """
-    # Patch imported symbols in src.main (where reload_csv references them)
-    import src.main as _main
 
+    # Patch imported symbols in src.main (where reload_csv references them).
     # Ensure startup reload does not run during this test (avoids file-lock races)
-    class _NoStartupSettings(_main.Settings):
+    class _NoStartupSettings(Settings):
         prezzi_reload_on_startup: bool = False
 
     monkeypatch.setattr(_main, "get_settings", _NoStartupSettings)
@@ -164,12 +178,18 @@ class _NoStartupSettings(_main.Settings):
     assert data.get("last_updated") == "2026-02-13T12:00:00+00:00"
 
 
-def test_startup_triggers_background_reload(monkeypatch) -> None:
-    """When a fresh cache exists the app should schedule a background CSV reload."""
-    import asyncio
-
-    import src.main as _main
-    from src.models import Settings
+@pytest.mark.parametrize(
+    ("cache_fresh", "expect_in_progress"),
+    [
+        # A fresh cache only schedules a background reload, still running when queried.
+        (True, True),
+        # A missing/stale cache blocks startup until the reload has finished.
+        (False, False),
+    ],
+    ids=["fresh-cache-background", "missing-cache-blocking"],
+)
+def test_startup_reload(monkeypatch, *, cache_fresh: bool, expect_in_progress: bool) -> None:
+    """The startup reload runs in the background or blocks depending on cache freshness."""
 
     class StartupSettings(Settings):
         prezzi_reload_on_startup: bool = True
@@ -186,70 +206,16 @@ async def _fake_fetch_and_combine(settings, http_client, params=None):
         await asyncio.sleep(0.2)
         return []
 
-    # Simulate a fresh cache so the startup path schedules a background task
-    async def _cache_fresh(path, hours):
-        return True
+    def _is_cache_fresh(path, hours):
+        return cache_fresh
 
     # Patch the references used by src.main (imported symbols)
-    monkeypatch.setattr(_main, "_is_cache_fresh", _cache_fresh)
+    monkeypatch.setattr(_main, "_is_cache_fresh", _is_cache_fresh)
     monkeypatch.setattr(_main, "fetch_and_combine_csv_data", _fake_fetch_and_combine)
 
-    from fastapi.testclient import TestClient
-
-    from src.main import app as _app
-
-    with TestClient(_app) as client:
-        resp = client.get("/api/csv-status")
-        assert resp.status_code == 200
-        data = resp.json()
-        assert data.get("reload_in_progress") is True
-        assert started["val"] is True
-
-
-async def _fake_fetch_and_combine_blocking(settings, http_client, params=None):
-    # Keep task alive briefly to simulate work
-    import asyncio
-
-    await asyncio.sleep(0.05)
-    return []
-
-
-def test_startup_blocks_when_cache_missing(monkeypatch) -> None:
-    """If the on-disk cache is missing/stale the startup reload should block until complete."""
-    import asyncio
-
-    import src.main as _main
-    from src.models import Settings
-
-    class StartupSettings(Settings):
-        prezzi_reload_on_startup: bool = True
-        prezzi_preload_on_startup: bool = False
-
-    monkeypatch.setattr(_main, "get_settings", StartupSettings)
-
-    started = {"val": False}
-
-    async def _fake_fetch_and_combine(settings, http_client, params=None):
-        started["val"] = True
-        await asyncio.sleep(0.05)
-        return []
-
-    # Simulate missing/stale cache so the startup path performs a blocking reload
-    async def _cache_missing(path, hours):
-        return False
-
-    monkeypatch.setattr(_main, "_is_cache_fresh", _cache_missing)
-    monkeypatch.setattr(_main, "fetch_and_combine_csv_data", _fake_fetch_and_combine)
-
-    from fastapi.testclient import TestClient
-
-    from src.main import app as _app
-
-    with TestClient(_app) as client:
-        # Because startup blocks until fetch completes, the status endpoint should
-        # show no in-progress reload (it already finished);
+    with TestClient(app) as client:
         resp = client.get("/api/csv-status")
         assert resp.status_code == 200
         data = resp.json()
-    assert data.get("reload_in_progress") is False
+        assert data.get("reload_in_progress") is expect_in_progress
     assert started["val"] is True
@@ -80,4 +80,4 @@ def test_station_coords_and_distance_validation():  # noqa: D103
 def test_settings_cors_allowed_origins_trim(monkeypatch):  # noqa: D103
     monkeypatch.setenv("CORS_ALLOWED_ORIGINS", " http://a , , http://b ")
     s = Settings()
-    assert s.cors_allowed_origins == ["http://a", "http://b"]
+    assert s.cors_allowed_origins == frozenset({"http://a", "http://b"})
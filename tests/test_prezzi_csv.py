@@ -7,15 +7,18 @@
 from contextlib import suppress
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, cast
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, cast
 from unittest.mock import MagicMock
 
+import orjson
 import pytest
 from fastapi import HTTPException
 
 import src.services.fuel_api as fa
-from src.models import Settings, StationSearchParams
+from src.models import StationSearchParams
 from src.services import csv_cache, csv_fetcher, prezzi_csv
+from src.services.csv_admin import TIMESTAMPED_CSV_PREFIXES, scan_csv_names
 from src.services.csv_parser import CSVSchemaError
 from src.services.prezzi_csv import (
     _fetch_csvs,
@@ -29,6 +32,13 @@
 if TYPE_CHECKING:
     import httpx2 as httpx
 
+# Fetches without a prezzi_local_data_dir save into the project's src/static/data
+# and share the default HTTP meta file, and the autouse fixture below wipes that
+# directory around every test: these tests must never run on two workers at once.
+# The explicit group pins the whole module to one worker under `--dist loadgroup`
+# (conftest.py would group it by file anyway, but this must not depend on that).
+pytestmark = pytest.mark.xdist_group("prezzi_csv")
+
 
 @pytest.fixture(autouse=True)
 def cleanup_project_csv_files():
@@ -52,6 +62,46 @@ def cleanup_project_csv_files():
             f.unlink()
 
 
+@pytest.fixture(autouse=True)
+async def drain_background_csv_tasks(cleanup_project_csv_files):
+    """Wait for the CSV saves and cleanups a test started in the background.
+
+    Depends on the cleanup fixture so the tasks finish before its teardown
+    removes the files they write.
+    """
+    yield
+    await _drain_background_csv_tasks()
+
+
+async def _drain_background_csv_tasks() -> None:
+    """Wait for this loop's pending background CSV saves and cleanups (see csv_fetcher._run_in_background)."""
+    loop = asyncio.get_running_loop()
+    pending = [task for task in csv_fetcher._background_tasks if task.get_loop() is loop]
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+@pytest.fixture
+def memory_cache(monkeypatch) -> dict[str, dict[str, Any]]:
+    """Keep the combined prezzi cache in a dict, keyed by cache path, instead of files.
+
+    For fetch tests that only need somewhere to put the cache: nothing touches the
+    disk, and a path is fresh exactly when something was written to it.
+    """
+    store: dict[str, dict[str, Any]] = {}
+
+    async def load(path: str) -> dict[str, Any] | None:
+        return store.get(path)
+
+    async def write(path: str, data: dict[str, Any]) -> None:
+        store[path] = data
+
+    monkeypatch.setattr(prezzi_csv, "_is_cache_fresh", lambda path, _hours: path in store)
+    monkeypatch.setattr(prezzi_csv, "_load_cached_combined", load)
+    monkeypatch.setattr(prezzi_csv, "_write_json_file", write)
+    return store
+
+
 # Test constants
 EXPECTED_PRICE_A = 1.5
 EXPECTED_PRICE_B = 1.4
@@ -60,58 +110,54 @@ def cleanup_project_csv_files():
 LON = 11.2558
 FLOAT_TOLERANCE = 1e-6
 MIN_EXPECTED_CALLS = 2
+# Positional (unnamed) CSV headers, pipe-delimited, as the fetcher receives them
+ANAG_HEADER_BYTES = b"col0|col1|col2|col3|col4|col5|col6|col7|col8|col9\n"
+PREZZI_HEADER_BYTES = b"col0|col1|col2|col3|col4\n"
+# Validated once: the fetch path only reads the search parameters
+BENZINA_PARAMS = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
 
 # Use typing.cast when passing dummy clients to async function to satisfy typecheckers
 from tests.conftest import DummyClientCsv as DummyClient  # noqa: E402
-from tests.conftest import DummyClientCsvConditional  # noqa: E402
+from tests.conftest import DummyClientCsvConditional, shared_settings  # noqa: E402
 
 
 def _make_anagrafica_row(id_: str, lat: str, lon: str) -> str:
     # minimal row: id(0); ...; gestore(2); ...; address parts at 5,6,7; lat at 8; lon at 9
-    row = ["0"] * 10
-    row[0] = id_
-    row[2] = "GestoreX"
-    row[5] = "Via"
-    row[6] = "Test"
-    row[7] = "City"
-    row[8] = lat
-    row[9] = lon
-    return "|".join(row)
+    return f"{id_}|0|GestoreX|0|0|Via|Test|City|{lat}|{lon}"
 
 
 def _make_prezzi_row(id_: str, fuel: str, price: str, selfflag: str, date: str) -> str:
-    row = ["0"] * 6
-    row[0] = id_
-    row[1] = fuel
-    row[2] = price
-    row[3] = selfflag
-    row[4] = date
-    return "|".join(row)
+    # id(0); fuel(1); price(2); self flag(3); date(4); one trailing filler column
+    return f"{id_}|{fuel}|{price}|{selfflag}|{date}|0"
 
 
-def test_fetch_and_combine_csv_parses_and_filters(tmp_path):
-    """Verify CSV parsing, decoding, price parsing, and distance filtering."""
-    # Build recent date
-    now = datetime.now(tz=UTC)
-    date_str = now.strftime("%d/%m/%Y %H:%M:%S")
+@pytest.fixture(scope="session")
+def recent_date_str() -> str:
+    """Stamp a price row as updated "now"; read the clock and format it once per worker."""
+    return datetime.now(tz=UTC).strftime("%d/%m/%Y %H:%M:%S")
 
-    anag_header = "col0|col1|col2|col3|col4|col5|col6|col7|col8|col9"
+
+@pytest.fixture(scope="session")
+def recent_csv_bytes(recent_date_str) -> tuple[bytes, bytes]:
+    """Encode once the common CSV pair: one station in Florence selling benzina at 1,50 today."""
     anag_row = _make_anagrafica_row("123", "43,7696", "11,2558")
+    prezzi_row = _make_prezzi_row("123", "benzina", "1,50", "1", recent_date_str)
+    return (
+        ANAG_HEADER_BYTES + anag_row.encode("iso-8859-1") + b"\n",
+        PREZZI_HEADER_BYTES + prezzi_row.encode("iso-8859-1") + b"\n",
+    )
 
-    prezzi_header = "col0|col1|col2|col3|col4"
-    prezzi_row = _make_prezzi_row("123", "benzina", "1,50", "1", date_str)
 
-    anag_text = f"{anag_header}\n{anag_row}\n"
-    prezzi_text = f"{prezzi_header}\n{prezzi_row}\n"
-
-    client = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
+@pytest.mark.usefixtures("memory_cache")
+async def test_fetch_and_combine_csv_parses_and_filters(recent_csv_bytes):
+    """Verify CSV parsing, decoding, price parsing, and distance filtering."""
+    client = DummyClient(*recent_csv_bytes)
 
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache.json")
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": "mem://prezzi_cache.json"})
 
-    params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
+    params = BENZINA_PARAMS
 
-    result = asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
+    result = await fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params)
 
     assert isinstance(result, list)
     assert len(result) == 1
@@ -121,7 +167,7 @@ def test_fetch_and_combine_csv_parses_and_filters(tmp_path):
     assert station["latitudine"] == LAT
 
 
-def test_fetch_and_combine_csv_uses_cache(tmp_path):
+async def test_fetch_and_combine_csv_uses_cache(monkeypatch, recent_date_str):
     """Verify cached combined data is used when fresh and no external fetch occurs."""
     # Prepare cached combined dict
     cached = {
@@ -134,16 +180,17 @@ def test_fetch_and_combine_csv_uses_cache(tmp_path):
                 "benzina": {
                     "prezzo": EXPECTED_PRICE_B,
                     "self": True,
-                    "data": datetime.now(tz=UTC).strftime("%d/%m/%Y %H:%M:%S"),
+                    "data": recent_date_str,
                 },
             },
         },
     }
-    cache_path = tmp_path / "prezzi_cache.json"
-    cache_path.write_text(json.dumps(cached), encoding="utf-8")
+    # Only the cache-hit decision is under test: the cache file freshness and
+    # read are covered by their own tests, so stub both instead of touching disk
+    monkeypatch.setattr(prezzi_csv, "_is_cache_fresh", lambda _path, _hours: True)
+    monkeypatch.setattr(prezzi_csv, "_load_cached_combined", lambda _path: asyncio.sleep(0, result=cached))
 
-    settings = Settings()
-    settings.prezzi_cache_path = str(cache_path)
+    settings = shared_settings()
 
     class NoCallsClient:
         async def get(self, _url, _params=None):
@@ -151,9 +198,9 @@ async def get(self, _url, _params=None):
             raise RuntimeError(msg)
 
     client = NoCallsClient()
-    params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
+    params = BENZINA_PARAMS
 
-    result = asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
+    result = await fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params)
     assert isinstance(result, list)
     assert len(result) == 1
     assert result[0]["prezzo"] == EXPECTED_PRICE_B
@@ -162,46 +209,60 @@ async def get(self, _url, _params=None):
 # Additional unit tests for refactor helpers
 
 
-def test_is_cache_fresh(tmp_path):
+def test_is_cache_fresh(tmp_path, monkeypatch):
     """Verify the cache freshness logic respects mtime and cache hours."""
     cache_path = tmp_path / "prezzi_cache.json"
     cache_path.write_text("{}", encoding="utf-8")
+    written_at = cache_path.stat().st_mtime
+    cache_hours = shared_settings().prezzi_cache_hours
 
-    settings = Settings()
-    settings.prezzi_cache_path = str(cache_path)
+    def set_clock(hours_after_write: float) -> None:
+        # Move the clock _is_cache_fresh reads instead of rewriting the file mtime
+        now = datetime.fromtimestamp(written_at + hours_after_write * 3600, tz=UTC)
+        monkeypatch.setattr(csv_cache, "datetime", SimpleNamespace(now=lambda tz=None: now))
 
-    stale_at = time.time() - (float(settings.prezzi_cache_hours) + 1) * 3600
-    os.utime(cache_path, (stale_at, stale_at))
-    assert asyncio.run(_is_cache_fresh(str(cache_path), settings.prezzi_cache_hours)) is False
+    set_clock(cache_hours + 1)
+    assert _is_cache_fresh(str(cache_path), cache_hours) is False
 
-    # set to recent => fresh
-    now = time.time()
-    os.utime(cache_path, (now, now))
-    assert asyncio.run(_is_cache_fresh(str(cache_path), settings.prezzi_cache_hours)) is True
+    set_clock(0)
+    assert _is_cache_fresh(str(cache_path), cache_hours) is True
 
 
-def test_read_json_file_invalid(tmp_path):
+async def test_read_json_file_invalid(tmp_path):
     """Invalid JSON returns None instead of raising."""
     p = tmp_path / "bad.json"
     p.write_text("not json", encoding="utf-8")
-    assert asyncio.run(_read_json_file(str(p))) is None
+    assert await _read_json_file(str(p)) is None
 
 
-def test_write_json_file_atomic_replace(tmp_path):
+async def test_write_json_file_atomic_replace(tmp_path):
     """_write_json_file should publish the new JSON atomically and remove any .part files."""
     from src.services.csv_cache import _write_json_file
 
     cache_path = tmp_path / "prezzi_cache.json"
-    cache_path.write_text(json.dumps({"orig": True}), encoding="utf-8")
+    cache_path.write_bytes(orjson.dumps({"orig": True}))
 
-    asyncio.run(_write_json_file(str(cache_path), {"new": 123}))
+    await _write_json_file(str(cache_path), {"new": 123})
 
     # final file should contain the new payload and no .part file should remain
-    assert json.loads(cache_path.read_text(encoding="utf-8")) == {"new": 123}
+    assert orjson.loads(cache_path.read_bytes()) == {"new": 123}
     assert not (tmp_path / "prezzi_cache.json.part").exists()
 
 
-def test_write_json_file_does_not_corrupt_on_replace_failure(tmp_path, monkeypatch):
+async def test_pickle_cache_path_round_trips(tmp_path):
+    """A cache path ending in .pickle is written and read back as a pickle snapshot."""
+    from src.services.csv_cache import _write_json_file
+
+    cache_path = tmp_path / "prezzi_cache.pickle"
+    payload = {"1": {"gestore": "G", "prezzi": {"benzina": {"prezzo": 1.5}}}}
+
+    await _write_json_file(str(cache_path), payload)
+
+    assert cache_path.read_bytes()[:1] == b"\x80"  # pickle protocol marker
+    assert await _read_json_file(str(cache_path)) == payload
+
+
+async def test_write_json_file_does_not_corrupt_on_replace_failure(tmp_path, monkeypatch):
     """If replace() fails, the original cache must remain unchanged and no .part file should leak."""
     import pathlib
 
@@ -209,7 +270,7 @@ def test_write_json_file_does_not_corrupt_on_replace_failure(tmp_path, monkeypat
 
     cache_path = tmp_path / "prezzi_cache.json"
     orig = {"orig": True}
-    cache_path.write_text(json.dumps(orig), encoding="utf-8")
+    cache_path.write_bytes(orjson.dumps(orig))
 
     real_replace = pathlib.Path.replace
 
@@ -224,18 +285,18 @@ def fake_replace(self, target):
 
     try:
         # call should not raise; function handles/logs the error internally
-        asyncio.run(_write_json_file(str(cache_path), {"new": 999}))
+        await _write_json_file(str(cache_path), {"new": 999})
     finally:
         # monkeypatch fixture will restore replace automatically
         pass
 
     # original file must be unchanged
-    assert json.loads(cache_path.read_text(encoding="utf-8")) == orig
+    assert orjson.loads(cache_path.read_bytes()) == orig
     # temporary .part file should not remain (cleanup is best-effort)
     assert not (tmp_path / "prezzi_cache.json.part").exists()
 
 
-def test_fetch_csvs_raises_on_http_error(monkeypatch):
+async def test_fetch_csvs_raises_on_http_error(monkeypatch):
     """_fetch_csvs should raise if HTTP error and local fallback is unavailable."""
 
     async def raise_missing(_settings):
@@ -259,11 +320,11 @@ class ErrClient:
         async def get(self, _url, _params=None, headers=None):
             return ErrResp()
 
-    settings = Settings()
+    settings = shared_settings()
     err_client = ErrClient()
 
     with pytest.raises(RuntimeError):
-        asyncio.run(_fetch_csvs(cast("httpx.AsyncClient", err_client), settings))
+        await _fetch_csvs(cast("httpx.AsyncClient", err_client), settings)
 
 
 def test_parse_date_accepts_date_only():
@@ -275,36 +336,41 @@ def test_parse_date_accepts_date_only():
     assert _is_recent(dt)
 
 
-def test_fetch_and_combine_accepts_date_only(tmp_path):
-    """Verify that a price row with date-only is treated as recent and returned."""
-    # Build date-only string
-    now = datetime.now(tz=UTC)
-    date_str = now.strftime("%d/%m/%Y")
+@pytest.mark.parametrize(
+    ("fuel", "price_cell", "expected", "date_fmt", "bom"),
+    [
+        pytest.param("benzina", "1,55", 1.55, "%d/%m/%Y %H:%M:%S", b"", id="pipe-delimiter"),
+        pytest.param("benzina", "1,60", EXPECTED_PRICE_C, "%d/%m/%Y", b"", id="date-only"),
+        pytest.param("benzina senza piombo", "1,55", 1.55, "%d/%m/%Y %H:%M:%S", b"", id="fuel-name-variant"),
+        # UTF-8 BOM, which the fetcher mis-decodes as ISO-8859-1 "ï»¿"
+        pytest.param("benzina", "1,65", 1.65, "%d/%m/%Y %H:%M:%S", b"\xef\xbb\xbf", id="bom-stripped"),
+    ],
+)
+@pytest.mark.usefixtures("memory_cache")
+async def test_fetch_and_combine_parses_row_variants(fuel, price_cell, expected, date_fmt, bom):
+    """Verify date-only dates, fuel name variants, pipe delimiters and BOM prefixes all parse to one station."""
+    date_str = datetime.now(tz=UTC).strftime(date_fmt)
 
-    anag_header = "col0|col1|col2|col3|col4|col5|col6|col7|col8|col9"
     anag_row = _make_anagrafica_row("321", "43,7696", "11,2558")
+    prezzi_row = _make_prezzi_row("321", fuel, price_cell, "1", date_str)
 
-    prezzi_header = "col0|col1|col2|col3|col4"
-    prezzi_row = _make_prezzi_row("321", "benzina", "1,60", "1", date_str)
-
-    anag_text = f"{anag_header}\n{anag_row}\n"
-    prezzi_text = f"{prezzi_header}\n{prezzi_row}\n"
-
-    client = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
+    client = DummyClient(
+        bom + ANAG_HEADER_BYTES + anag_row.encode("iso-8859-1") + b"\n",
+        bom + PREZZI_HEADER_BYTES + prezzi_row.encode("iso-8859-1") + b"\n",
+    )
 
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache2.json")
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": "mem://prezzi_cache.json"})
 
-    params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
+    params = BENZINA_PARAMS
 
-    result = asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
+    result = await fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params)
 
     assert isinstance(result, list)
     assert len(result) == 1
-    assert result[0]["prezzo"] == EXPECTED_PRICE_C
+    assert abs(result[0]["prezzo"] - expected) < FLOAT_TOLERANCE
 
 
-def test_ignores_empty_cache_and_fetches_fresh(tmp_path):
+async def test_ignores_empty_cache_and_fetches_fresh(tmp_path, recent_csv_bytes):
     """If cache file exists but contains an empty object, it should be ignored and CSVs fetched."""
     cache_path = tmp_path / "prezzi_cache.json"
     cache_path.write_text("{}", encoding="utf-8")
@@ -313,26 +379,13 @@ def test_ignores_empty_cache_and_fetches_fresh(tmp_path):
     now_ts = time.time()
     os.utime(cache_path, (now_ts, now_ts))
 
-    now = datetime.now(tz=UTC)
-    date_str = now.strftime("%d/%m/%Y %H:%M:%S")
+    client = DummyClient(*recent_csv_bytes)
 
-    anag_header = "col0|col1|col2|col3|col4|col5|col6|col7|col8|col9"
-    anag_row = _make_anagrafica_row("999", "43,7696", "11,2558")
-
-    prezzi_header = "col0|col1|col2|col3|col4"
-    prezzi_row = _make_prezzi_row("999", "benzina", "1,50", "1", date_str)
-
-    anag_text = f"{anag_header}\n{anag_row}\n"
-    prezzi_text = f"{prezzi_header}\n{prezzi_row}\n"
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": str(cache_path)})
 
-    client = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
-
-    settings = Settings()
-    settings.prezzi_cache_path = str(cache_path)
-
-    params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
+    params = BENZINA_PARAMS
 
-    result = asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
+    result = await fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params)
 
     # Two calls should have been made to fetch the two CSVs
     assert client.calls == MIN_EXPECTED_CALLS
@@ -340,34 +393,6 @@ def test_ignores_empty_cache_and_fetches_fresh(tmp_path):
     assert len(result) == 1
 
 
-def test_fuel_name_variants_match(tmp_path):
-    """A prezzo row like 'benzina senza piombo' should match a request for 'benzina'."""
-    now = datetime.now(tz=UTC)
-    date_str = now.strftime("%d/%m/%Y %H:%M:%S")
-
-    anag_header = "col0|col1|col2|col3|col4|col5|col6|col7|col8|col9"
-    anag_row = _make_anagrafica_row("222", "43,7696", "11,2558")
-
-    prezzi_header = "col0|col1|col2|col3|col4"
-    prezzi_row = _make_prezzi_row("222", "benzina senza piombo", "1,55", "1", date_str)
-
-    anag_text = f"{anag_header}\n{anag_row}\n"
-    prezzi_text = f"{prezzi_header}\n{prezzi_row}\n"
-
-    client = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
-
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache_variant.json")
-
-    params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
-
-    result = asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
-
-    assert isinstance(result, list)
-    assert len(result) == 1
-    assert abs(result[0]["prezzo"] - 1.55) < FLOAT_TOLERANCE
-
-
 @pytest.mark.parametrize(
     ("price_str", "expected"),
     [
@@ -385,145 +410,76 @@ def test_fuel_name_variants_match(tmp_path):
         ("1234", 1234.0),
     ],
 )
-def test_price_parsing_various_locales(tmp_path, price_str, expected):  # noqa: D103
-    now = datetime.now(tz=UTC)
-    date_str = now.strftime("%d/%m/%Y %H:%M:%S")
-
-    anag_header = "col0|col1|col2|col3|col4|col5|col6|col7|col8|col9"
+@pytest.mark.usefixtures("memory_cache")
+async def test_price_parsing_various_locales(price_str, expected, recent_date_str):  # noqa: D103
     anag_row = _make_anagrafica_row("7777", "43,7696", "11,2558")
+    prezzi_row = _make_prezzi_row("7777", "benzina", price_str, "1", recent_date_str)
 
-    prezzi_header = "col0|col1|col2|col3|col4"
-    prezzi_row = _make_prezzi_row("7777", "benzina", price_str, "1", date_str)
-
-    anag_text = f"{anag_header}\n{anag_row}\n"
-    prezzi_text = f"{prezzi_header}\n{prezzi_row}\n"
-
-    client = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
+    client = DummyClient(
+        ANAG_HEADER_BYTES + anag_row.encode("iso-8859-1") + b"\n",
+        PREZZI_HEADER_BYTES + prezzi_row.encode("iso-8859-1") + b"\n",
+    )
 
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / f"prezzi_cache_price_{price_str}.json")
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": f"mem://prezzi_cache_price_{price_str}.json"})
 
-    params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
+    params = BENZINA_PARAMS
 
-    result = asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
+    result = await fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params)
     assert isinstance(result, list)
     assert len(result) == 1
     assert abs(result[0]["prezzo"] - expected) < FLOAT_TOLERANCE
 
 
-def test_non_numeric_price_skips_station(tmp_path):  # noqa: D103
-    now = datetime.now(tz=UTC)
-    date_str = now.strftime("%d/%m/%Y %H:%M:%S")
-
-    anag_header = "col0|col1|col2|col3|col4|col5|col6|col7|col8|col9"
+@pytest.mark.usefixtures("memory_cache")
+async def test_non_numeric_price_skips_station(recent_date_str):  # noqa: D103
     anag_row = _make_anagrafica_row("8888", "43,7696", "11,2558")
+    prezzi_row = _make_prezzi_row("8888", "benzina", "not-a-price", "1", recent_date_str)
 
-    prezzi_header = "col0|col1|col2|col3|col4"
-    prezzi_row = _make_prezzi_row("8888", "benzina", "not-a-price", "1", date_str)
-
-    anag_text = f"{anag_header}\n{anag_row}\n"
-    prezzi_text = f"{prezzi_header}\n{prezzi_row}\n"
-
-    client = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
+    client = DummyClient(
+        ANAG_HEADER_BYTES + anag_row.encode("iso-8859-1") + b"\n",
+        PREZZI_HEADER_BYTES + prezzi_row.encode("iso-8859-1") + b"\n",
+    )
 
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache_non_numeric.json")
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": "mem://prezzi_cache_non_numeric.json"})
 
-    params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
+    params = BENZINA_PARAMS
 
-    result = asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
+    result = await fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params)
     assert isinstance(result, list)
     assert len(result) == 0
 
 
-def test_fetch_gas_stations_maps_schema_error_to_http_exception(tmp_path):
+@pytest.mark.usefixtures("memory_cache")
+async def test_fetch_gas_stations_maps_schema_error_to_http_exception(recent_date_str):
     """Ensure fuel_api.fetch_gas_stations converts CSV schema errors to an HTTP 422 exception with explicit detail."""
-    now = datetime.now(tz=UTC)
-    date_str = now.strftime("%d/%m/%Y %H:%M:%S")
-
     anag_header = "col0|col1|col2|col3|col4|col5|col6|col7|col8|col9"
     anag_row = _make_anagrafica_row("123", "43,7696", "11,2558")
 
     # prezzi header missing required 'prezzo' column -> should trigger schema error
     prezzi_header = "id|carburante|self|data"
-    prezzi_row = f"123|benzina|1|{date_str}"
+    prezzi_row = f"123|benzina|1|{recent_date_str}"
 
     anag_text = f"{anag_header}\n{anag_row}\n"
     prezzi_text = f"{prezzi_header}\n{prezzi_row}\n"
 
     client = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
 
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache_named_missing_for_api.json")
+    settings = shared_settings().model_copy(
+        update={"prezzi_cache_path": "mem://prezzi_cache_named_missing_for_api.json"},
+    )
 
-    params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
+    params = BENZINA_PARAMS
 
     with pytest.raises(HTTPException) as exc:
-        asyncio.run(fa.fetch_gas_stations(params, settings, cast("httpx.AsyncClient", client)))
+        await fa.fetch_gas_stations(params, settings, cast("httpx.AsyncClient", client))
 
     assert exc.value.status_code == 422
     assert "prezzi" in str(exc.value.detail).lower()
 
 
-def test_pipe_delimiter_is_detected(tmp_path):
-    """Verify that pipe-delimited CSVs are detected and parsed correctly."""
-    now = datetime.now(tz=UTC)
-    date_str = now.strftime("%d/%m/%Y %H:%M:%S")
-
-    anag_header = "col0|col1|col2|col3|col4|col5|col6|col7|col8|col9"
-    anag_row = _make_anagrafica_row("555", "43,7696", "11,2558").replace(";", "|")
-
-    prezzi_header = "col0|col1|col2|col3|col4"
-    prezzi_row = _make_prezzi_row("555", "benzina", "1,55", "1", date_str).replace(";", "|")
-
-    anag_text = f"{anag_header}\n{anag_row}\n"
-    prezzi_text = f"{prezzi_header}\n{prezzi_row}\n"
-
-    client = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
-
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache_pipe.json")
-
-    params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
-
-    result = asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
-
-    assert isinstance(result, list)
-    assert len(result) == 1
-    assert abs(result[0]["prezzo"] - 1.55) < FLOAT_TOLERANCE
-
-
-def test_bom_stripped(tmp_path):
-    """Test that BOM (mis-decoded as ISO-8859-1) is stripped and parsing succeeds."""
-    now = datetime.now(tz=UTC)
-    date_str = now.strftime("%d/%m/%Y %H:%M:%S")
-
-    # Prepare pipe-delimited data with BOM prefix (mis-decoded UTF-8 BOM)
-    anag_header = "col0|col1|col2|col3|col4|col5|col6|col7|col8|col9"
-    anag_row = _make_anagrafica_row("777", "43,7696", "11,2558")
-    anag_text = f"ï»¿{anag_header}\n{anag_row}\n"
-
-    prezzi_header = "col0|col1|col2|col3|col4"
-    prezzi_row = _make_prezzi_row("777", "benzina", "1,65", "1", date_str)
-    prezzi_text = f"ï»¿{prezzi_header}\n{prezzi_row}\n"
-
-    client = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
-
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache_bom.json")
-
-    params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
-
-    result = asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
-    assert len(result) == 1
-    assert abs(result[0]["prezzo"] - 1.65) < FLOAT_TOLERANCE
-
-
-def test_force_delimiter_override(tmp_path):
+@pytest.mark.usefixtures("memory_cache")
+async def test_force_delimiter_override(recent_date_str):
     """Verify that forcing a delimiter overrides auto-detection and mismatches yield no results."""
-    now = datetime.now(tz=UTC)
-    date_str = now.strftime("%d/%m/%Y %H:%M:%S")
-
     # Create semicolon-delimited CSV
     anag_header = "col0;col1;col2;col3;col4;col5;col6;col7;col8;col9"
     row = ["0"] * 10
@@ -542,7 +498,7 @@ def test_force_delimiter_override(tmp_path):
     rowp[1] = "diesel"
     rowp[2] = "1.70"
     rowp[3] = "1"
-    rowp[4] = date_str
+    rowp[4] = recent_date_str
     prezzi_row = ";".join(rowp)
 
     anag_text = f"{anag_header}\n{anag_row}\n"
@@ -551,51 +507,54 @@ def test_force_delimiter_override(tmp_path):
     client = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
 
     # Test with force ';' => should succeed
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache_override.json")
-    settings.prezzi_csv_delimiter = ";"
+    settings = shared_settings().model_copy(
+        update={
+            "prezzi_cache_path": "mem://prezzi_cache_override.json",
+            "prezzi_csv_delimiter": ";",
+        },
+    )
 
     params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="diesel", results=5)
 
-    result = asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
+    result = await fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params)
     assert len(result) == 1
     assert abs(result[0]["prezzo"] - 1.70) < FLOAT_TOLERANCE
 
     # Test with force '|' (wrong delimiter) => should return empty
     # Use a fresh settings with a different cache path to avoid reusing the previous cache
-    settings2 = Settings()
-    settings2.prezzi_cache_path = str(tmp_path / "prezzi_cache_override_pipe.json")
-    settings2.prezzi_csv_delimiter = "|"
+    settings2 = shared_settings().model_copy(
+        update={
+            "prezzi_cache_path": "mem://prezzi_cache_override_pipe.json",
+            "prezzi_csv_delimiter": "|",
+        },
+    )
     # Use a fresh client with same data
     client2 = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
-    result2 = asyncio.run(fetch_and_combine_csv_data(settings2, cast("httpx.AsyncClient", client2), params=params))
+    result2 = await fetch_and_combine_csv_data(settings2, cast("httpx.AsyncClient", client2), params=params)
     assert len(result2) == 0
 
 
-def test_named_headers_reordered(tmp_path):
+@pytest.mark.usefixtures("memory_cache")
+async def test_named_headers_reordered(recent_date_str):
     """Named CSV headers (reordered) should be mapped by name, not by position."""
-    now = datetime.now(tz=UTC)
-    date_str = now.strftime("%d/%m/%Y %H:%M:%S")
-
     # anagrafica with named headers in a different order
     anag_header = "latitudine|longitudine|id|gestore|indirizzo"
     anag_row = "43,7696|11,2558|123|GestoreX|Via Test"
 
     # prezzi with named headers reordered (price is last)
     prezzi_header = "carburante|id|data|self|prezzo"
-    prezzi_row = f"benzina|123|{date_str}|1|1,50"
+    prezzi_row = f"benzina|123|{recent_date_str}|1|1,50"
 
     anag_text = f"{anag_header}\n{anag_row}\n"
     prezzi_text = f"{prezzi_header}\n{prezzi_row}\n"
 
     client = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
 
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache_named.json")
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": "mem://prezzi_cache_named.json"})
 
-    params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
+    params = BENZINA_PARAMS
 
-    result = asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
+    result = await fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params)
 
     assert isinstance(result, list)
     assert len(result) == 1
@@ -603,113 +562,115 @@ def test_named_headers_reordered(tmp_path):
     assert result[0]["latitudine"] == LAT
 
 
-def test_named_header_missing_required_field(tmp_path):
+@pytest.mark.usefixtures("memory_cache")
+async def test_named_header_missing_required_field(recent_date_str):
     """If a named header is present but required columns are missing, fail fast with CSVSchemaError."""
-    now = datetime.now(tz=UTC)
-    date_str = now.strftime("%d/%m/%Y %H:%M:%S")
-
     # named anagrafica (valid)
     anag_header = "id|gestore|indirizzo|latitudine|longitudine"
     anag_row = "123|GestoreX|Via Test|43,7696|11,2558"
 
     # prezzi header is missing the 'prezzo' column
     prezzi_header = "id|carburante|self|data"
-    prezzi_row = f"123|benzina|1|{date_str}"
+    prezzi_row = f"123|benzina|1|{recent_date_str}"
 
     anag_text = f"{anag_header}\n{anag_row}\n"
     prezzi_text = f"{prezzi_header}\n{prezzi_row}\n"
 
     client = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
 
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache_named_missing.json")
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": "mem://prezzi_cache_named_missing.json"})
 
-    params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
+    params = BENZINA_PARAMS
 
     with pytest.raises(CSVSchemaError) as exc:
-        asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
+        await fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params)
     assert "prezzi" in str(exc.value).lower()
     assert "prezzo" in str(exc.value).lower()
 
 
-def test_named_anagrafica_missing_required_columns_raises(tmp_path):
+@pytest.mark.usefixtures("memory_cache")
+async def test_named_anagrafica_missing_required_columns_raises(recent_date_str):
     """Named `anagrafica` header missing lat/lon should raise CSVSchemaError."""
     # named header missing lat/lon
     anag_header = "id|gestore|indirizzo"
     anag_row = "123|GestoreX|Via Test"
 
     prezzi_header = "col0|col1|col2|col3|col4"
-    prezzi_row = _make_prezzi_row("123", "benzina", "1,50", "1", datetime.now(tz=UTC).strftime("%d/%m/%Y %H:%M:%S"))
+    prezzi_row = _make_prezzi_row("123", "benzina", "1,50", "1", recent_date_str)
 
     anag_text = f"{anag_header}\n{anag_row}\n"
     prezzi_text = f"{prezzi_header}\n{prezzi_row}\n"
 
     client = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
 
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache_named_missing_anag.json")
+    settings = shared_settings().model_copy(update={"prezzi_cache_path": "mem://prezzi_cache_named_missing_anag.json"})
 
-    params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
+    params = BENZINA_PARAMS
 
     with pytest.raises(CSVSchemaError):
-        asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
+        await fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params)
 
 
-def test_fetch_and_save_csvs_and_cleanup(tmp_path):
+async def test_fetch_and_save_csvs_and_cleanup(tmp_path, monkeypatch, recent_date_str):
     """Verify fetched CSVs are saved with timestamped names and old versions are purged."""
-    now = datetime.now(tz=UTC)
-    date_str = now.strftime("%d/%m/%Y %H:%M:%S")
-
-    anag_header = "col0|col1|col2|col3|col4|col5|col6|col7|col8|col9"
-    anag_row = _make_anagrafica_row("321", "43,7696", "11,2558")
-
-    prezzi_header = "col0|col1|col2|col3|col4"
-    prezzi_row = _make_prezzi_row("321", "benzina", "1,60", "1", date_str)
+    anag_bytes = ANAG_HEADER_BYTES + _make_anagrafica_row("321", "43,7696", "11,2558").encode("iso-8859-1") + b"\n"
+    prezzi_row = _make_prezzi_row("321", "benzina", "1,60", "1", recent_date_str)
 
-    anag_text = f"{anag_header}\n{anag_row}\n"
-    prezzi_text = f"{prezzi_header}\n{prezzi_row}\n"
+    client = DummyClient(anag_bytes, PREZZI_HEADER_BYTES + prezzi_row.encode("iso-8859-1") + b"\n")
 
-    client = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
+    settings = shared_settings().model_copy(
+        update={
+            "prezzi_cache_path": str(tmp_path / "prezzi_cache_save.json"),
+            "prezzi_local_data_dir": str(tmp_path),
+            "prezzi_keep_versions": 1,
+        },
+    )
 
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache_save.json")
-    settings.prezzi_local_data_dir = str(tmp_path)
-    settings.prezzi_keep_versions = 1
+    params = BENZINA_PARAMS
 
-    params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
+    # One save stamp per fetch, a second apart, instead of waiting for the clock
+    stamps = iter([datetime(2026, 2, 15, 10, 0, 0, tzinfo=UTC), datetime(2026, 2, 15, 10, 0, 1, tzinfo=UTC)])
+    monkeypatch.setattr(csv_fetcher, "datetime", SimpleNamespace(now=lambda tz=None: next(stamps)))
 
     # First fetch -> saves one set
-    result = asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
+    result = await fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params)
+    await _drain_background_csv_tasks()
     assert isinstance(result, list)
+    assert sorted(scan_csv_names(tmp_path, TIMESTAMPED_CSV_PREFIXES)) == [
+        "anagrafica_impianti_attivi_20260215_100000.csv",
+        "prezzo_alle_8_20260215_100000.csv",
+    ]
 
-    anag_files = list(tmp_path.glob("anagrafica_impianti_attivi_*.csv"))
-    prezzi_files = list(tmp_path.glob("prezzo_alle_8_*.csv"))
-    assert len(anag_files) == 1
-    assert len(prezzi_files) == 1
+    # Second fetch (own cache file, so the first payload is not reused) with new
+    # prices: the new prezzi copy replaces the old one, the unchanged anagrafica is kept
+    prezzi_row2 = _make_prezzi_row("321", "benzina", "1,70", "1", recent_date_str)
+    client2 = DummyClient(anag_bytes, PREZZI_HEADER_BYTES + prezzi_row2.encode("iso-8859-1") + b"\n")
+    settings2 = settings.model_copy(update={"prezzi_cache_path": str(tmp_path / "prezzi_cache_save2.json")})
+    await fetch_and_combine_csv_data(settings2, cast("httpx.AsyncClient", client2), params=params)
+    await _drain_background_csv_tasks()
+    assert sorted(scan_csv_names(tmp_path, TIMESTAMPED_CSV_PREFIXES)) == [
+        "anagrafica_impianti_attivi_20260215_100000.csv",
+        "prezzo_alle_8_20260215_100001.csv",
+    ]
 
-    # Mock datetime to return different timestamps for each fetch
-    call_count = {"val": 0}
 
-    def mock_datetime_now(*args, **kwargs):
-        call_count["val"] += 1
-        if call_count["val"] == 1:
-            return datetime(2026, 2, 15, 10, 0, 0, tzinfo=UTC)
-        return datetime(2026, 2, 15, 10, 0, 1, tzinfo=UTC)
+async def test_save_csv_files_skips_unchanged_content(tmp_path):
+    """A CSV identical to the newest stored copy is not written again; a changed one is."""
+    old_anag = tmp_path / "anagrafica_impianti_attivi_20260101_080000.csv"
+    old_prezzi = tmp_path / "prezzo_alle_8_20260101_080000.csv"
+    old_anag.write_bytes(b"same anagrafica")
+    old_prezzi.write_bytes(b"old prezzi")
 
-    original_datetime = csv_fetcher.datetime
-    csv_fetcher.datetime = type("MockDatetime", (), {"now": mock_datetime_now})()  # type: ignore[assignment]
+    settings = shared_settings().model_copy(update={"prezzi_local_data_dir": str(tmp_path), "prezzi_keep_versions": 5})
+    await csv_fetcher._save_csv_files("same anagrafica", "new prezzi", settings)
 
-    try:
-        asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
-    finally:
-        csv_fetcher.datetime = original_datetime
-    anag_files2 = list(tmp_path.glob("anagrafica_impianti_attivi_*.csv"))
-    prezzi_files2 = list(tmp_path.glob("prezzo_alle_8_*.csv"))
-    assert len(anag_files2) == 1
-    assert len(prezzi_files2) == 1
+    assert list(tmp_path.glob("anagrafica_impianti_attivi_*.csv")) == [old_anag]
+    prezzi_files = sorted(tmp_path.glob("prezzo_alle_8_*.csv"))
+    assert len(prezzi_files) == 2
+    assert prezzi_files[-1].read_bytes() == b"new prezzi"
 
 
-def test_load_local_csvs_uses_custom_dir(tmp_path):
+async def test_load_local_csvs_uses_custom_dir(tmp_path, recent_date_str):
     """_load_local_csvs should find CSVs in a custom directory set via settings.prezzi_local_data_dir."""
     anag = tmp_path / "anagrafica_impianti_attivi.csv"
     pre = tmp_path / "prezzo_alle_8.csv"
@@ -718,30 +679,26 @@ def test_load_local_csvs_uses_custom_dir(tmp_path):
         encoding="iso-8859-1",
     )
     pre.write_text(
-        "col0|col1|col2|col3|col4\n"
-        + _make_prezzi_row("10", "benzina", "1.23", "1", datetime.now(tz=UTC).strftime("%d/%m/%Y %H:%M:%S"))
-        + "\n",
+        "col0|col1|col2|col3|col4\n" + _make_prezzi_row("10", "benzina", "1.23", "1", recent_date_str) + "\n",
         encoding="iso-8859-1",
     )
 
-    settings = Settings(prezzi_min_csv_bytes=0)
-    settings.prezzi_local_data_dir = str(tmp_path)
+    settings = shared_settings().model_copy(update={"prezzi_min_csv_bytes": 0, "prezzi_local_data_dir": str(tmp_path)})
 
-    anag_text, prezzi_text = asyncio.run(prezzi_csv._load_local_csvs(settings))
+    anag_text, prezzi_text = await prezzi_csv._load_local_csvs(settings)
     assert "GestoreX" in anag_text
     assert "benzina" in prezzi_text
 
 
 def test_candidate_dir_order_preference():
     """Verify that the preferred candidate directory is 'src/static/data' (project-level) when no custom dir is set."""
-    settings = Settings()
-    settings.prezzi_local_data_dir = None
+    settings = shared_settings().model_copy(update={"prezzi_local_data_dir": None})
     candidates = prezzi_csv._candidate_local_csv_dirs(settings)
     expected_first = prezzi_csv.PROJECT_ROOT / "src" / "static" / "data"
     assert candidates[0] == expected_first
 
 
-def test_save_uses_preferred_candidate_when_unset(tmp_path, monkeypatch):
+async def test_save_uses_preferred_candidate_when_unset(tmp_path, monkeypatch, recent_date_str):
     """When prezzi_local_data_dir is not set, _save_csv_files should write to the preferred candidate dir."""
     preferred = tmp_path / "preferred"
     other = tmp_path / "other"
@@ -751,28 +708,26 @@ def fake_candidates(settings):
 
     monkeypatch.setattr(csv_fetcher, "_candidate_local_csv_dirs", fake_candidates)
 
-    now = datetime.now(tz=UTC)
-    date_str = now.strftime("%d/%m/%Y %H:%M:%S")
-
-    anag_header = "col0|col1|col2|col3|col4|col5|col6|col7|col8|col9"
     anag_row = _make_anagrafica_row("777", "43,7696", "11,2558")
+    prezzi_row = _make_prezzi_row("777", "benzina", "1,65", "1", recent_date_str)
 
-    prezzi_header = "col0|col1|col2|col3|col4"
-    prezzi_row = _make_prezzi_row("777", "benzina", "1,65", "1", date_str)
-
-    anag_text = f"{anag_header}\n{anag_row}\n"
-    prezzi_text = f"{prezzi_header}\n{prezzi_row}\n"
-
-    client = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
+    client = DummyClient(
+        ANAG_HEADER_BYTES + anag_row.encode("iso-8859-1") + b"\n",
+        PREZZI_HEADER_BYTES + prezzi_row.encode("iso-8859-1") + b"\n",
+    )
 
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache_pref.json")
-    settings.prezzi_local_data_dir = None
-    settings.prezzi_keep_versions = 2
+    settings = shared_settings().model_copy(
+        update={
+            "prezzi_cache_path": str(tmp_path / "prezzi_cache_pref.json"),
+            "prezzi_local_data_dir": None,
+            "prezzi_keep_versions": 2,
+        },
+    )
 
-    params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
+    params = BENZINA_PARAMS
 
-    asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
+    await fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params)
+    await _drain_background_csv_tasks()
 
     anag_files = list(preferred.glob("anagrafica_impianti_attivi_*.csv"))
     prezzi_files = list(preferred.glob("prezzo_alle_8_*.csv"))
@@ -780,7 +735,7 @@ def fake_candidates(settings):
     assert len(prezzi_files) == 1
 
 
-def test_load_prefers_static_candidate(tmp_path, monkeypatch):
+async def test_load_prefers_static_candidate(tmp_path, monkeypatch, recent_date_str):
     """If a preferred candidate contains CSVs, _load_local_csvs should load from it."""
     preferred = tmp_path / "preferred"
     other = tmp_path / "other"
@@ -800,7 +755,7 @@ def test_load_prefers_static_candidate(tmp_path, monkeypatch):
             "benzina",
             "1.99",
             "1",
-            datetime.now(tz=UTC).strftime("%d/%m/%Y %H:%M:%S"),
+            recent_date_str,
         )
         + "\n",
         encoding="iso-8859-1",
@@ -811,15 +766,14 @@ def fake_candidates(settings):
 
     monkeypatch.setattr(prezzi_csv, "_candidate_local_csv_dirs", fake_candidates)
 
-    settings = Settings(prezzi_min_csv_bytes=0)
-    settings.prezzi_local_data_dir = None
+    settings = shared_settings().model_copy(update={"prezzi_min_csv_bytes": 0, "prezzi_local_data_dir": None})
 
-    anag_text, prezzi_text = asyncio.run(prezzi_csv._load_local_csvs(settings))
+    anag_text, prezzi_text = await prezzi_csv._load_local_csvs(settings)
     assert "GestoreX" in anag_text
     assert "benzina" in prezzi_text
 
 
-def test_load_from_project_src_static_data_dir():
+async def test_load_from_project_src_static_data_dir(recent_date_str):
     """When project-level src/static/data contains CSVs, _load_local_csvs should load them."""
     project_dir = prezzi_csv.PROJECT_ROOT / "src" / "static" / "data"
     project_dir.mkdir(parents=True, exist_ok=True)
@@ -838,21 +792,20 @@ def test_load_from_project_src_static_data_dir():
             "benzina",
             "1.49",
             "1",
-            datetime.now(tz=UTC).strftime("%d/%m/%Y %H:%M:%S"),
+            recent_date_str,
         )
         + "\n",
         encoding="iso-8859-1",
     )
 
-    settings = Settings(prezzi_min_csv_bytes=0)
-    settings.prezzi_local_data_dir = None
+    settings = shared_settings().model_copy(update={"prezzi_min_csv_bytes": 0, "prezzi_local_data_dir": None})
 
-    anag_text, prezzi_text = asyncio.run(prezzi_csv._load_local_csvs(settings))
+    anag_text, prezzi_text = await prezzi_csv._load_local_csvs(settings)
     assert "GestoreX" in anag_text
     assert "benzina" in prezzi_text
 
 
-def test_load_migrates_from_service_to_project_dir():
+async def test_load_migrates_from_service_to_project_dir(recent_date_str):
     """If CSVs exist in service-local dir but not in project src/static/data, they should be copied over and loaded."""
     service_dir = Path(prezzi_csv.__file__).parent / "static" / "data"
     project_dir = prezzi_csv.PROJECT_ROOT / "src" / "static" / "data"
@@ -872,16 +825,15 @@ def test_load_migrates_from_service_to_project_dir():
             "benzina",
             "1.29",
             "1",
-            datetime.now(tz=UTC).strftime("%d/%m/%Y %H:%M:%S"),
+            recent_date_str,
         )
         + "\n",
         encoding="iso-8859-1",
     )
 
-    settings = Settings(prezzi_min_csv_bytes=0)
-    settings.prezzi_local_data_dir = None
+    settings = shared_settings().model_copy(update={"prezzi_min_csv_bytes": 0, "prezzi_local_data_dir": None})
 
-    anag_text, prezzi_text = asyncio.run(prezzi_csv._load_local_csvs(settings))
+    anag_text, prezzi_text = await prezzi_csv._load_local_csvs(settings)
     assert "GestoreX" in anag_text
     assert "benzina" in prezzi_text
 
@@ -889,7 +841,7 @@ def test_load_migrates_from_service_to_project_dir():
     assert (project_dir / "prezzo_alle_8.csv").exists()
 
 
-def test_load_migrates_from_project_data_to_src_static():
+async def test_load_migrates_from_project_data_to_src_static(recent_date_str):
     """If CSVs exist in project-level `data/` they should be migrated to `src/static/data` and loaded."""
     project_data = prezzi_csv.PROJECT_ROOT / "data"
     project_src = prezzi_csv.PROJECT_ROOT / "src" / "static" / "data"
@@ -910,16 +862,15 @@ def test_load_migrates_from_project_data_to_src_static():
             "benzina",
             "1.35",
             "1",
-            datetime.now(tz=UTC).strftime("%d/%m/%Y %H:%M:%S"),
+            recent_date_str,
         )
         + "\n",
         encoding="iso-8859-1",
     )
 
-    settings = Settings(prezzi_min_csv_bytes=0)
-    settings.prezzi_local_data_dir = None
+    settings = shared_settings().model_copy(update={"prezzi_min_csv_bytes": 0, "prezzi_local_data_dir": None})
 
-    anag_text, prezzi_text = asyncio.run(prezzi_csv._load_local_csvs(settings))
+    anag_text, prezzi_text = await prezzi_csv._load_local_csvs(settings)
     assert "GestoreX" in anag_text
     assert "benzina" in prezzi_text
 
@@ -936,13 +887,12 @@ def test_get_latest_csv_timestamp_prefers_project_src_static():
     pre_name = project_dir / f"prezzo_alle_8_{ts}.csv"
     anag_name.write_text("col0|col1\n1|2\n", encoding="iso-8859-1")
     pre_name.write_text("col0|col1\n1|2\n", encoding="iso-8859-1")
-    settings = Settings()
-    settings.prezzi_local_data_dir = None
+    settings = shared_settings().model_copy(update={"prezzi_local_data_dir": None})
     latest = prezzi_csv.get_latest_csv_timestamp(settings)
     assert latest is not None
 
 
-def test_save_logs_filenames(tmp_path, monkeypatch):
+async def test_save_logs_filenames(tmp_path, monkeypatch, recent_date_str):
     """Verify that saving CSVs logs the exact filenames saved."""
     preferred = tmp_path / "preferred"
 
@@ -951,33 +901,31 @@ def fake_candidates(settings):
 
     monkeypatch.setattr(csv_fetcher, "_candidate_local_csv_dirs", fake_candidates)
 
-    now = datetime.now(tz=UTC)
-    date_str = now.strftime("%d/%m/%Y %H:%M:%S")
-
-    anag_header = "col0|col1|col2|col3|col4|col5|col6|col7|col8|col9"
     anag_row = _make_anagrafica_row("321", "43,7696", "11,2558")
+    prezzi_row = _make_prezzi_row("321", "benzina", "1,60", "1", recent_date_str)
 
-    prezzi_header = "col0|col1|col2|col3|col4"
-    prezzi_row = _make_prezzi_row("321", "benzina", "1,60", "1", date_str)
-
-    anag_text = f"{anag_header}\n{anag_row}\n"
-    prezzi_text = f"{prezzi_header}\n{prezzi_row}\n"
-
-    client = DummyClient(anag_text.encode("iso-8859-1"), prezzi_text.encode("iso-8859-1"))
+    client = DummyClient(
+        ANAG_HEADER_BYTES + anag_row.encode("iso-8859-1") + b"\n",
+        PREZZI_HEADER_BYTES + prezzi_row.encode("iso-8859-1") + b"\n",
+    )
 
-    settings = Settings()
-    settings.prezzi_cache_path = str(tmp_path / "prezzi_cache_log.json")
-    settings.prezzi_local_data_dir = None
-    settings.prezzi_keep_versions = 2
+    settings = shared_settings().model_copy(
+        update={
+            "prezzi_cache_path": str(tmp_path / "prezzi_cache_log.json"),
+            "prezzi_local_data_dir": None,
+            "prezzi_keep_versions": 2,
+        },
+    )
 
-    params = StationSearchParams(latitude=LAT, longitude=LON, distance=10, fuel="benzina", results=5)
+    params = BENZINA_PARAMS
 
     # Mock logger.info from csv_fetcher module (where saving occurs
 
     mock_logger = MagicMock()
     monkeypatch.setattr(csv_fetcher, "logger", mock_logger)
 
-    asyncio.run(fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params))
+    await fetch_and_combine_csv_data(settings, cast("httpx.AsyncClient", client), params=params)
+    await _drain_background_csv_tasks()
 
     # Check that logger.info was called with a message containing the expected filename patterns
     found = False
@@ -1001,8 +949,7 @@ def fake_candidates(settings):
 
 def test_check_preferred_local_dir_writable_warns(monkeypatch):
     """If writing to the preferred dir fails, a warning should be logged and False returned."""
-    settings = Settings()
-    settings.prezzi_local_data_dir = None
+    settings = shared_settings().model_copy(update={"prezzi_local_data_dir": None})
 
     def fake_write_text(self, *args, **kwargs):
         msg = "no write"
@@ -1026,7 +973,7 @@ def fake_write_text(self, *args, **kwargs):
 # --- Test HTTP condizionale ---
 
 
-def test_fetch_csvs_304_both_uses_local(tmp_path):
+async def test_fetch_csvs_304_both_uses_local(tmp_path):
     """Quando entrambi i CSV tornano 304, usa i file locali senza scaricare."""
     data_dir = tmp_path / "data"
     data_dir.mkdir()
@@ -1036,16 +983,16 @@ def test_fetch_csvs_304_both_uses_local(tmp_path):
     meta_path = tmp_path / "meta.json"
     meta_path.write_text('{"anag_etag": "\\"abc\\"", "prezzi_etag": "\\"def\\""}')
 
-    settings = Settings(
-        prezzi_csv_http_meta_path=str(meta_path),
-        prezzi_local_data_dir=str(data_dir),
-        prezzi_min_csv_bytes=0,
+    settings = shared_settings().model_copy(
+        update={
+            "prezzi_csv_http_meta_path": str(meta_path),
+            "prezzi_local_data_dir": str(data_dir),
+            "prezzi_min_csv_bytes": 0,
+        },
     )
     client = DummyClientCsvConditional(anag_status=304, prezzi_status=304)
 
-    anag_text, prezzi_text = asyncio.run(
-        _fetch_csvs(cast("httpx.AsyncClient", client), settings),
-    )
+    anag_text, prezzi_text = await _fetch_csvs(cast("httpx.AsyncClient", client), settings)
 
     assert anag_text == "local_anag_content"
     assert prezzi_text == "local_prezzi_content"
@@ -1053,13 +1000,15 @@ def test_fetch_csvs_304_both_uses_local(tmp_path):
     assert all("If-None-Match" in h for h in client.sent_headers)
 
 
-def test_fetch_csvs_200_saves_http_meta(tmp_path):
+async def test_fetch_csvs_200_saves_http_meta(tmp_path):
     """Una risposta 200 con ETag salva il meta file per future richieste condizionali."""
     meta_path = tmp_path / "meta.json"
 
-    settings = Settings(
-        prezzi_csv_http_meta_path=str(meta_path),
-        prezzi_local_data_dir=str(tmp_path),
+    settings = shared_settings().model_copy(
+        update={
+            "prezzi_csv_http_meta_path": str(meta_path),
+            "prezzi_local_data_dir": str(tmp_path),
+        },
     )
     client = DummyClientCsvConditional(
         anag_resp_headers={"etag": '"etag-anag"', "last-modified": "Wed, 18 Jun 2026 06:00:00 GMT"},
@@ -1068,7 +1017,7 @@ def test_fetch_csvs_200_saves_http_meta(tmp_path):
         prezzi_content=b"x" * 100,
     )
 
-    asyncio.run(_fetch_csvs(cast("httpx.AsyncClient", client), settings))
+    await _fetch_csvs(cast("httpx.AsyncClient", client), settings)
 
     assert meta_path.exists()
     saved = json.loads(meta_path.read_text())
@@ -1077,7 +1026,7 @@ def test_fetch_csvs_200_saves_http_meta(tmp_path):
     assert saved["anag_last_modified"] == "Wed, 18 Jun 2026 06:00:00 GMT"
 
 
-def test_fetch_csvs_sends_conditional_headers_when_meta_exists(tmp_path):
+async def test_fetch_csvs_sends_conditional_headers_when_meta_exists(tmp_path):
     """Se il meta file esiste, invia If-None-Match e If-Modified-Since."""
     meta_path = tmp_path / "meta.json"
     meta_path.write_text(json.dumps({
@@ -1085,17 +1034,72 @@ def test_fetch_csvs_sends_conditional_headers_when_meta_exists(tmp_path):
         "anag_last_modified": "Mon, 16 Jun 2026 08:00:00 GMT",
     }))
 
-    settings = Settings(
-        prezzi_csv_http_meta_path=str(meta_path),
-        prezzi_local_data_dir=str(tmp_path),
+    settings = shared_settings().model_copy(
+        update={
+            "prezzi_csv_http_meta_path": str(meta_path),
+            "prezzi_local_data_dir": str(tmp_path),
+        },
     )
     client = DummyClientCsvConditional(
         anag_content=b"x" * 100,
         prezzi_content=b"x" * 100,
     )
 
-    asyncio.run(_fetch_csvs(cast("httpx.AsyncClient", client), settings))
+    await _fetch_csvs(cast("httpx.AsyncClient", client), settings)
 
     anag_sent = client.sent_headers[0]  # prima GET = anagrafica
     assert anag_sent.get("If-None-Match") == '"stored-etag"'
     assert anag_sent.get("If-Modified-Since") == "Mon, 16 Jun 2026 08:00:00 GMT"
+
+
+def test_filter_skips_stations_outside_search_area(recent_date_str):
+    """Only stations inside the search radius are returned, in price order, across repeated searches."""
+    from src.services.csv_parser import _filter_and_transform_combined
+
+    def station(lat: float, lon: float, price: float) -> dict:
+        return {
+            "gestore": "GestoreX",
+            "indirizzo": "Via Test",
+            "latitudine": lat,
+            "longitudine": lon,
+            "prezzi": {"benzina": {"prezzo": price, "self": True, "data": recent_date_str}},
+        }
+
+    combined = {
+        "1": station(LAT, LON, EXPECTED_PRICE_C),
+        "2": station(LAT + 0.01, LON + 0.01, EXPECTED_PRICE_A),
+        "3": station(45.4642, 9.19, EXPECTED_PRICE_B),  # Milan: far outside the radius
+    }
+    params = BENZINA_PARAMS
+
+    for _ in range(2):
+        result = _filter_and_transform_combined(combined, params)
+        assert [s["prezzo"] for s in result] == [EXPECTED_PRICE_A, EXPECTED_PRICE_C]
+
+
+async def test_load_cached_combined_reuses_parsed_data_until_file_changes(tmp_path):
+    """The parsed cache is served from memory until the file on disk changes."""
+    from src.services.csv_cache import _load_cached_combined
+
+    cache_path = tmp_path / "prezzi_cache.json"
+    cache_path.write_bytes(orjson.dumps({"1": {"gestore": "A"}}))
+
+    first = await _load_cached_combined(str(cache_path))
+    second = await _load_cached_combined(str(cache_path))
+    assert first is second
+
+    cache_path.write_bytes(orjson.dumps({"2": {"gestore": "Changed"}}))
+    third = await _load_cached_combined(str(cache_path))
+    assert third == {"2": {"gestore": "Changed"}}
+
+
+async def test_write_json_file_primes_in_memory_cache(tmp_path):
+    """The payload just written is served by the next load without re-reading the file."""
+    from src.services.csv_cache import _load_cached_combined, _write_json_file
+
+    cache_path = str(tmp_path / "prezzi_cache.json")
+    payload = {"1": {"gestore": "A"}}
+
+    await _write_json_file(cache_path, payload)
+
+    assert await _load_cached_combined(cache_path) is payload
@@ -1,18 +1,39 @@
 """Tests for UI accessibility including color contrast and theme variables."""
 
 import re
-from pathlib import Path
+from functools import cache
 
+import pytest
+
+from src.utils.color_contrast import LINEAR_CHANNELS
 from src.utils.color_contrast import contrast_ratio as _contrast_ratio_hex
 from src.utils.color_contrast import hex_to_rgb as _hex_to_rgb
-from src.utils.color_contrast import linearize
-from src.utils.color_contrast import luminance as _luminance
+from tests.conftest import read_static_text as _read_text
+
+# Pure, read-only checks: file reads are memoized per worker process and nothing
+# else is shared, so xdist may run each test on any worker.
+pytestmark = pytest.mark.parallel_safe
 
 BASE_CSS = "src/static/css/base.css"
 CUSTOM_CSS = "src/static/css/custom.css"
 
 HEX_RE = re.compile(r"#([0-9a-fA-F]{6})")
 RGBA_RE = re.compile(r"rgba\((\d+),\s*(\d+),\s*(\d+),\s*([0-9.]+)\)")
+CSS_VAR_RE = re.compile(r"--([\w-]+):\s*([^;]+);")
+
+
+def _css_variables(file_path: str) -> dict[str, str]:
+    """Map each CSS custom property of a file to its first declared value."""
+    return _declared_variables(_read_text(file_path))
+
+
+@cache
+def _declared_variables(css: str) -> dict[str, str]:
+    """Parse the custom properties of a stylesheet text; keyed on the text, so an edited file is parsed again."""
+    variables: dict[str, str] = {}
+    for name, value in CSS_VAR_RE.findall(css):
+        variables.setdefault(name, value.strip())
+    return variables
 
 
 def hex_to_rgb(hex_str: str):
@@ -23,13 +44,13 @@ def hex_to_rgb(hex_str: str):
 
 def srgb_to_linear(c: float) -> float:
     """Convert sRGB color component (0-255) to linear value."""
-    return linearize(c / 255.0)
+    return LINEAR_CHANNELS[int(c)]
 
 
 def luminance(rgb: tuple):
     """Calculate the relative luminance of an RGB color (0-255)."""
-    normalized = tuple(c / 255.0 for c in rgb)
-    return _luminance(normalized)
+    r, g, b = rgb
+    return 0.2126 * LINEAR_CHANNELS[r] + 0.7152 * LINEAR_CHANNELS[g] + 0.0722 * LINEAR_CHANNELS[b]
 
 
 def contrast_ratio(rgb1: tuple, rgb2: tuple) -> float:
@@ -51,13 +72,11 @@ def blend_rgba_over(bg_rgb: tuple, fg_rgba: tuple) -> tuple:
 
 def parse_css_variable(file_path: str, var_name: str) -> str:
     """Read a CSS variable value from a file."""
-    with Path.open(Path(file_path), encoding="utf-8") as f:
-        text = f.read()
-    match = re.search(rf"--{re.escape(var_name)}:\s*([^;]+);", text)
-    if not match:
+    value = _css_variables(file_path).get(var_name)
+    if value is None:
         msg = f"Variable --{var_name} not found in {file_path}"
         raise RuntimeError(msg)
-    return match.group(1).strip()
+    return value
 
 
 def parse_rgba_string(s: str) -> tuple:
@@ -81,18 +100,17 @@ def parse_hex_string(s: str) -> str:
 
 def test_base_css_variables_defined():
     """Test that base CSS defines required theme variables."""
-    with Path.open(Path(BASE_CSS), encoding="utf-8") as f:
-        css = f.read()
+    # Checked against the declarations map the contrast tests already share
+    declared = _css_variables(BASE_CSS)
 
-    required_vars = ["--bg-primary", "--bg-surface", "--text-primary", "--color-primary", "--color-primary-hover"]
+    required_vars = ["bg-primary", "bg-surface", "text-primary", "color-primary", "color-primary-hover"]
     for var in required_vars:
-        assert var in css, f"Required CSS variable {var} not found in base.css"
+        assert var in declared, f"Required CSS variable --{var} not found in base.css"
 
 
 def test_custom_css_has_theme_overrides():
     """Test that custom.css has theme-related styles."""
-    with Path.open(Path(CUSTOM_CSS), encoding="utf-8") as f:
-        css = f.read()
+    css = _read_text(CUSTOM_CSS)
 
     assert "[data-theme=" in css, "Theme selectors should be present in custom.css"
     assert "color-primary" in css, "Primary color should be referenced in custom.css"
@@ -1,96 +1,125 @@
 """Tests for UI button components and interactions."""
 
+import re
 from pathlib import Path
 
+import pytest
+
+from tests.conftest import read_static_bytes as _read_bytes
+
+# Pure, read-only checks: file reads are memoized per worker process and nothing
+# else is shared, so xdist may run each test on any worker.
+pytestmark = pytest.mark.parallel_safe
+
+# Plain str paths: the cached reader opens them directly, without pathlib
+HEADER_HTML = "src/static/templates/header.html"
+RESULTS_HTML = "src/static/templates/results.html"
+SEARCH_HTML = "src/static/templates/search.html"
+STYLES_CSS = "src/static/css/styles.css"
+INTERACTIONS_TS = "src/static/ts/app.ui.interactions.ts"
+I18N_TS = "src/static/ts/i18n.ts"
+APP_UI_BUNDLES = [str(path) for path in sorted(Path("src/static/js").glob("app.ui*.js"))]
+
+# Markup checks of the form "file contains one of these snippets": (file, alternatives, failure message)
+MARKUP_CASES = [
+    pytest.param(
+        SEARCH_HTML,
+        (b"min-h-10", b"min-height: 40px", b"min-height: 48px"),
+        "Recent search button should have increased padding or min-height",
+        id="recent-search-button-touch-size",
+    ),
+    pytest.param(
+        RESULTS_HTML,
+        (b"translateFuel(",),
+        "Expected templates to use translateFuel for fuel labels",
+        id="results-use-translate-fuel",
+    ),
+    # User docs title/href are updated via JS (reinitializeComponents)
+    pytest.param(
+        INTERACTIONS_TS,
+        (b'docsLink.setAttribute("href", `/help/user-${this.currentLang || "it"}`)',),
+        "Implementation should dynamically update docs-link href",
+        id="user-docs-href-is-reactive",
+    ),
+    pytest.param(
+        INTERACTIONS_TS,
+        (b'docsLink.setAttribute("title", title)',),
+        "Implementation should dynamically update docs-link title",
+        id="user-docs-title-is-reactive",
+    ),
+    # Language buttons keep their text readable on hover
+    pytest.param(
+        HEADER_HTML,
+        (b"hover:text-[var(--text-primary)]",),
+        "Expected hover:text utility on language buttons",
+        id="lang-button-hover-text",
+    ),
+    # The recent searches heading is reactive to language changes
+    pytest.param(SEARCH_HTML, (b'id="recent-searches-i18n"',), None, id="recent-searches-i18n-id"),
+    pytest.param(SEARCH_HTML, (b'data-i18n="recent_searches"',), None, id="recent-searches-i18n-key"),
+    pytest.param(
+        I18N_TS,
+        (
+            b'document.title = t("title", "Gas Station Finder")',
+            b"document.title = t('title', \"Gas Station Finder\")",
+        ),
+        "i18n.updateI18nTexts should set document.title to the translated title",
+        id="i18n-sets-document-title",
+    ),
+    # The search form has a divider after the submit button
+    pytest.param(
+        SEARCH_HTML,
+        (b"search-divider", b"border-t border-[var(--border-color)]"),
+        "Expected search divider element or border utility in search.html",
+        id="search-divider",
+    ),
+]
+
 
 def test_header_button_styles_present() -> None:
     """Test that header button styles are present in CSS."""
-    css = Path("src/static/css/styles.css").read_text()
-    header = Path("src/static/templates/header.html").read_text()
+    css = _read_bytes(STYLES_CSS)
+    header = _read_bytes(HEADER_HTML)
 
-    assert ".theme-toggle" in css or "theme-toggle" in header, "Expected theme-toggle in styles.css or header.html"
-    assert ".lang-btn" in css or "lang-btn" in header, "Expected lang-btn in styles.css or header.html"
+    assert b".theme-toggle" in css or b"theme-toggle" in header, "Expected theme-toggle in styles.css or header.html"
+    assert b".lang-btn" in css or b"lang-btn" in header, "Expected lang-btn in styles.css or header.html"
 
 
-def test_recent_search_button_touch_size() -> None:
-    """Test that recent search button has proper touch size."""
-    search_html = Path("src/static/templates/search.html").read_text()
-    assert "min-h-10" in search_html or "min-height: 40px" in search_html or "min-height: 48px" in search_html, (
-        "Recent search button should have increased padding or min-height"
-    )
+# Accepted loading-state bindings, alternated into one pattern so the template is scanned once
+LOADING_BINDINGS = (b":class=\"{ 'is-loading': loading }\"", b':class="{ "is-loading": loading }"', b"loading")
+LOADING_BINDING_RE = re.compile(b"|".join(map(re.escape, LOADING_BINDINGS)))
 
 
 def test_submit_button_loading_binding() -> None:
     """Test that submit button has loading state binding."""
-    search = Path("src/static/templates/search.html").read_text()
-    assert 'class="btn btn-primary' in search
-    assert (
-        ":class=\"{ 'is-loading': loading }\"" in search
-        or ':class="{ "is-loading": loading }"' in search
-        or ":class=\"{ 'is-loading': loading }\"" in search
-        or "loading" in search
-    )
-
-
-def test_set_fuel_type_triggers_submit_when_city_present() -> None:
-    """Test that setFuelType triggers submit when city is present."""
-    # `setFuelType` may be split across `app.ui.*.js` after refactor
-    combined = "\n".join(p.read_text() for p in Path("src/static/js").glob("app.ui*.js"))
-    assert "setFuelType(fuel)" in combined
-    assert "if (this.formData.city)" in combined
-    assert "this.submitForm()" in combined
-
-
-def test_results_use_translate_fuel() -> None:
-    """Test that results use translateFuel function."""
-    results = Path("src/static/templates/results.html").read_text()
-    assert "translateFuel(" in results, "Expected templates to use translateFuel for fuel labels"
+    search = _read_bytes(SEARCH_HTML)
+    assert b'class="btn btn-primary' in search
+    assert LOADING_BINDING_RE.search(search), f"Expected one of {LOADING_BINDINGS!r} in {SEARCH_HTML}"
 
 
-def test_user_docs_title_is_reactive() -> None:
-    """Test that user docs title/href are updated via JS (reinitializeComponents)."""
-    interactions = Path("src/static/ts/app.ui.interactions.ts").read_text()
-    assert 'docsLink.setAttribute("href", `/help/user-${this.currentLang || "it"}`)' in interactions, (
-        "Implementation should dynamically update docs-link href"
-    )
-    assert 'docsLink.setAttribute("title", title)' in interactions, (
-        "Implementation should dynamically update docs-link title"
-    )
-
-
-def test_lang_button_hover_text_present() -> None:
-    """Test that language buttons include hover text color utility to keep text readable."""
-    header = Path("src/static/templates/header.html").read_text()
-    assert "hover:text-[var(--text-primary)]" in header, "Expected hover:text utility on language buttons"
-
+@pytest.mark.parametrize(("path", "alternatives", "message"), MARKUP_CASES)
+def test_markup_contains(path: str, alternatives: tuple[bytes, ...], message: str | None) -> None:
+    """Test that a template or script contains one of the expected snippets."""
+    content = _read_bytes(path)
+    assert any(alt in content for alt in alternatives), message or f"Expected one of {alternatives!r} in {path}"
 
-def test_recent_searches_is_reactive() -> None:
-    """Test that recent searches heading is reactive to language changes."""
-    search_html = Path("src/static/templates/search.html").read_text()
-    assert 'id="recent-searches-i18n"' in search_html
-    assert 'data-i18n="recent_searches"' in search_html
 
+# `setFuelType` re-submits the search when a city is already filled in
+SET_FUEL_TYPE_SNIPPETS = (b"setFuelType(fuel)", b"if (this.formData.city)", b"this.submitForm()")
 
-def test_updateI18nTexts_sets_document_title() -> None:  # noqa: N802
-    """Test that i18n.updateI18nTexts sets document.title to the translated title."""
-    i18n = Path("src/static/ts/i18n.ts").read_text()
-    assert (
-        'document.title = t("title", "Gas Station Finder")' in i18n
-        or "document.title = t('title', \"Gas Station Finder\")" in i18n
-    ), "i18n.updateI18nTexts should set document.title to the translated title"
 
-
-def test_search_divider_present() -> None:
-    """Search form should include a divider element after the submit button."""
-    search_html = Path("src/static/templates/search.html").read_text()
-    assert "search-divider" in search_html or "border-t border-[var(--border-color)]" in search_html, (
-        "Expected search divider element or border utility in search.html"
-    )
+def test_set_fuel_type_triggers_submit_when_city_present() -> None:
+    """Test that setFuelType triggers submit when city is present."""
+    # `setFuelType` may be split across `app.ui.*.js` after refactor: search the
+    # cached files one by one instead of copying them into one joined buffer
+    bundles = [_read_bytes(path) for path in APP_UI_BUNDLES]
+    for snippet in SET_FUEL_TYPE_SNIPPETS:
+        assert any(snippet in bundle for bundle in bundles), f"Expected {snippet!r} in the app.ui*.js bundles"
 
 
 def test_stations_list_has_gap() -> None:
     """Results template should render `#stations-list` with gap for spacing."""
-    results = Path("src/static/templates/results.html").read_text()
-    assert 'id="stations-list"' in results and ("gap-" in results), (  # noqa: PT018
+    results = _read_bytes(RESULTS_HTML)
+    assert b'id="stations-list"' in results and (b"gap-" in results), (  # noqa: PT018
         "Expected #stations-list to include gap class for spacing"
     )